@@ -1,16 +1,23 @@
 // Add more detailed logging
 console.log('=== Dashboard Script Starting ===');
 console.log('Document ready state:', document.readyState);
-console.log('Window rawData available:', !!window.rawData);
+console.log('Window dashboardCube available:', !!window.dashboardCube);
 console.log('Window availablePeriods available:', !!window.availablePeriods);
 console.log('Window availableMetrics available:', !!window.availableMetrics);
 
+// Trend charts switch from days to weeks (and from weeks to months) above this many points
+const MAX_TREND_POINTS = 500;
+// Most raw rows shown in the table
+const MAX_RAW_ROWS = 500;
+
 // Debug function to update debug info
 function updateDebugInfo() {
     const debugContent = document.getElementById('debug-content');
     if (debugContent) {
+        const buckets = cube ? cube.buckets : null;
         debugContent.innerHTML = `
-            Raw Data: ${window.rawData ? window.rawData.length + ' records' : 'NOT LOADED'}<br>
+            Aggregates: ${buckets ? `${buckets.day.start.length} days, ${buckets.week.start.length} weeks, ${buckets.month.start.length} months` : 'NOT LOADED'}<br>
+            Raw Rows: ${window.dashboardRows ? window.dashboardRows.length + ' records' : 'not loaded (loaded on demand)'}<br>
             Available Periods: ${window.availablePeriods ? window.availablePeriods.length + ' periods' : 'NOT LOADED'}<br>
             Available Metrics: ${window.availableMetrics ? window.availableMetrics.length + ' metrics' : 'NOT LOADED'}<br>
             Periods: ${window.availablePeriods ? JSON.stringify(window.availablePeriods.slice(0, 3)) + '...' : 'None'}<br>
@@ -20,36 +27,87 @@ function updateDebugInfo() {
     }
 }
 
-// Convert string dates back to Date objects and clean the data
-const data = (window.rawData && Array.isArray(window.rawData)) ? window.rawData.map(row => {
-    // Create a new row object with cleaned data
-    const cleanRow = {
-        Date: new Date(row.Date + 'T00:00:00'), // Add time to ensure proper parsing
-        MonthYear: row.MonthYear
-    };
-    
-    // Clean numeric columns - convert empty strings, null, undefined to 0
-    Object.keys(row).forEach(key => {
-        if (key !== 'Date' && key !== 'MonthYear') {
-            let value = row[key];
-            
-            // Handle various empty/null cases
-            if (value === '' || value === null || value === undefined || isNaN(value)) {
-                cleanRow[key] = 0;
-            } else {
-                // Try to parse as number
-                const numValue = parseFloat(value);
-                cleanRow[key] = isNaN(numValue) ? 0 : numValue;
-            }
-        }
+const MS_PER_DAY = 24 * 60 * 60 * 1000;
+const TYPED_ARRAYS = { int8: Int8Array, int16: Int16Array, int32: Int32Array, float64: Float64Array };
+
+// Turn a column packed by dashboardgeneration.encode_column() back into a typed array
+function decodeColumn(column) {
+    const binary = atob(column.data);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return new TYPED_ARRAYS[column.type](bytes.buffer);
+}
+
+// Pre-aggregated data from dashboardgeneration.py. For each bucket size (day, week, month):
+// start (days since 1970-01-01), period (index into cube.periods), row count, and per-metric
+// sum, min and max, all as typed arrays. Buckets never span two periods, so any selection
+// of periods is a set of whole buckets.
+function decodeCube(payload) {
+    const buckets = {};
+    Object.entries(payload.buckets).forEach(([name, bucket]) => {
+        const decoded = {
+            start: decodeColumn(bucket.start),
+            period: decodeColumn(bucket.period),
+            count: decodeColumn(bucket.count),
+            sum: {}, min: {}, max: {}
+        };
+        ['sum', 'min', 'max'].forEach(stat => {
+            payload.metrics.forEach(metric => {
+                decoded[stat][metric] = decodeColumn(bucket[stat][metric]);
+            });
+        });
+        decoded.offsets = indexPeriods(decoded.period, payload.periods.length);
+        buckets[name] = decoded;
     });
-    
-    return cleanRow;
-}) : [];
+    const periodIndex = new Map(payload.periods.map((period, index) => [period, index]));
+    return { periods: payload.periods, metrics: payload.metrics, buckets: buckets, periodIndex: periodIndex };
+}
+
+// Buckets are sorted by date, so the buckets of each period are contiguous: those of period p
+// are offsets[p] up to (not including) offsets[p + 1]
+function indexPeriods(bucketPeriods, periodCount) {
+    const offsets = new Int32Array(periodCount + 1);
+    bucketPeriods.forEach(periodIndex => {
+        offsets[periodIndex + 1]++;
+    });
+    for (let p = 0; p < periodCount; p++) {
+        offsets[p + 1] += offsets[p];
+    }
+    return offsets;
+}
+
+let cube = null;
 
-console.log('Dashboard data processed:', data.length, 'records');
-if (data.length > 0) {
-    console.log('Sample data row:', data[0]);
+function decodeDashboardData() {
+    try {
+        cube = (window.dashboardCube && window.dashboardCube.buckets) ? decodeCube(window.dashboardCube) : null;
+    } catch (error) {
+        console.error('Could not decode the dashboard data:', error);
+    }
+    console.log('Dashboard cube loaded:', cube ? cube.buckets.day.start.length + ' days' : 'NO DATA');
+}
+
+// The data is not part of the page: dashboard_data.js names the current (content-hashed) data file,
+// which is loaded here so a data refresh only replaces that file and browsers can cache each version
+function loadDashboardData(onLoaded) {
+    if (window.dashboardCube || !window.dashboardDataFile) {
+        decodeDashboardData();
+        onLoaded();
+        return;
+    }
+    const script = document.createElement('script');
+    script.src = window.dashboardDataFile;
+    script.onload = () => {
+        decodeDashboardData();
+        onLoaded();
+    };
+    script.onerror = () => {
+        console.error('Could not load dashboard data from', script.src);
+        onLoaded();
+    };
+    document.head.appendChild(script);
 }
 
 // Theme management
@@ -118,17 +176,11 @@ function initializePeriodSlicer() {
     let periodsToUse = window.availablePeriods || [];
     console.log('Periods to use from window:', periodsToUse);
     
-    // Fallback: get unique periods from actual data if availablePeriods is empty
+    // Fallback: take the periods from the cube if availablePeriods is empty
     if (periodsToUse.length === 0) {
-        console.log('No periods from window, generating from data...');
-        const periodsSet = new Set();
-        data.forEach(row => {
-            if (row.MonthYear) {
-                periodsSet.add(row.MonthYear);
-            }
-        });
-        periodsToUse = Array.from(periodsSet).sort();
-        console.log('Generated periods from data:', periodsToUse);
+        console.log('No periods from window, taking them from the cube...');
+        periodsToUse = cube ? cube.periods : [];
+        console.log('Periods from cube:', periodsToUse);
     }
     
     if (periodsToUse.length === 0) {
@@ -184,18 +236,11 @@ function initializeMetricSelector() {
     let metricsToUse = window.availableMetrics || [];
     console.log('Metrics to use from window:', metricsToUse);
     
-    // Fallback: get available metrics from actual data if availableMetrics is empty
+    // Fallback: take the metrics from the cube if availableMetrics is empty
     if (metricsToUse.length === 0) {
-        console.log('No metrics from window, generating from data...');
-        metricsToUse = [];
-        if (data.length > 0) {
-            Object.keys(data[0]).forEach(key => {
-                if (key !== 'Date' && key !== 'MonthYear' && typeof data[0][key] === 'number') {
-                    metricsToUse.push(key);
-                }
-            });
-        }
-        console.log('Generated metrics from data:', metricsToUse);
+        console.log('No metrics from window, taking them from the cube...');
+        metricsToUse = cube ? cube.metrics : [];
+        console.log('Metrics from cube:', metricsToUse);
     }
     
     if (metricsToUse.length === 0) {
@@ -324,6 +369,40 @@ function ensureChartDivs() {
     }
 }
 
+// Indices into cube.periods of the selected periods, in date order
+function selectedPeriodIndices(selectedPeriods) {
+    return selectedPeriods
+        .map(period => cube.periodIndex.get(period))
+        .filter(index => index !== undefined)
+        .sort((a, b) => a - b);
+}
+
+// Number of buckets of one size ('day', 'week' or 'month') in the given periods, from the index alone
+function countBuckets(bucketName, periodIndices) {
+    const offsets = cube.buckets[bucketName].offsets;
+    return periodIndices.reduce((count, p) => count + offsets[p + 1] - offsets[p], 0);
+}
+
+// Indices of the buckets of one size that lie in the given periods, in date order
+function selectedBuckets(bucketName, periodIndices) {
+    const offsets = cube.buckets[bucketName].offsets;
+    const indices = [];
+    periodIndices.forEach(p => {
+        for (let i = offsets[p]; i < offsets[p + 1]; i++) {
+            indices.push(i);
+        }
+    });
+    return indices;
+}
+
+// Remove every chart, e.g. when nothing is selected
+function clearCharts(overviewChartsArea) {
+    Array.from(overviewChartsArea.children).forEach(chartDiv => Plotly.purge(chartDiv));
+    overviewChartsArea.innerHTML = '';
+    Plotly.purge('trends-chart');
+    document.getElementById('trends-chart').innerHTML = '';
+}
+
 // Update all charts based on selected filters
 function updateCharts() {
     console.log("updateCharts called.");
@@ -333,7 +412,6 @@ function updateCharts() {
     const selectedMetrics = getSelectedMetrics();
 
     const overviewChartsArea = document.getElementById('overview-charts-area');
-    // const comparisonDiv = document.getElementById('comparison-chart'); // REMOVED
     const trendsDiv = document.getElementById('trends-chart');
     const summaryStatsContainer = document.getElementById('summary-stats');
 
@@ -342,58 +420,64 @@ function updateCharts() {
         return;
     }
     
-    overviewChartsArea.innerHTML = ''; // Clear previous overview charts
-    // comparisonDiv.innerHTML = ''; // REMOVED
-    trendsDiv.innerHTML = '';
-    summaryStatsContainer.innerHTML = '';
+    refreshRawRows(selectedPeriods);
 
     if (selectedPeriods.length === 0 || selectedMetrics.length === 0) {
         console.log("No periods or metrics selected. Displaying message.");
+        clearCharts(overviewChartsArea);
         summaryStatsContainer.innerHTML = '<p style="text-align: center; color: var(--text-secondary); padding: 40px;">Please select at least one time period and one metric to display charts.</p>';
         return;
     }
 
-    const filteredData = data.filter(row => selectedPeriods.includes(row.MonthYear));
-    console.log("Filtered data length:", filteredData.length);
+    // The monthly buckets are the cached per-period aggregates; everything below combines them
+    const periodIndices = cube ? selectedPeriodIndices(selectedPeriods) : [];
+    const months = cube ? selectedBuckets('month', periodIndices) : [];
+    console.log("Selected months with data:", months.length);
 
-    if (filteredData.length === 0) {
+    if (months.length === 0) {
         console.log("No data available for selected filters. Displaying message.");
+        clearCharts(overviewChartsArea);
         summaryStatsContainer.innerHTML = '<p style="text-align: center; color: var(--text-secondary); padding: 40px;">No data available for the selected periods.</p>';
         return;
     }
 
     console.log("Proceeding to create charts.");
     try {
-        // Create individual overview chart for each selected metric
-        selectedMetrics.forEach((metric) => {
-            const chartId = `overview-chart-${metric.replace(/\s+/g, '-')}`;
-            const chartDiv = document.createElement('div');
-            chartDiv.id = chartId;
-            chartDiv.style.marginBottom = "30px"; // Add space between metric overview charts
-            overviewChartsArea.appendChild(chartDiv);
-            createSingleMetricOverviewChart(filteredData, metric, chartId);
+        // One overview chart per selected metric. Existing charts are updated in place,
+        // charts of metrics that were deselected are removed.
+        const chartIds = selectedMetrics.map(metric => `overview-chart-${metric.replace(/\s+/g, '-')}`);
+        const wanted = new Set(chartIds);
+        Array.from(overviewChartsArea.children).forEach(chartDiv => {
+            if (!wanted.has(chartDiv.id)) {
+                Plotly.purge(chartDiv);
+                overviewChartsArea.removeChild(chartDiv);
+            }
+        });
+        selectedMetrics.forEach((metric, index) => {
+            let chartDiv = document.getElementById(chartIds[index]);
+            if (!chartDiv) {
+                chartDiv = document.createElement('div');
+                chartDiv.id = chartIds[index];
+                chartDiv.style.marginBottom = "30px"; // Add space between metric overview charts
+            }
+            overviewChartsArea.appendChild(chartDiv); // (re)appending keeps the charts in metric order
+            createSingleMetricOverviewChart(months, metric, chartIds[index]);
         });
         
-        // createComparisonChart(filteredData, selectedMetrics); // REMOVED
-        createTrendsChart(filteredData, selectedMetrics);
-        updateSummaryStats(filteredData, selectedMetrics);
+        createTrendsChart(periodIndices, selectedMetrics);
+        updateSummaryStats(months, selectedMetrics);
     } catch (error) {
         console.error("Error during chart creation process:", error);
         summaryStatsContainer.innerHTML = `<p style="text-align: center; color: red; padding: 40px;">Error generating charts: ${error.message}</p>`;
     }
 }
 
-// Renamed and modified from createOverviewChart
 // Overview: Line chart for a SINGLE metric, x=MonthYear, y=metric sum per period
-function createSingleMetricOverviewChart(filteredData, metric, chartId) {
-    console.log(`Attempting to create Overview chart for METRIC: ${metric} on div ID: ${chartId}. Data rows: ${filteredData.length}`);
-    const periods = Array.from(new Set(filteredData.map(row => row.MonthYear))).sort();
-    
-    const yValues = periods.map(period =>
-        filteredData
-            .filter(row => row.MonthYear === period)
-            .reduce((sum, row) => sum + (row[metric] || 0), 0)
-    );
+function createSingleMetricOverviewChart(months, metric, chartId) {
+    console.log(`Attempting to create Overview chart for METRIC: ${metric} on div ID: ${chartId}. Months: ${months.length}`);
+    const monthBuckets = cube.buckets.month;
+    const periods = months.map(i => cube.periods[monthBuckets.period[i]]);
+    const yValues = months.map(i => monthBuckets.sum[metric][i]);
     
     const trace = { 
         x: periods, 
@@ -417,52 +501,62 @@ function createSingleMetricOverviewChart(filteredData, metric, chartId) {
         font: { color: themeColors.text }, 
         legend: { font: { color: themeColors.text } }
     };
-    Plotly.newPlot(chartId, [trace], layout); // Plot to the specific chartId
+    Plotly.react(chartId, [trace], layout); // Updates the chart in place if it already exists
     console.log(`Overview chart for ${metric} plotting attempted on ${chartId}.`);
 }
 
-// Trends: Line chart, x=Date, y=metric value per day (remains mostly the same)
-function createTrendsChart(filteredData, selectedMetrics) {
-    console.log(`Attempting to create Trends chart. Data rows: ${filteredData.length}, Metrics: ${selectedMetrics.join(', ')}`);
-    const sortedData = [...filteredData].sort((a, b) => a.Date.getTime() - b.Date.getTime());
+// Trends: Line chart of each metric per day, or per week / month when there are too many days
+function createTrendsChart(periodIndices, selectedMetrics) {
+    let bucketName = 'day';
+    if (countBuckets('day', periodIndices) > MAX_TREND_POINTS) {
+        bucketName = countBuckets('week', periodIndices) > MAX_TREND_POINTS ? 'month' : 'week';
+    }
+    const indices = selectedBuckets(bucketName, periodIndices);
+    console.log(`Attempting to create Trends chart. ${indices.length} ${bucketName}s, Metrics: ${selectedMetrics.join(', ')}`);
 
+    const buckets = cube.buckets[bucketName];
+    // Plotly reads numbers on a date axis as milliseconds since 1970-01-01
+    const xValues = indices.map(i => buckets.start[i] * MS_PER_DAY);
     const traces = selectedMetrics.map((metric) => {
-        const xValues = sortedData.map(row => row.Date);
-        const yValues = sortedData.map(row => row[metric] || 0);
-        // Log only a sample if data is large
-        const xSample = xValues.slice(0,5).map(d => d.toISOString().split('T')[0]).join(', ');
-        const ySample = yValues.slice(0,5).join(', ');
-        console.log(`Trends - Metric: ${metric}, X (sample): [${xSample}...], Y (sample): [${ySample}...]`);
+        const yValues = indices.map(i => buckets.sum[metric][i]);
+        console.log(`Trends - Metric: ${metric}, X (sample): [${xValues.slice(0, 5).join(', ')}...], Y (sample): [${yValues.slice(0, 5).join(', ')}...]`);
         return { x: xValues, y: yValues, type: 'scatter', mode: 'lines+markers', name: metric, line: { width: 2 }, marker: { size: 6 } };
     });
 
+    const titles = { day: 'Daily Trends', week: 'Weekly Trends', month: 'Monthly Trends' };
     const themeColors = getThemeColors();
     const layout = {
-        title: { text: 'Daily Trends', font: { color: themeColors.text } },
+        title: { text: titles[bucketName], font: { color: themeColors.text } },
         xaxis: { title: 'Date', type: 'date', color: themeColors.text, gridcolor: themeColors.grid },
         yaxis: { title: 'Value', color: themeColors.text, gridcolor: themeColors.grid },
         height: 400, plot_bgcolor: themeColors.background, paper_bgcolor: themeColors.paper, font: { color: themeColors.text }, legend: { font: { color: themeColors.text } }
     };
-    Plotly.newPlot('trends-chart', traces, layout);
+    Plotly.react('trends-chart', traces, layout);
     console.log("Trends chart plotting attempted.");
 }
 
-// Update summary statistics
-function updateSummaryStats(filteredData, selectedMetrics) {
+// Update summary statistics by combining the monthly aggregates
+function updateSummaryStats(months, selectedMetrics) {
     console.log('Updating summary stats');
-    if (filteredData.length === 0 || selectedMetrics.length === 0) {
+    if (months.length === 0 || selectedMetrics.length === 0) {
         document.getElementById('summary-stats').innerHTML = '<p style="text-align: center; color: var(--text-secondary); padding: 20px;">No data available for the selected metrics and periods.</p>';
         return;
     }
 
+    const monthBuckets = cube.buckets.month;
+    const days = months.reduce((count, i) => count + monthBuckets.count[i], 0);
     let statsHtml = '<h3 style="color: var(--text-primary);">Summary Statistics</h3>';
     
     selectedMetrics.forEach(metric => {
-        const values = filteredData.map(row => row[metric] || 0);
-        const total = values.reduce((sum, val) => sum + val, 0);
-        const average = values.length > 0 ? total / values.length : 0;
-        const max = values.length > 0 ? Math.max(...values) : 0;
-        const min = values.length > 0 ? Math.min(...values) : 0;
+        let total = 0;
+        let max = -Infinity;
+        let min = Infinity;
+        months.forEach(i => {
+            total += monthBuckets.sum[metric][i];
+            max = Math.max(max, monthBuckets.max[metric][i]);
+            min = Math.min(min, monthBuckets.min[metric][i]);
+        });
+        const average = days > 0 ? total / days : 0;
         
         statsHtml += `
             <div style="margin: 20px 0; padding: 15px; background: var(--bg-primary); border-radius: 8px; border: 1px solid var(--border-color);">
@@ -493,7 +587,7 @@ function updateSummaryStats(filteredData, selectedMetrics) {
         <div style="margin-top: 20px; padding: 15px; background: var(--bg-primary); border-radius: 8px; border: 1px solid var(--border-color);">
             <p style="color: var(--text-primary);"><strong>Selected Time Periods:</strong> ${getSelectedPeriods().length} periods</p>
             <p style="color: var(--text-primary);"><strong>Selected Metrics:</strong> ${selectedMetrics.length} metrics</p>
-            <p style="color: var(--text-primary);"><strong>Data Points:</strong> ${filteredData.length} days</p>
+            <p style="color: var(--text-primary);"><strong>Data Points:</strong> ${days} days</p>
         </div>
     `;
     
@@ -501,6 +595,75 @@ function updateSummaryStats(filteredData, selectedMetrics) {
     console.log('Summary stats updated');
 }
 
+// Raw rows are not part of the page; they are loaded from their own file the first time they are shown
+function loadRawRows(onLoaded) {
+    if (window.dashboardRows) {
+        onLoaded();
+        return;
+    }
+    const script = document.createElement('script');
+    script.src = window.dashboardRowsFile || 'dashboard_rows.js';
+    script.onload = () => {
+        console.log('Raw rows loaded:', window.dashboardRows ? window.dashboardRows.length : 0);
+        updateDebugInfo();
+        onLoaded();
+    };
+    script.onerror = () => {
+        console.error('Could not load raw rows from', script.src);
+        const container = document.getElementById('raw-rows');
+        if (container) {
+            container.innerHTML = `<p style="color: red;">Could not load ${script.src}.</p>`;
+        }
+    };
+    document.head.appendChild(script);
+}
+
+function toggleRawRows() {
+    const container = document.getElementById('raw-rows');
+    const button = document.getElementById('raw-rows-toggle');
+    if (!container) {
+        return;
+    }
+    if (container.style.display === 'none') {
+        container.style.display = 'block';
+        if (button) button.textContent = 'Hide Rows';
+        container.innerHTML = '<p style="color: var(--text-secondary);">Loading rows...</p>';
+        loadRawRows(() => refreshRawRows(getSelectedPeriods()));
+    } else {
+        container.style.display = 'none';
+        if (button) button.textContent = 'Show Rows';
+    }
+}
+
+function escapeHtml(value) {
+    return String(value).replace(/[&<>"']/g, ch => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }[ch]));
+}
+
+// Table of the raw rows in the selected periods (only while the table is shown)
+function refreshRawRows(selectedPeriods) {
+    const container = document.getElementById('raw-rows');
+    if (!container || container.style.display === 'none' || !window.dashboardRows) {
+        return;
+    }
+    const wanted = new Set(selectedPeriods);
+    const rows = window.dashboardRows.filter(row => wanted.has(row.MonthYear));
+    if (rows.length === 0) {
+        container.innerHTML = '<p style="color: var(--text-secondary);">No rows in the selected periods.</p>';
+        return;
+    }
+    const columns = Object.keys(rows[0]);
+    const shown = rows.slice(0, MAX_RAW_ROWS);
+    const cell = 'padding: 4px 8px; border-bottom: 1px solid var(--border-color); text-align: left;';
+    container.innerHTML = `
+        <h3 style="color: var(--text-primary);">Raw Data</h3>
+        <p style="color: var(--text-secondary);">Showing ${shown.length} of ${rows.length} rows</p>
+        <table style="border-collapse: collapse; width: 100%; color: var(--text-primary);">
+            <thead><tr>${columns.map(column => `<th style="${cell}">${escapeHtml(column)}</th>`).join('')}</tr></thead>
+            <tbody>${shown.map(row => `<tr>${columns.map(column => `<td style="${cell}">${escapeHtml(row[column])}</td>`).join('')}</tr>`).join('')}</tbody>
+        </table>
+    `;
+}
+
 // Control functions
 function selectAllPeriods() {
     console.log('Selecting all periods');
@@ -628,8 +791,8 @@ function robustInitializeDashboard(attempt = 0) {
     console.log('Dashboard initialized successfully after a total of', attempt, 'attempts for Plotly/DOM.');
 }
 
-// Initial call to start the process
-robustInitializeDashboard();
+// Initial call to start the process, once the data file has loaded
+loadDashboardData(() => robustInitializeDashboard());
 
 // Fallback: This checks after a longer delay.
 // The main robustInitializeDashboard should handle most cases.
@@ -1,103 +1,346 @@
+import time
 import sys
 import os
 
+# Start of the startup-time budget reported in the log
+STARTUP_BEGIN = time.perf_counter()
+
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
 
 import ctypes
 import platform
 import subprocess
 import datetime
-import tkinter as tk
-from tkinter import messagebox
+import argparse
+import importlib
+import importlib.util
+import shutil
 from contextlib import redirect_stdout, redirect_stderr
-from tqdm import tqdm
 import runpy
 import threading
-import psutil
-import time
 import io
 import json
+import math
+import queue
+import collections
+import traceback
+import functools
+import socket
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from path_utils import PathManager, calculate_sha256, is_within, is_headless, reset_io_stats, get_io_stats, clear_dataset_registry
 
-class TeeOutput:
-    """Captures output to both console and log file"""
-    def __init__(self, log_file, original_stream):
+# Declared pipeline graph. Each stage lists the stages it must wait for and the
+# files it reads/writes, as 'dataset:<dataset key>' or '<directory key>:<filename>'
+# ('root' refers to the project root; a '*' in the filename matches content-hashed files).
+PIPELINE_STAGES = {
+    'clean.py': {
+        'depends_on': [],
+        'inputs': ['dataset:instagram_analytics_excel'],
+        'outputs': [
+            'dataset:instagram_age_gender',
+            'dataset:instagram_post_engagement',
+            'dataset:instagram_profile_overview',
+            'dataset:instagram_top_cities',
+        ],
+    },
+    'averageengagement.py': {
+        'depends_on': ['clean.py'],
+        'inputs': ['dataset:instagram_post_engagement'],
+        'outputs': ['graphs:graph1.png'],
+    },
+    'mediareach.py': {
+        'depends_on': ['clean.py'],
+        'inputs': ['dataset:instagram_post_engagement'],
+        'outputs': ['graphs:graph2_monthly.png', 'graphs:graph2_weekly.png'],
+    },
+    'feedvsreel.py': {
+        'depends_on': ['clean.py'],
+        'inputs': ['dataset:instagram_post_engagement'],
+        'outputs': ['graphs:graph3.png'],
+    },
+    'age.py': {
+        'depends_on': ['clean.py'],
+        'inputs': ['dataset:instagram_age_gender'],
+        'outputs': ['graphs:graph4_female.png', 'graphs:graph4_male.png', 'graphs:graph4_undefined.png'],
+    },
+    'reportgeneration.py': {
+        'depends_on': ['averageengagement.py', 'mediareach.py', 'feedvsreel.py', 'age.py'],
+        'inputs': [
+            'graphs:graph1.png', 'graphs:graph2_monthly.png', 'graphs:graph2_weekly.png', 'graphs:graph3.png',
+            'graphs:graph4_female.png', 'graphs:graph4_male.png', 'graphs:graph4_undefined.png',
+        ],
+        'outputs': ['root:report.qmd', 'root:report.html'],
+    },
+    'dashboardgeneration.py': {
+        'depends_on': ['clean.py'],
+        'inputs': ['dataset:instagram_profile_overview', 'root:dashboard_script.js'],
+        'outputs': [
+            'root:dashboard_data.js', 'root:dashboard_data.*.js', 'root:dashboard_rows.*.js',
+            'root:plotly-*.min.js', 'root:dashboard.html',
+        ],
+    },
+    # Add more stages here, declaring their dependencies, inputs and outputs.
+}
+
+# Number of stages allowed to run at the same time (1 = serial, in-process)
+DEFAULT_PIPELINE_JOBS = min(4, os.cpu_count() or 1)
+
+# Content-hash record of the last successful run of each stage (in the project root)
+MANIFEST_FILENAME = 'pipeline_manifest.json'
+# Helper modules the stage scripts import; they are part of every stage's fingerprint
+SHARED_STAGE_MODULES = ['path_utils.py', 'chart_renderer.py', 'stats_utils.py']
+
+# Machine-readable run records (JSON Lines, one file per run next to the text log)
+RUN_RECORD_PREFIX = 'run_'
+
+# Cached results of the external tool checks (in the project root)
+DEPENDENCY_CACHE_FILENAME = 'dependency_cache.json'
+
+# Isolated mode (--isolate): each stage runs in its own subprocess, killed after
+# PIPELINE_STAGE_TIMEOUT seconds or above PIPELINE_STAGE_MEMORY_MB of RSS (0 = no limit)
+# and retried up to PIPELINE_STAGE_RETRIES times
+DEFAULT_STAGE_TIMEOUT = 1800
+DEFAULT_STAGE_MEMORY_MB = 0
+DEFAULT_STAGE_RETRIES = 1
+# Seconds between timeout/memory checks of an isolated stage
+STAGE_POLL_INTERVAL = 0.2
+
+# Seconds between flushes of the log file, and how many writes may wait for the log writer
+LOG_FLUSH_INTERVAL = 0.5
+LOG_QUEUE_SIZE = 10000
+
+# Seconds between resource samples of a running stage (PIPELINE_SAMPLE_INTERVAL overrides)
+DEFAULT_SAMPLE_INTERVAL = 0.1
+# Samples kept per stage; the oldest are dropped once the ring buffer is full
+RESOURCE_SAMPLE_LIMIT = 10000
+# Minimum seconds between GPU tool invocations (each one spawns a process)
+GPU_SAMPLE_INTERVAL = 2.0
+
+# Warm pipeline server (--serve): Unix socket in the project root (PIPELINE_SOCKET overrides)
+# and the libraries it imports once so each submitted run starts without paying for them
+SERVER_SOCKET_FILENAME = 'pipeline.sock'
+SERVER_WARM_MODULES = ['pandas', 'numpy', 'matplotlib.pyplot', 'seaborn', 'scipy.stats', 'path_utils', 'chart_renderer', 'stats_utils']
+
+# Watch mode (--watch): seconds between dataset directory scans (without watchdog, or as a
+# safety net with it), and how long a changed file must stay unchanged before it is processed
+WATCH_POLL_INTERVAL = 1.0
+WATCH_RESCAN_INTERVAL = 30.0
+WATCH_SETTLE_SECONDS = 2.0
+
+# Modules kept out of master.py's startup path. tkinter, tqdm and psutil are imported on
+# first use (tkinter only when a prompt is shown); the rest only by the stage scripts.
+HEAVY_MODULES = ['tkinter', 'tqdm', 'psutil', 'pandas', 'numpy', 'matplotlib', 'seaborn', 'scipy', 'rpy2', 'bs4', 'requests']
+
+# How each prompt is answered in headless mode. Override with --answer NAME=yes|no
+# or PIPELINE_ANSWERS="NAME=yes|no,...".
+HEADLESS_ANSWERS = {
+    'debug_consent': False,     # collect OS/CPU/GPU/RAM information in the log
+    'log_cleanup': True,        # delete the oldest log once there are 10
+    'install_dependency': False,  # pip install plotly/psutil if missing
+    'install_module': False,    # pip install a module a stage failed to import
+    'kill_quarto': False,       # terminate running Quarto processes
+}
+
+# Process exit codes
+EXIT_OK = 0
+EXIT_SETUP_FAILED = 1
+EXIT_STAGE_FAILED = 3
+
+# Seconds spent importing each deferred module, for the startup report
+IMPORT_TIMES = {}
+
+def lazy_import(module_name):
+    """Import a module on first use and record how long the import took"""
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        IMPORT_TIMES[module_name] = time.perf_counter() - start
+    return module
+
+class AsyncLogWriter:
+    """Writes log text to a file from a background thread so printing never waits on disk"""
+    _CLOSE = object()
+
+    def __init__(self, log_file, flush_interval=LOG_FLUSH_INTERVAL, max_queued=LOG_QUEUE_SIZE):
         self.log_file = log_file
+        self.flush_interval = flush_interval
+        self.max_queued = max_queued
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+        self.pid = os.getpid()
+
+    def write(self, text):
+        # Forked workers inherit the tee but not the writer thread; their output reaches
+        # the log through the stage results instead
+        if text and os.getpid() == self.pid:
+            # Bounded: if the disk falls behind, writers wait instead of memory growing
+            while self.queue.qsize() >= self.max_queued and self.thread.is_alive():
+                time.sleep(0.001)
+            self.queue.put(text)
+
+    def close(self):
+        """Write everything still queued, flush and stop the writer thread"""
+        if self.thread.is_alive():
+            self.queue.put(self._CLOSE)
+            self.thread.join()
+
+    def _write_loop(self):
+        last_flush = time.monotonic()
+        closing = False
+        while not closing:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batch = []
+            # Take whatever else is already queued so it goes out in one write
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self._CLOSE in batch:
+                closing = True
+                batch = [item for item in batch if item is not self._CLOSE]
+            if batch:
+                self.log_file.write(''.join(batch))
+            if closing or time.monotonic() - last_flush >= self.flush_interval:
+                self.log_file.flush()
+                last_flush = time.monotonic()
+
+class TeeOutput:
+    """Captures output to both console and log file (the log is written by an AsyncLogWriter)"""
+    def __init__(self, log_writer, original_stream):
+        self.log_writer = log_writer
         self.original_stream = original_stream
         
     def write(self, text):
         self.original_stream.write(text)
-        self.original_stream.flush()
-        self.log_file.write(text)
-        self.log_file.flush()
+        self.log_writer.write(text)
+        return len(text)
         
     def flush(self):
         self.original_stream.flush()
-        self.log_file.flush()
+
+    def __getattr__(self, name):
+        # encoding, isatty, fileno, ... come from the console stream
+        return getattr(self.original_stream, name)
 
 class ResourceMonitor:
-    """Monitors CPU, RAM, and GPU usage during script execution"""
-    def __init__(self):
-        self.monitoring = False
-        self.cpu_samples = []
-        self.ram_samples = []
-        self.gpu_samples = []
+    """Samples the CPU and memory use of this process and its children (and GPU use, if a GPU tool exists) while a stage runs"""
+    # Vendor tool found by the one-time GPU probe ('' if none), shared by all monitors in the process
+    _gpu_tool = None
+
+    def __init__(self, interval=None, max_samples=RESOURCE_SAMPLE_LIMIT):
+        if interval is None:
+            try:
+                interval = float(os.environ.get('PIPELINE_SAMPLE_INTERVAL', DEFAULT_SAMPLE_INTERVAL))
+            except ValueError:
+                interval = DEFAULT_SAMPLE_INTERVAL
+        self.interval = max(interval, 0.01)
+        # Ring buffers: long stages keep only the most recent samples
+        self.samples = collections.deque(maxlen=max_samples)
+        self.gpu_samples = collections.deque(maxlen=max_samples)
+        self.process = None
         self.monitor_thread = None
+        self._stop_event = threading.Event()
+        self._last_cpu = None
+        self._cpu_start = 0.0
+        self._last_gpu_time = 0.0
         
     def start_monitoring(self):
-        self.monitoring = True
-        self.cpu_samples = []
-        self.ram_samples = []
-        self.gpu_samples = []
+        try:
+            psutil = lazy_import('psutil')
+        except ImportError:
+            return  # resource monitoring is disabled without psutil
+        self.process = psutil.Process(os.getpid())
+        self.samples.clear()
+        self.gpu_samples.clear()
+        self._stop_event.clear()
+        self._last_cpu = (time.perf_counter(), self._cpu_seconds())
+        self._cpu_start = self._last_cpu[1]
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
         
     def stop_monitoring(self):
-        self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=2)
+        if self.monitor_thread is None:
+            return
+        self._stop_event.set()
+        self.monitor_thread.join()
+        self.monitor_thread = None
+        # Final sample so even stages shorter than the interval are measured
+        self._sample()
             
     def _monitor_loop(self):
-        while self.monitoring:
+        while not self._stop_event.wait(self.interval):
             try:
-                # CPU usage
-                cpu_percent = psutil.cpu_percent(interval=None)
-                self.cpu_samples.append(cpu_percent)
-                
-                # RAM usage
-                memory = psutil.virtual_memory()
-                ram_percent = memory.percent
-                ram_used_gb = memory.used / (1024**3)
-                self.ram_samples.append((ram_percent, ram_used_gb))
-                
-                # GPU usage (requires nvidia-ml-py or similar)
-                gpu_usage = self._get_gpu_usage()
-                if gpu_usage is not None:
-                    self.gpu_samples.append(gpu_usage)
-                    
-                time.sleep(1)  # Sample every second
+                self._sample()
             except Exception as e:
                 print(f"Error in resource monitoring: {e}")
+                return
+
+    def _processes(self):
+        """This process and its live descendants (e.g. chart workers, Quarto)"""
+        try:
+            return [self.process] + self.process.children(recursive=True)
+        except Exception:
+            return [self.process]
+
+    def _cpu_seconds(self):
+        """CPU time used so far by this process, its live children and its finished children"""
+        times = self.process.cpu_times()
+        total = times.user + times.system + getattr(times, 'children_user', 0) + getattr(times, 'children_system', 0)
+        for child in self._processes()[1:]:
+            try:
+                child_times = child.cpu_times()
+                total += child_times.user + child_times.system
+            except Exception:
+                continue  # exited or not accessible
+        return total
+
+    def _rss_bytes(self):
+        total = 0
+        for process in self._processes():
+            try:
+                total += process.memory_info().rss
+            except Exception:
+                continue
+        return total
+
+    def _sample(self):
+        now = time.perf_counter()
+        cpu_seconds = self._cpu_seconds()
+        last_time, last_cpu_seconds = self._last_cpu
+        self._last_cpu = (now, cpu_seconds)
+        elapsed = now - last_time
+        # Percent of one core, like top: above 100% when several cores are busy
+        cpu_percent = max(cpu_seconds - last_cpu_seconds, 0) / elapsed * 100 if elapsed > 0 else 0.0
+        self.samples.append((cpu_percent, self._rss_bytes()))
+
+        # GPU tools are separate processes, so poll them at most once per GPU_SAMPLE_INTERVAL
+        if self._detect_gpu_tool() and now - self._last_gpu_time >= GPU_SAMPLE_INTERVAL:
+            self._last_gpu_time = now
+            gpu_usage = self._get_gpu_usage()
+            if gpu_usage:
+                self.gpu_samples.extend(gpu_usage)
+
+    @classmethod
+    def _detect_gpu_tool(cls):
+        """Find a supported GPU monitoring tool once; later calls reuse the answer"""
+        if cls._gpu_tool is None:
+            cls._gpu_tool = next((tool for tool in ('nvidia-smi', 'rocm-smi', 'intel_gpu_top') if shutil.which(tool)), '')
+        return cls._gpu_tool
                 
     def _get_gpu_usage(self):
-        """Get GPU usage for all supported GPU vendors"""
-        gpu_data = []
-        
-        # Try NVIDIA first
-        nvidia_data = self._get_nvidia_gpu_usage()
-        if nvidia_data:
-            gpu_data.extend(nvidia_data)
-            
-        # Try AMD
-        amd_data = self._get_amd_gpu_usage()
-        if amd_data:
-            gpu_data.extend(amd_data)
-            
-        # Try Intel
-        intel_data = self._get_intel_gpu_usage()
-        if intel_data:
-            gpu_data.extend(intel_data)
-            
-        return gpu_data if gpu_data else None
+        """Get GPU usage from the tool found by the GPU probe"""
+        readers = {
+            'nvidia-smi': self._get_nvidia_gpu_usage,
+            'rocm-smi': self._get_amd_gpu_usage,
+            'intel_gpu_top': self._get_intel_gpu_usage,
+        }
+        return readers[self._detect_gpu_tool()]()
         
     def _get_nvidia_gpu_usage(self):
         """Get NVIDIA GPU usage using nvidia-smi"""
@@ -124,16 +367,14 @@ class ResourceMonitor:
         return None
         
     def _get_amd_gpu_usage(self):
-        """Get AMD GPU usage using rocm-smi or radeontop"""
-        gpu_data = []
-        
-        # Try rocm-smi first (for newer AMD cards)
+        """Get AMD GPU usage using rocm-smi"""
         try:
             result = subprocess.run([
                 'rocm-smi', '--showuse', '--showmemuse'
             ], capture_output=True, text=True, timeout=5)
             
             if result.returncode == 0:
+                gpu_data = []
                 lines = result.stdout.strip().split('\n')
                 for i, line in enumerate(lines[1:]):  # Skip header
                     if 'GPU' in line:
@@ -145,22 +386,6 @@ class ResourceMonitor:
                 return gpu_data
         except (FileNotFoundError, subprocess.TimeoutExpired, ValueError, IndexError):
             pass
-            
-        # Fallback to WMI for basic AMD info
-        try:
-            result = subprocess.run([
-                'wmic', 'path', 'Win32_VideoController', 'where', 
-                'Name like "%AMD%" or Name like "%Radeon%"',
-                'get', 'Name,AdapterRAM'
-            ], capture_output=True, text=True, timeout=5)
-            
-            if result.returncode == 0 and 'AMD' in result.stdout or 'Radeon' in result.stdout:
-                # Basic detection only - no usage stats available via WMI
-                gpu_data.append(("AMD-0", 0, 0, 0))  # Placeholder values
-                return gpu_data
-        except (FileNotFoundError, subprocess.TimeoutExpired, ValueError):
-            pass
-            
         return None
         
     def _get_intel_gpu_usage(self):
@@ -171,66 +396,41 @@ class ResourceMonitor:
             ], capture_output=True, text=True, timeout=5)
             
             if result.returncode == 0:
-                # Use the globally imported json module
                 data = json.loads(result.stdout)
                 if 'engines' in data:
                     util = data.get('engines', {}).get('Render/3D', {}).get('busy', 0)
                     return [("Intel-0", util, 0, 0)]  # Intel tools don't easily expose memory
         except (FileNotFoundError, subprocess.TimeoutExpired, ValueError, json.JSONDecodeError):
             pass
-            
-        # Fallback to WMI for basic Intel detection
-        try:
-            result = subprocess.run([
-                'wmic', 'path', 'Win32_VideoController', 'where',
-                'Name like "%Intel%"', 'get', 'Name,AdapterRAM'
-            ], capture_output=True, text=True, timeout=5)
-            
-            if result.returncode == 0 and 'Intel' in result.stdout:
-                return [("Intel-0", 0, 0, 0)]  # Placeholder values
-        except (FileNotFoundError, subprocess.TimeoutExpired, ValueError):
-            pass
-            
         return None
-    def get_averages(self):
-        """Calculate average resource usage"""
-        cpu_avg = sum(self.cpu_samples) / len(self.cpu_samples) if self.cpu_samples else 0
-        
-        if self.ram_samples:
-            ram_percent_avg = sum(sample[0] for sample in self.ram_samples) / len(self.ram_samples)
-            ram_used_avg = sum(sample[1] for sample in self.ram_samples) / len(self.ram_samples)
-        else:
-            ram_percent_avg = ram_used_avg = 0
-            
-        gpu_info = None
-        if self.gpu_samples and any(self.gpu_samples):
-            # Average across all GPUs and samples
-            all_gpu_util = []
-            all_gpu_mem_percent = []
-            all_gpu_mem_used = []
-            
-            for sample in self.gpu_samples:
-                if sample:
-                    for gpu_data in sample:
-                        if len(gpu_data) >= 4:
-                            vendor, util, mem_percent, mem_used = gpu_data
-                            all_gpu_util.append(util)
-                            all_gpu_mem_percent.append(mem_percent)
-                            all_gpu_mem_used.append(mem_used)
-                        
-            if all_gpu_util:
-                gpu_info = {
-                    'utilization_avg': sum(all_gpu_util) / len(all_gpu_util),
-                    'memory_percent_avg': sum(all_gpu_mem_percent) / len(all_gpu_mem_percent),
-                    'memory_used_avg': sum(all_gpu_mem_used) / len(all_gpu_mem_used)
-                }
-                
-        return {
-            'cpu_percent': cpu_avg,
-            'ram_percent': ram_percent_avg,
-            'ram_used_gb': ram_used_avg,
-            'gpu': gpu_info
+
+    def get_summary(self):
+        """Average, 95th percentile and peak of the samples taken"""
+        cpu_values = [sample[0] for sample in self.samples]
+        rss_values = [sample[1] / (1024**2) for sample in self.samples]
+        summary = {
+            'samples': len(self.samples),
+            'interval': self.interval,
+            'cpu_seconds': self._last_cpu[1] - self._cpu_start if self._last_cpu else 0.0,
+            'cpu_percent': _summarize_samples(cpu_values),
+            'rss_mb': _summarize_samples(rss_values),
+            'gpu': None,
         }
+        if self.gpu_samples:
+            summary['gpu'] = {
+                'utilization': _summarize_samples([sample[1] for sample in self.gpu_samples]),
+                'memory_percent': _summarize_samples([sample[2] for sample in self.gpu_samples]),
+                'memory_used_mb': _summarize_samples([sample[3] for sample in self.gpu_samples]),
+            }
+        return summary
+
+def _summarize_samples(values):
+    """avg / p95 / peak of a list of samples (nearest-rank percentile; zeros when empty)"""
+    if not values:
+        return {'avg': 0.0, 'p95': 0.0, 'peak': 0.0}
+    ordered = sorted(values)
+    p95_index = max(math.ceil(0.95 * len(ordered)) - 1, 0)
+    return {'avg': sum(ordered) / len(ordered), 'p95': ordered[p95_index], 'peak': ordered[-1]}
 
 #––– helper to run a single external command elevated via UAC –––
 def run_as_admin(cmd, args):
@@ -246,6 +446,37 @@ def run_as_admin(cmd, args):
     except subprocess.CalledProcessError as e:
         raise RuntimeError(f"Failed to execute: {cmd} {args}")
 
+def parse_answers(text):
+    """Parse 'name=yes,name=no' into {name: bool}, rejecting unknown prompts and values"""
+    answers = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, _, value = item.partition('=')
+        name, value = name.strip(), value.strip().lower()
+        if name not in HEADLESS_ANSWERS:
+            raise ValueError(f"Unknown prompt '{name}' (expected one of: {', '.join(HEADLESS_ANSWERS)})")
+        if value not in ('yes', 'no'):
+            raise ValueError(f"Answer for '{name}' must be yes or no, not '{value}'")
+        answers[name] = value == 'yes'
+    return answers
+
+def ask_yes_no(prompt_name, title, message):
+    """Ask a yes/no question in a Tk dialog, or answer it from the policy in headless mode"""
+    if is_headless():
+        answers = dict(HEADLESS_ANSWERS)
+        answers.update(parse_answers(os.environ.get('PIPELINE_ANSWERS', '')))
+        answer = answers[prompt_name]
+        print(f"[headless] {title}: answered {'yes' if answer else 'no'} ({prompt_name})")
+        return answer
+
+    tk = lazy_import('tkinter')
+    messagebox = lazy_import('tkinter.messagebox')
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        return messagebox.askyesno(title, message)
+    finally:
+        root.destroy()
+
 #––– privileged operations –––
 def check_quarto_processes():
     try:
@@ -254,7 +485,8 @@ def check_quarto_processes():
             universal_newlines=True
         ).lower()
         if "quarto.exe" in out:
-            if messagebox.askyesno(
+            if ask_yes_no(
+                'kill_quarto',
                 "Quarto Detected", 
                 "Found running Quarto. Close all instances?"
             ):
@@ -266,53 +498,103 @@ def check_quarto_processes():
         print("Error checking/killing Quarto:", e)
 
 def show_error(msg):
+    if is_headless():
+        print(f"ERROR: {msg}", file=sys.stderr)
+        return
+    tk = lazy_import('tkinter')
+    messagebox = lazy_import('tkinter.messagebox')
     tk.Tk().withdraw()
     messagebox.showerror("Dependency Error", msg)
 
-def check_dependencies():
+def load_dependency_cache(cache_path):
+    """Read the cached tool checks, or an empty cache if there is none"""
     try:
-        subprocess.run(["quarto","--version"], check=True, stdout=subprocess.DEVNULL)
-    except FileNotFoundError:
-        show_error("Please install Quarto and add to PATH.")
-        sys.exit(1)
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_dependency_cache(cache_path, cache):
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, cache_path)
+
+def probe_tool(name, cache):
+    """Check that a command-line tool runs (`<name> --version`).
+
+    The result is cached under a key made of PATH and the resolved binary's mtime and
+    size, so the tool is only spawned again when one of them changes.
+    """
+    tool_path = shutil.which(name)
+    if tool_path is None:
+        return False
+    stat = os.stat(tool_path)
+    key = f"{os.environ.get('PATH', '')}|{tool_path}|{stat.st_mtime_ns}|{stat.st_size}"
+    if cache.get(name) == key:
+        return True
 
     try:
-        subprocess.run(["R","--version"], check=True, stdout=subprocess.DEVNULL)
-    except FileNotFoundError:
-        show_error("Please install R and add to PATH.")
-        sys.exit(1)
+        subprocess.run([tool_path, "--version"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        cache.pop(name, None)
+        return False
+    cache[name] = key
+    return True
 
-    # Check for plotly for dashboards
+def check_dependencies(cache_path):
+    cache = load_dependency_cache(cache_path)
     try:
-        import plotly
-    except ImportError:
-        root = tk.Tk(); root.withdraw()
-        install = messagebox.askyesno(
+        if not probe_tool("quarto", cache):
+            show_error("Please install Quarto and add to PATH.")
+            sys.exit(EXIT_SETUP_FAILED)
+
+        # R is only used to cross-check the t-tests in averageengagement.py
+        if os.environ.get('PIPELINE_R_CROSSCHECK', '').lower() not in ('', '0', 'false', 'no'):
+            if not probe_tool("R", cache):
+                show_error("Please install R and add to PATH.")
+                sys.exit(EXIT_SETUP_FAILED)
+    finally:
+        save_dependency_cache(cache_path, cache)
+
+    # Check for plotly for dashboards (without importing it)
+    if importlib.util.find_spec('plotly') is None:
+        install = ask_yes_no(
+            'install_dependency',
             "Plotly Missing",
             "Dashboards require Plotly for visualization.\nWould you like to install it now?"
         )
-        root.destroy()
         if install:
             subprocess.check_call([sys.executable, "-m", "pip", "install", "plotly"])
         else:
             print("Warning: Dashboard functionality will be limited without Plotly.")
 
     # Check for psutil for resource monitoring
-    try:
-        import psutil
-    except ImportError:
-        root = tk.Tk(); root.withdraw()
-        install = messagebox.askyesno(
+    if importlib.util.find_spec('psutil') is None:
+        install = ask_yes_no(
+            'install_dependency',
             "psutil Missing",
             "Resource monitoring requires psutil.\nWould you like to install it now?"
         )
-        root.destroy()
         if install:
             subprocess.check_call([sys.executable, "-m", "pip", "install", "psutil"])
-            import psutil
         else:
             print("Warning: Resource monitoring will be disabled without psutil.")
 
+def report_startup(timings):
+    """Print the startup-time budget: phase durations and deferred import times"""
+    print("=== STARTUP TIMINGS ===")
+    for phase, seconds in timings.items():
+        print(f"{phase}: {seconds:.3f}s")
+    if IMPORT_TIMES:
+        # Same layout as python -X importtime (microseconds)
+        print("import time: cumulative [us] | imported package")
+        for module_name, seconds in sorted(IMPORT_TIMES.items(), key=lambda item: item[1], reverse=True):
+            print(f"import time: {int(seconds * 1e6):>17} | {module_name}")
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    print(f"Heavy modules loaded before the first stage: {', '.join(loaded) if loaded else 'none'}")
+    print()
+
 def get_cpu_name():
     try:
         output = subprocess.check_output(
@@ -360,10 +642,10 @@ def get_total_ram():
 
 def validate_script_path(script_path, allowed_dir):
     """Validate script is in allowed directory and exists"""
-    script_path = os.path.abspath(script_path)
-    allowed_dir = os.path.abspath(allowed_dir)
+    script_path = os.path.realpath(script_path)
+    allowed_dir = os.path.realpath(allowed_dir)
     
-    if not script_path.startswith(allowed_dir):
+    if not is_within(script_path, allowed_dir):
         raise ValueError("Script outside allowed directory")
     if not os.path.exists(script_path):
         raise FileNotFoundError(f"Script not found: {script_path}")
@@ -371,15 +653,9 @@ def validate_script_path(script_path, allowed_dir):
 
 def safe_log_cleanup(log_dir):
     """Safely clean up log files"""
-    log_dir = os.path.abspath(log_dir)
-    log_files = []
-    
-    for f in os.listdir(log_dir):
-        if f.startswith("log_") and f.endswith(".txt"):
-            full_path = os.path.join(log_dir, f)
-            # Ensure file is actually in log directory
-            if os.path.abspath(full_path).startswith(log_dir):
-                log_files.append(f)
+    log_dir = os.path.realpath(log_dir)
+    # Names from listdir are single path components, so they all stay inside log_dir
+    log_files = [f for f in os.listdir(log_dir) if f.startswith("log_") and f.endswith(".txt")]
     
     return sorted(log_files, key=lambda f: os.path.getmtime(os.path.join(log_dir, f)))
 
@@ -396,182 +672,884 @@ def safe_install_module(module_name):
         module_name
     ])
 
-class PathManager:
-    """Centralized and validated path management for the project"""
+class BuildManifest:
+    """Content hashes of each stage's inputs and outputs from its last successful run"""
     
-    def __init__(self, project_root):
-        self.project_root = os.path.abspath(project_root)
-        self._validate_project_structure()
-        
-        # Define allowed dataset files
-        self.allowed_datasets = {
-            'instagram_analytics_excel': 'Copy of Instagram_Analytics - DO NOT DELETE (for interview purposes).xlsx',
-            'instagram_age_gender': 'Instagram Age Gender Demographi.csv',
-            'instagram_post_engagement': 'Instagram Post Engagement.csv', 
-            'instagram_profile_overview': 'Instagram Profile Overview.csv',
-            'instagram_top_cities': 'Instagram Top Cities Regions.csv'
-        }
-        
-        # Define project directories
-        self.directories = {
-            'dataset': os.path.join(self.project_root, 'dataset'),
-            'scripts': os.path.join(self.project_root, 'scripts'),
-            'graphs': os.path.join(self.project_root, 'graphs'),
-            'log': os.path.join(self.project_root, 'log')
-        }
-        
-    def _validate_project_structure(self):
-        """Validate that we're in the correct project directory"""
-        required_items = ['dataset', 'scripts']
-        for item in required_items:
-            item_path = os.path.join(self.project_root, item)
-            if not os.path.exists(item_path):
-                raise ValueError(f"Invalid project structure: missing {item} directory")
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+        self.entries = {}
+        self._hash_cache = {}
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.entries = data.get('stages', {})
+                self._hash_cache = data.get('hash_cache', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable build manifest {manifest_path}: {e}")
                 
-    def get_dataset_path(self, dataset_key):
-        """Get validated path to a dataset file"""
-        if dataset_key not in self.allowed_datasets:
-            raise ValueError(f"Dataset key '{dataset_key}' not allowed. Valid keys: {list(self.allowed_datasets.keys())}")
-            
-        filename = self.allowed_datasets[dataset_key]
-        filepath = os.path.join(self.directories['dataset'], filename)
-        
-        # Validate the file exists and is within dataset directory
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"Dataset file not found: {filepath}")
-            
-        # Security check: ensure file is actually in dataset directory
-        abs_filepath = os.path.abspath(filepath)
-        abs_dataset_dir = os.path.abspath(self.directories['dataset'])
-        if not abs_filepath.startswith(abs_dataset_dir):
-            raise ValueError(f"Security violation: file outside dataset directory")
-            
-        return abs_filepath
-        
-    def get_output_path(self, directory_key, filename):
-        """Get validated output path for graphs, logs, etc."""
-        if directory_key not in self.directories:
-            raise ValueError(f"Directory key '{directory_key}' not allowed")
-            
-        # Sanitize filename
-        safe_filename = self._sanitize_filename(filename)
-        output_dir = self.directories[directory_key]
-        
-        # Create directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, safe_filename)
-        
-        # Security check: ensure output is within intended directory
-        abs_output_path = os.path.abspath(output_path)
-        abs_output_dir = os.path.abspath(output_dir)
-        if not abs_output_path.startswith(abs_output_dir):
-            raise ValueError(f"Security violation: output path outside intended directory")
-            
-        return abs_output_path
+    def hash_file(self, path):
+        """SHA-256 of a file, reusing the previous hash while its size and mtime are unchanged"""
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        cached = self._hash_cache.get(path)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+        digest = calculate_sha256(path)
+        self._hash_cache[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        return digest
         
-    def _sanitize_filename(self, filename):
-        """Sanitize filename to prevent path traversal and invalid characters"""
-        import re
-        # Remove/replace dangerous characters
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        # Remove path traversal attempts
-        sanitized = sanitized.replace('..', '_').replace('~', '_')
-        # Limit length
-        sanitized = sanitized[:255]
-        # Ensure it's not empty
-        if not sanitized or sanitized in ['.', '..']:
-            sanitized = 'unnamed_file'
-        return sanitized
+    def fingerprint(self, paths):
+        """Map each path to its current content hash (None if missing)"""
+        return {path: self.hash_file(path) for path in paths}
         
-    def list_available_datasets(self):
-        """List all available dataset keys and their descriptions"""
-        return {
-            key: {
-                'filename': filename,
-                'exists': os.path.exists(os.path.join(self.directories['dataset'], filename))
-            }
-            for key, filename in self.allowed_datasets.items()
-        }
+    def is_up_to_date(self, stage_name, input_paths, output_paths):
+        """True if the stage's inputs match its last successful run and its outputs are intact"""
+        entry = self.entries.get(stage_name)
+        if not entry:
+            return False
+        if entry['inputs'] != self.fingerprint(input_paths):
+            return False
+        outputs = self.fingerprint(output_paths)
+        return all(outputs.values()) and entry['outputs'] == outputs
         
-    def export_paths_config(self):
-        """Export path configuration for use by other scripts"""
-        config = {
-            'project_root': self.project_root,
-            'datasets': {key: self.get_dataset_path(key) for key in self.allowed_datasets if os.path.exists(os.path.join(self.directories['dataset'], self.allowed_datasets[key]))},
-            'directories': self.directories
+    def record(self, stage_name, input_paths, output_paths):
+        """Store the hashes of a successful run of a stage"""
+        self.entries[stage_name] = {
+            'inputs': self.fingerprint(input_paths),
+            'outputs': self.fingerprint(output_paths),
+            'recorded': datetime.datetime.now().isoformat(timespec='seconds'),
         }
         
-        config_path = os.path.join(self.project_root, 'path_config.json')
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2)
-        return config_path
-
-def load_path_config():
-    """Load path configuration from JSON file (for use in other scripts)"""
-    config_path = 'path_config.json'
-    if not os.path.exists(config_path):
-        raise FileNotFoundError("Path configuration not found. Please run master.py first.")
+    def forget(self, stage_name):
+        """Drop a stage's entry so it is rerun next time"""
+        self.entries.pop(stage_name, None)
         
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
-    return config
+    def save(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'stages': self.entries, 'hash_cache': self._hash_cache}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+def resolve_pipeline_order(stages):
+    """Validate the stage graph and return the stage names in dependency order"""
+    for name, stage in stages.items():
+        for dependency in stage['depends_on']:
+            if dependency not in stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dependency}'")
+
+    ordered = []
+    remaining = dict(stages)
+    while remaining:
+        ready = [name for name, stage in remaining.items()
+                 if all(dep in ordered for dep in stage['depends_on'])]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages: {sorted(remaining)}")
+        for name in ready:
+            ordered.append(name)
+            del remaining[name]
+    return ordered
+
+def run_stage(script_path, capture_output=False):
+    """Run a single pipeline script once and return its result and resource usage"""
+    script_name = os.path.basename(script_path)
+    result = {
+        'script': script_name,
+        'status': 'ok',
+        'missing_module': None,
+        'output': '',
+    }
+    buffer = io.StringIO()
+    resource_monitor = ResourceMonitor()
+    reset_io_stats()
+    start_time = datetime.datetime.now()
+    resource_monitor.start_monitoring()
 
-def safe_read_csv(dataset_key, max_rows=100000):
-    """Safely read CSV with size limits and validation"""
-    config = load_path_config()
+    try:
+        if capture_output:
+            with redirect_stdout(buffer), redirect_stderr(buffer):
+                _execute_script(script_path, result)
+        else:
+            _execute_script(script_path, result)
+    finally:
+        resource_monitor.stop_monitoring()
+
+    result['duration'] = (datetime.datetime.now() - start_time).total_seconds()
+    result['resources'] = resource_monitor.get_summary()
+    result['io'] = get_io_stats()
+    result['output'] = buffer.getvalue()
+    return result
+
+def _execute_script(script_path, result):
+    """Execute a script with runpy, recording failures in the result dict"""
+    script_name = result['script']
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    except ModuleNotFoundError as e:
+        missing_module = e.name if hasattr(e, "name") else str(e).split("'")[1]
+        result['status'] = 'missing_module'
+        result['missing_module'] = missing_module
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            print(f"ERROR: {script_name} exited with code {e.code}")
+            result['status'] = 'failed'
+    except Exception as e:
+        print(f"ERROR in {script_name}: {e}")
+        traceback.print_exc()
+        result['status'] = 'failed'
+
+def run_stage_isolated(script_path, capture_output=False, timeout=DEFAULT_STAGE_TIMEOUT,
+                       memory_mb=DEFAULT_STAGE_MEMORY_MB, retries=DEFAULT_STAGE_RETRIES):
+    """Run a stage in a fresh `master.py --run-stage` subprocess, retrying failed attempts.
+
+    Same result dict as run_stage(), plus 'attempts' and 'failure' (None, 'timeout',
+    'memory_limit' or 'exit_code'). Without capture_output the stage output is
+    streamed to the console as it arrives.
+    """
+    for attempt in range(1, retries + 2):
+        result = _run_stage_subprocess(script_path, capture_output, timeout, memory_mb)
+        result['attempts'] = attempt
+        if result['status'] != 'failed' or attempt > retries:
+            return result
+        print(f"Retrying {result['script']} after {result['failure']} (attempt {attempt + 1} of {retries + 1})")
+
+def _run_stage_subprocess(script_path, capture_output, timeout, memory_mb):
+    script_name = os.path.basename(script_path)
+    result_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'log', f".stage_{os.getpid()}_{threading.get_ident()}.json")
+    os.makedirs(os.path.dirname(result_path), exist_ok=True)
+    command = [sys.executable, os.path.abspath(__file__), '--run-stage', script_path, '--result-file', result_path]
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+
+    start_time = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env)
+    output = []
+
+    def read_output():
+        for line in io.TextIOWrapper(process.stdout, encoding='utf-8', errors='replace'):
+            output.append(line)
+            if not capture_output:
+                sys.stdout.write(line)
+
+    reader = threading.Thread(target=read_output, daemon=True)
+    reader.start()
+    failure = _wait_for_stage_process(process, timeout, memory_mb)
+    reader.join()
+
+    result = None
+    if failure is None and os.path.exists(result_path):
+        with open(result_path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+    if os.path.exists(result_path):
+        os.remove(result_path)
+    if result is None:
+        # Killed or crashed before reporting: no resource figures from the child
+        result = {
+            'script': script_name,
+            'status': 'failed',
+            'missing_module': None,
+            'resources': ResourceMonitor().get_summary(),
+            'io': {},
+        }
+        failure = failure or 'exit_code'
+        if failure == 'timeout':
+            output.append(f"ERROR: {script_name} timed out after {timeout}s and was killed\n")
+        elif failure == 'memory_limit':
+            output.append(f"ERROR: {script_name} exceeded the {memory_mb} MB memory limit and was killed\n")
+        else:
+            output.append(f"ERROR: {script_name} exited with code {process.returncode}\n")
+        if not capture_output:
+            sys.stdout.write(output[-1])
+    elif result['status'] == 'failed':
+        failure = 'exit_code'
+
+    result['failure'] = failure
+    result['exit_code'] = process.returncode
+    result['duration'] = time.perf_counter() - start_time
+    result['output'] = ''.join(output) if capture_output else ''
+    return result
+
+def _wait_for_stage_process(process, timeout, memory_mb):
+    """Wait for a stage subprocess, killing it (and its children) on timeout or excess RSS. Returns the kill reason or None."""
+    psutil = None
+    if memory_mb:
+        try:
+            psutil = lazy_import('psutil')
+        except ImportError:
+            print("Warning: the stage memory limit needs psutil and is not enforced.")
+    deadline = time.monotonic() + timeout if timeout else None
+
+    while True:
+        try:
+            process.wait(timeout=STAGE_POLL_INTERVAL)
+            return None
+        except subprocess.TimeoutExpired:
+            pass
+        if deadline is not None and time.monotonic() > deadline:
+            _kill_process_tree(process)
+            return 'timeout'
+        if psutil is not None:
+            try:
+                parent = psutil.Process(process.pid)
+                rss = sum(p.memory_info().rss for p in [parent] + parent.children(recursive=True))
+            except psutil.Error:
+                continue
+            if rss > memory_mb * 1024 * 1024:
+                _kill_process_tree(process)
+                return 'memory_limit'
+
+def _kill_process_tree(process):
+    try:
+        psutil = lazy_import('psutil')
+        for child in psutil.Process(process.pid).children(recursive=True):
+            child.kill()
+    except Exception:
+        pass  # psutil missing or the process already exited
+    process.kill()
+    process.wait()
+
+def run_stage_child(script_path, result_path):
+    """Entry point of `master.py --run-stage`: run one stage and write its result as JSON"""
+    scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts')
+    result = run_stage(validate_script_path(script_path, scripts_dir))
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump({key: value for key, value in result.items() if key != 'output'}, f)
+    return EXIT_OK if result['status'] == 'ok' else EXIT_STAGE_FAILED
+
+def handle_missing_module(script_name, missing_module):
+    """Offer to install a module a stage could not import. Returns True to retry the stage."""
+    # Skip path_utils since it's a local module
+    if missing_module == 'path_utils':
+        print(f"ERROR: {script_name} cannot find path_utils.py")
+        print("Please ensure path_utils.py exists in the scripts directory")
+        return False
+
+    answer = ask_yes_no(
+        'install_module',
+        "Missing Module",
+        f"Module '{missing_module}' is missing when running {script_name}.\nWould you like to install it?"
+    )
+    if not answer:
+        print("Skipping installation and continuing.")
+        return False
+
+    try:
+        print(f"Installing module '{missing_module}'...")
+        safe_install_module(missing_module)
+        print(f"Module '{missing_module}' installed. Retrying {script_name}...")
+        return True
+    except Exception as e:
+        print(f"Error installing '{missing_module}': {e}")
+        return False
+
+def report_stage_result(result):
+    """Print the captured output and resource summary of a finished stage"""
+    script_name = result['script']
+    if result['output']:
+        print(f"=== OUTPUT OF {script_name} ===")
+        print(result['output'], end='' if result['output'].endswith('\n') else '\n')
+
+    resource_usage = result['resources']
+    cpu, rss = resource_usage['cpu_percent'], resource_usage['rss_mb']
+    print(f"\n--- {script_name} COMPLETED ---")
+    print(f"Duration: {result['duration']:.2f} seconds")
+    if result.get('failure'):
+        print(f"Isolated run failed ({result['failure']}, exit code {result['exit_code']}) after {result['attempts']} attempt(s)")
+    print(f"Resource samples: {resource_usage['samples']} (every {resource_usage['interval']:.2f}s, stage process and children)")
+    print(f"CPU Usage: avg {cpu['avg']:.1f}%, p95 {cpu['p95']:.1f}%, peak {cpu['peak']:.1f}%")
+    print(f"Memory (RSS): avg {rss['avg']:.1f} MB, p95 {rss['p95']:.1f} MB, peak {rss['peak']:.1f} MB")
+
+    if resource_usage['gpu']:
+        gpu_util, gpu_memory = resource_usage['gpu']['utilization'], resource_usage['gpu']['memory_used_mb']
+        print(f"GPU Usage: avg {gpu_util['avg']:.1f}%, peak {gpu_util['peak']:.1f}%")
+        print(f"GPU Memory: avg {gpu_memory['avg']:.0f} MB, peak {gpu_memory['peak']:.0f} MB")
+    else:
+        print("GPU Usage: Not available")
+
+    print("=" * 50)
+    print()
+
+def file_stamps(paths):
+    """(mtime, size) of each of the paths that exists, by path"""
+    stamps = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        stamps[path] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+class RunRecord:
+    """Appends one JSON object per line describing a pipeline run: a 'stage' record per stage, then a 'run' record"""
+    def __init__(self, record_path, run_id):
+        self.record_path = record_path
+        self.run_id = run_id
+
+    def write(self, record):
+        record = {'run_id': self.run_id, 'timestamp': datetime.datetime.now().isoformat(timespec='seconds'), **record}
+        with open(self.record_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def write_stage(self, name, status, result=None, written_paths=()):
+        """Record a finished (or skipped) stage from its run_stage() result and the output files it wrote"""
+        resources = result['resources'] if result else None
+        io_stats = result.get('io', {}) if result else {}
+        self.write({
+            'type': 'stage',
+            'stage': name,
+            'status': status,
+            'wall_seconds': round(result['duration'], 3) if result else 0.0,
+            'cpu_seconds': round(resources['cpu_seconds'], 3) if resources else 0.0,
+            'avg_cpu_percent': round(resources['cpu_percent']['avg'], 1) if resources else 0.0,
+            'peak_rss_mb': round(resources['rss_mb']['peak'], 1) if resources else 0.0,
+            'rows_read': io_stats.get('rows_read', 0),
+            'rows_written': io_stats.get('rows_written', 0),
+            'bytes_read': io_stats.get('bytes_read', 0),
+            # Size of the declared outputs the stage created or changed; files it left alone are not counted
+            'bytes_written': sum(os.path.getsize(path) for path in written_paths if os.path.exists(path)) if result else 0,
+            'registry_hits': io_stats.get('registry_hits', 0),
+            'columnar_cache_hits': io_stats.get('columnar_cache_hits', 0),
+            'manifest_skipped': status == 'skipped',
+            'attempts': result.get('attempts', 1) if result else 0,
+            'failure': result.get('failure') if result else None,
+        })
+
+def execute_pipeline(stages, scripts_dir, jobs=DEFAULT_PIPELINE_JOBS, progress=None,
+                     path_manager=None, manifest=None, run_record=None, isolation=None):
+    """
+    Run the pipeline stages, starting each one as soon as all of its dependencies
+    have succeeded (or were skipped as unchanged). A stage whose dependency failed is not
+    run and ends up 'blocked', as do the stages after it.
+    With jobs > 1 independent stages run concurrently in a process pool.
+    If a manifest is given, stages whose inputs and outputs are unchanged since their
+    last successful run are skipped. If a run_record is given, every stage is written to it.
+    isolation (a dict of run_stage_isolated() keyword arguments) runs every stage in its
+    own subprocess instead of in-process / in pool workers.
+    Returns a dict of stage name -> final status.
+    """
+    order = resolve_pipeline_order(stages)
+    if isolation is None:
+        stage_runner, executor_class = run_stage, ProcessPoolExecutor
+    else:
+        # The work happens in subprocesses, so threads are enough to wait on them
+        stage_runner, executor_class = functools.partial(run_stage_isolated, **isolation), ThreadPoolExecutor
+    script_paths = {name: validate_script_path(os.path.join(scripts_dir, name), scripts_dir) for name in order}
+    shared_module_paths = [os.path.join(scripts_dir, module) for module in SHARED_STAGE_MODULES]
+    statuses = {}
+    # Output file stamps taken before each stage starts, to tell which outputs it wrote
+    outputs_before = {}
+
+    def stage_files(name):
+        inputs = [script_paths[name]] + shared_module_paths + [
+            path for ref in stages[name]['inputs'] for path in path_manager.resolve_stage_files(ref)
+        ]
+        outputs = [path for ref in stages[name]['outputs'] for path in path_manager.resolve_stage_files(ref)]
+        return inputs, outputs
+
+    def try_skip(name):
+        if manifest is None or path_manager is None:
+            return False
+        inputs, outputs = stage_files(name)
+        if not manifest.is_up_to_date(name, inputs, outputs):
+            return False
+        print(f"=== SKIPPING {name} (inputs and outputs unchanged) ===")
+        print()
+        statuses[name] = 'skipped'
+        if run_record is not None:
+            run_record.write_stage(name, 'skipped')
+        if progress is not None:
+            progress.update(1)
+        return True
+
+    def failed_dependencies(name):
+        """Dependencies of a stage that finished without succeeding (failed or blocked)"""
+        return [dep for dep in stages[name]['depends_on'] if statuses.get(dep) not in (None, 'ok', 'skipped')]
+
+    def block(name, dependencies):
+        print(f"=== NOT RUNNING {name} (dependency failed: {', '.join(dependencies)}) ===")
+        print()
+        statuses[name] = 'blocked'
+        if manifest is not None:
+            manifest.forget(name)
+            manifest.save()
+        if run_record is not None:
+            run_record.write_stage(name, 'blocked')
+        if progress is not None:
+            progress.update(1)
+
+    def stamp_outputs(name):
+        if run_record is not None and path_manager is not None:
+            outputs_before[name] = file_stamps(stage_files(name)[1])
+
+    def finish(result):
+        if result['status'] == 'missing_module' and handle_missing_module(result['script'], result['missing_module']):
+            return False
+        report_stage_result(result)
+        name = result['script']
+        statuses[name] = 'ok' if result['status'] == 'ok' else 'failed'
+        if path_manager is not None and any(ref.startswith('dataset:') for ref in stages[name]['outputs']):
+            # New dataset files only become visible to later stages through path_config.json
+            path_manager.export_paths_config()
+        if manifest is not None and path_manager is not None:
+            inputs, outputs = stage_files(name)
+            missing_outputs = [path for path in outputs if not os.path.exists(path)]
+            if statuses[name] == 'ok' and missing_outputs:
+                # A stage that exits cleanly without its outputs must not be skipped next time
+                print(f"Warning: {name} did not write {missing_outputs}; it will run again next time")
+            if statuses[name] == 'ok' and not missing_outputs:
+                manifest.record(name, inputs, outputs)
+            else:
+                manifest.forget(name)
+            manifest.save()
+        if run_record is not None:
+            written_paths = ()
+            if path_manager is not None:
+                before = outputs_before.pop(name, {})
+                written_paths = [path for path, stamp in file_stamps(stage_files(name)[1]).items() if before.get(path) != stamp]
+            run_record.write_stage(name, statuses[name], result, written_paths)
+        if progress is not None:
+            progress.update(1)
+        return True
+
+    if jobs <= 1:
+        for name in order:
+            dependencies = failed_dependencies(name)
+            if dependencies:
+                block(name, dependencies)
+                continue
+            if try_skip(name):
+                continue
+            print(f"=== RUNNING {name} ===")
+            stamp_outputs(name)
+            while not finish(stage_runner(script_paths[name])):
+                pass
+        return statuses
+
+    with executor_class(max_workers=jobs) as pool:
+        running = {}
+        while len(statuses) < len(order):
+            for name in order:
+                if name in statuses or name in running.values():
+                    continue
+                if all(dep in statuses for dep in stages[name]['depends_on']):
+                    dependencies = failed_dependencies(name)
+                    if dependencies:
+                        block(name, dependencies)
+                        continue
+                    if try_skip(name):
+                        continue
+                    print(f"=== RUNNING {name} ===")
+                    stamp_outputs(name)
+                    running[pool.submit(stage_runner, script_paths[name], True)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"ERROR: worker for {name} crashed: {e}")
+                    statuses[name] = 'failed'
+                    if manifest is not None:
+                        manifest.forget(name)
+                        manifest.save()
+                    if run_record is not None:
+                        run_record.write_stage(name, 'failed')
+                    if progress is not None:
+                        progress.update(1)
+                    continue
+                if not finish(result):
+                    print(f"=== RUNNING {name} ===")
+                    running[pool.submit(stage_runner, script_paths[name], True)] = name
+    return statuses
+
+def select_stages(stages, names):
+    """The named stages, with dependencies on stages outside the selection dropped"""
+    return {
+        name: {**stage, 'depends_on': [dep for dep in stage['depends_on'] if dep in names]}
+        for name, stage in stages.items() if name in names
+    }
+
+def stages_affected_by(stages, dataset_keys):
+    """Names of the stages that read any of the datasets, plus every stage downstream of them"""
+    changed_refs = {f"dataset:{key}" for key in dataset_keys}
+    affected = set()
+    grew = True
+    while grew:
+        grew = False
+        for name, stage in stages.items():
+            if name in affected:
+                continue
+            if changed_refs.intersection(stage['inputs']) or affected.intersection(stage['depends_on']):
+                affected.add(name)
+                changed_refs.update(stage['outputs'])
+                grew = True
+    return affected
+
+def dataset_stamps(path_manager):
+    """(mtime, size) of every allowed dataset file that exists, by dataset key"""
+    stamps = {}
+    for key, filename in path_manager.allowed_datasets.items():
+        try:
+            stat = os.stat(os.path.join(path_manager.directories['dataset'], filename))
+        except OSError:
+            continue
+        stamps[key] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+def wait_until_settled(path_manager, stamps):
+    """Wait until the dataset files stop changing (exports are often written in several steps)"""
+    settled_since = time.monotonic()
+    while time.monotonic() - settled_since < WATCH_SETTLE_SECONDS:
+        time.sleep(WATCH_POLL_INTERVAL / 2)
+        current = dataset_stamps(path_manager)
+        if current != stamps:
+            stamps = current
+            settled_since = time.monotonic()
+    return stamps
+
+def start_dataset_observer(dataset_dir, wake):
+    """Set wake on every file system event in dataset_dir (inotify on Linux). None if watchdog is not installed."""
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        return None
     
-    if dataset_key not in config['datasets']:
-        raise ValueError(f"Dataset key '{dataset_key}' not found in configuration")
-        
-    filepath = config['datasets'][dataset_key]
+    class WakeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            wake.set()
     
-    if not os.path.exists(filepath):
-        raise FileNotFoundError(f"Dataset file not found: {filepath}")
+    observer = Observer()
+    observer.schedule(WakeHandler(), dataset_dir, recursive=False)
+    observer.start()
+    return observer
+
+def watch_datasets(project_root):
+    """Rerun the stages that depend on a dataset whenever its file in dataset/ changes"""
+    path_manager = PathManager(project_root)
+    dataset_dir = path_manager.directories['dataset']
+    wake = threading.Event()
+    observer = start_dataset_observer(dataset_dir, wake)
+    if observer is None:
+        print(f"Watching {dataset_dir} by polling every {WATCH_POLL_INTERVAL:.0f}s (install watchdog for change notifications)")
+        rescan_interval = WATCH_POLL_INTERVAL
+    else:
+        print(f"Watching {dataset_dir} for changes")
+        rescan_interval = WATCH_RESCAN_INTERVAL
+    print("Press Ctrl+C to stop.")
     
-    # Check file size (limit to 50MB)
-    file_size = os.path.getsize(filepath)
-    if file_size > 50 * 1024 * 1024:
-        raise ValueError("Dataset file too large (>50MB)")
+    baseline = dataset_stamps(path_manager)
+    try:
+        while True:
+            wake.wait(rescan_interval)
+            wake.clear()
+            current = dataset_stamps(path_manager)
+            if current == baseline:
+                continue
+            current = wait_until_settled(path_manager, current)
+            changed = sorted(key for key in set(baseline) | set(current) if baseline.get(key) != current.get(key))
+            removed = [key for key in changed if key not in current]
+            changed = [key for key in changed if key in current]
+            baseline = current
+            if removed:
+                print(f"Dataset file removed: {', '.join(removed)}")
+            if not changed:
+                continue
+            
+            names = stages_affected_by(PIPELINE_STAGES, changed)
+            if not names:
+                print(f"Changed: {', '.join(changed)}; no stage reads these datasets")
+                continue
+            stages = select_stages(PIPELINE_STAGES, names)
+            print(f"[{datetime.datetime.now():%H:%M:%S}] Changed: {', '.join(changed)}; "
+                  f"rerunning {', '.join(resolve_pipeline_order(stages))}")
+            # Each cycle starts from the files on disk, and frames from past cycles are not kept alive
+            clear_dataset_registry()
+            try:
+                exit_code = main(['--headless'], warm=True, stages=stages)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else EXIT_SETUP_FAILED
+            print(f"[{datetime.datetime.now():%H:%M:%S}] Run finished with exit code {exit_code}. Watching for changes.")
+            # Files the run itself wrote (e.g. the cleaned CSVs) are not new changes
+            baseline = dataset_stamps(path_manager)
+            wake.clear()
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+        return EXIT_OK
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+def run_perf_report(project_root):
+    """Build the performance history report instead of running the pipeline"""
+    path_manager = PathManager(project_root)
+    path_manager.export_paths_config()
+    perfhistory = lazy_import('perfhistory')
+    report_path = perfhistory.generate_performance_report(path_manager.directories['log'])
+    if report_path is None:
+        return EXIT_SETUP_FAILED
+    if not is_headless():
+        import webbrowser
+        webbrowser.open_new_tab('file://' + os.path.abspath(report_path))
+    return EXIT_OK
+
+class SocketOutput:
+    """Output stream of a submitted run: forwards each write to the client as a JSON line"""
+    def __init__(self, connection):
+        self.connection = connection
+        self.connected = True
+        self.lock = threading.Lock()
     
-    # Read with row limit
-    import pandas as pd
-    df = pd.read_csv(filepath, nrows=max_rows)
+    def send(self, message):
+        if not self.connected:
+            return
+        try:
+            with self.lock:
+                self.connection.sendall((json.dumps(message) + '\n').encode('utf-8'))
+        except OSError:
+            # The client went away; the run carries on and is still logged
+            self.connected = False
     
-    # Sanitize data to prevent formula injection
-    for col in df.select_dtypes(include=['object']).columns:
-        df[col] = df[col].astype(str).apply(lambda x: x if not str(x).startswith(('=', '+', '-', '@')) else f"'{x}")
+    def write(self, text):
+        if text:
+            self.send({'output': text})
+        return len(text)
     
-    return df
+    def flush(self):
+        pass
+    
+    def isatty(self):
+        return False
+
+def server_socket_path(project_root):
+    """Path of the pipeline server's Unix socket"""
+    return os.environ.get('PIPELINE_SOCKET') or os.path.join(project_root, SERVER_SOCKET_FILENAME)
+
+def warm_up_server():
+    """Import the stage libraries once so submitted runs find them loaded"""
+    import matplotlib
+    matplotlib.use('Agg')
+    modules = list(SERVER_WARM_MODULES)
+    # Starting the embedded R session is only worth it when the t-tests are cross-checked
+    if os.environ.get('PIPELINE_R_CROSSCHECK', '').lower() not in ('', '0', 'false', 'no'):
+        os.environ["RPY2_CFFI_MODE"] = "ABI"
+        modules.append('rpy2.robjects')
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"✗ Could not preload {name}: {e}")
+            continue
+        print(f"✓ Preloaded {name} ({time.perf_counter() - start:.2f}s)")
+
+def serve_run(connection, request):
+    """Run the pipeline for one submitted job with the client's settings. Returns the exit code."""
+    saved_environ = dict(os.environ)
+    saved_stdout, saved_stderr = sys.stdout, sys.stderr
+    output = SocketOutput(connection)
+    # The run uses the submitting shell's pipeline settings, not the ones the server started with
+    for key in [key for key in os.environ if key.startswith('PIPELINE_') or key == 'CHART_WORKERS']:
+        del os.environ[key]
+    os.environ.update(request.get('env', {}))
+    sys.stdout = sys.stderr = output
+    # Frames loaded by earlier jobs would otherwise stay in the server's memory for good
+    clear_dataset_registry()
+    try:
+        exit_code = main(['--headless'], warm=True)
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else EXIT_SETUP_FAILED
+    except Exception:
+        traceback.print_exc()
+        exit_code = EXIT_SETUP_FAILED
+    finally:
+        sys.stdout, sys.stderr = saved_stdout, saved_stderr
+        os.environ.clear()
+        os.environ.update(saved_environ)
+    output.send({'exit_code': exit_code})
+    return exit_code
 
-def safe_get_output_path(directory_key, filename):
-    """Get safe output path for graphs, logs, etc."""
-    config = load_path_config()
+def serve(project_root):
+    """Keep the stage libraries loaded and run the pipeline for each job submitted over the Unix socket"""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("ERROR: The pipeline server needs Unix domain sockets, which this platform does not support.", file=sys.stderr)
+        return EXIT_SETUP_FAILED
+    socket_path = server_socket_path(project_root)
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+            print(f"ERROR: A pipeline server is already listening on {socket_path}", file=sys.stderr)
+            return EXIT_SETUP_FAILED
+        except OSError:
+            # Left behind by a server that was killed
+            os.remove(socket_path)
+        finally:
+            probe.close()
     
-    if directory_key not in config['directories']:
-        raise ValueError(f"Directory key '{directory_key}' not allowed")
-        
-    # Use the same sanitization logic
-    path_manager = PathManager(config['project_root'])
-    return path_manager.get_output_path(directory_key, filename)
+    warm_up_server()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        server.listen()
+        print(f"Pipeline server listening on {socket_path}")
+        print("Submit runs with: python master.py --submit (stop with --stop-server or Ctrl+C)")
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                try:
+                    request = json.loads(connection.makefile('r', encoding='utf-8').readline())
+                except ValueError:
+                    continue
+                if request.get('command') == 'stop':
+                    SocketOutput(connection).send({'exit_code': EXIT_OK})
+                    print("Pipeline server stopped.")
+                    return EXIT_OK
+                if request.get('command') == 'run':
+                    print(f"[{datetime.datetime.now():%H:%M:%S}] Running submitted pipeline job")
+                    exit_code = serve_run(connection, request)
+                    print(f"[{datetime.datetime.now():%H:%M:%S}] Job finished with exit code {exit_code}")
+    except KeyboardInterrupt:
+        print("Pipeline server stopped.")
+        return EXIT_OK
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+def submit_to_server(project_root, command='run'):
+    """Send a job to the pipeline server and relay its output. Returns the job's exit code."""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("ERROR: The pipeline server needs Unix domain sockets, which this platform does not support.", file=sys.stderr)
+        return EXIT_SETUP_FAILED
+    socket_path = server_socket_path(project_root)
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with client:
+        try:
+            client.connect(socket_path)
+        except OSError as e:
+            print(f"ERROR: No pipeline server on {socket_path} ({e}). Start one with: python master.py --serve", file=sys.stderr)
+            return EXIT_SETUP_FAILED
+        env = {key: value for key, value in os.environ.items() if key.startswith('PIPELINE_') or key == 'CHART_WORKERS'}
+        client.sendall((json.dumps({'command': command, 'env': env}) + '\n').encode('utf-8'))
+        for line in client.makefile('r', encoding='utf-8'):
+            message = json.loads(line)
+            if 'output' in message:
+                sys.stdout.write(message['output'])
+            else:
+                sys.stdout.flush()
+                return message.get('exit_code', EXIT_SETUP_FAILED)
+    print("ERROR: The pipeline server closed the connection before the run finished.", file=sys.stderr)
+    return EXIT_SETUP_FAILED
 
-def main():
+def parse_args(argv=None):
+    """Command-line options. Each one has an environment variable equivalent."""
+    parser = argparse.ArgumentParser(description="Run the Instagram analytics pipeline.")
+    parser.add_argument('--headless', action='store_true',
+                        help="run unattended: no dialogs or browser windows, prompts answered by policy (PIPELINE_HEADLESS=1)")
+    parser.add_argument('--answer', action='append', default=[], metavar='PROMPT=yes|no',
+                        help=f"answer a prompt in headless mode; prompts: {', '.join(HEADLESS_ANSWERS)} (PIPELINE_ANSWERS)")
+    parser.add_argument('--jobs', type=int, help="number of stages to run in parallel (PIPELINE_JOBS)")
+    parser.add_argument('--force-rebuild', action='store_true',
+                        help="rerun every stage, ignoring the build manifest (PIPELINE_FORCE_REBUILD=1)")
+    parser.add_argument('--isolate', action='store_true',
+                        help="run each stage in its own subprocess with a timeout, memory limit and retries (PIPELINE_ISOLATE=1)")
+    parser.add_argument('--stage-timeout', type=float,
+                        help=f"seconds before an isolated stage is killed (PIPELINE_STAGE_TIMEOUT, default {DEFAULT_STAGE_TIMEOUT})")
+    parser.add_argument('--stage-memory-mb', type=int,
+                        help="RSS limit in MB for an isolated stage and its children, 0 for none (PIPELINE_STAGE_MEMORY_MB)")
+    parser.add_argument('--stage-retries', type=int,
+                        help=f"extra attempts for a failed isolated stage (PIPELINE_STAGE_RETRIES, default {DEFAULT_STAGE_RETRIES})")
+    # Internal: used by isolated mode to run a single stage in a child process
+    parser.add_argument('--run-stage', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    parser.add_argument('--perf-report', action='store_true',
+                        help="don't run the pipeline; build the performance history report from log/run_*.jsonl")
+    parser.add_argument('--serve', action='store_true',
+                        help="start a server that keeps the stage libraries loaded and runs submitted jobs (socket: PIPELINE_SOCKET)")
+    parser.add_argument('--submit', action='store_true',
+                        help="run the pipeline in the running server instead of this process; the other options apply to the job")
+    parser.add_argument('--stop-server', action='store_true', help="stop the running pipeline server")
+    parser.add_argument('--watch', action='store_true',
+                        help="watch dataset/ and rerun the stages that depend on each changed dataset (runs headless)")
+    args = parser.parse_args(argv)
+
+    answers = ','.join(filter(None, [os.environ.get('PIPELINE_ANSWERS', '')] + args.answer))
+    try:
+        parse_answers(answers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Options are passed on as environment variables so stage processes see them too
+    if args.headless:
+        os.environ['PIPELINE_HEADLESS'] = '1'
+    if answers:
+        os.environ['PIPELINE_ANSWERS'] = answers
+    if args.jobs is not None:
+        os.environ['PIPELINE_JOBS'] = str(args.jobs)
+    if args.force_rebuild:
+        os.environ['PIPELINE_FORCE_REBUILD'] = '1'
+    if args.isolate:
+        os.environ['PIPELINE_ISOLATE'] = '1'
+    for option, variable in [('stage_timeout', 'PIPELINE_STAGE_TIMEOUT'), ('stage_memory_mb', 'PIPELINE_STAGE_MEMORY_MB'),
+                             ('stage_retries', 'PIPELINE_STAGE_RETRIES')]:
+        if getattr(args, option) is not None:
+            os.environ[variable] = str(getattr(args, option))
+    return args
+
+def isolation_settings():
+    """run_stage_isolated() keyword arguments from the environment, or None when isolation is off"""
+    if os.environ.get('PIPELINE_ISOLATE', '').lower() in ('', '0', 'false', 'no'):
+        return None
+    settings = {}
+    for key, variable, default, convert in [('timeout', 'PIPELINE_STAGE_TIMEOUT', DEFAULT_STAGE_TIMEOUT, float),
+                                            ('memory_mb', 'PIPELINE_STAGE_MEMORY_MB', DEFAULT_STAGE_MEMORY_MB, int),
+                                            ('retries', 'PIPELINE_STAGE_RETRIES', DEFAULT_STAGE_RETRIES, int)]:
+        try:
+            settings[key] = convert(os.environ.get(variable, default))
+        except ValueError:
+            settings[key] = default
+    return settings
+
+def main(argv=None, warm=False, stages=None):
+    """Run the pipeline (all of PIPELINE_STAGES unless stages is given). Returns the process exit code.
+    warm is set for runs started by the pipeline server or the dataset watcher."""
+    if stages is None:
+        stages = PIPELINE_STAGES
     master_start = datetime.datetime.now()
+    startup_begin = time.perf_counter() if warm else STARTUP_BEGIN
+    startup_timings = {'Master imports': 0.0 if warm else time.perf_counter() - STARTUP_BEGIN}
+    args = parse_args(argv)
     current_dir = os.path.dirname(os.path.abspath(__file__))
     scripts_dir = os.path.join(current_dir, 'scripts')
     
+    if args.run_stage:
+        return run_stage_child(args.run_stage, args.result_file)
+    if args.perf_report:
+        return run_perf_report(current_dir)
+    if args.serve:
+        return serve(current_dir)
+    if args.submit or args.stop_server:
+        return submit_to_server(current_dir, 'stop' if args.stop_server else 'run')
+    if args.watch:
+        return watch_datasets(current_dir)
+    
     # Add scripts directory to Python path so other scripts can import path_utils
-    sys.path.insert(0, scripts_dir)
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
     
     # Ask for consent FIRST before any system information collection
-    root = tk.Tk()
-    root.withdraw()
-    consent_input = messagebox.askyesno(
+    debug_consent = ask_yes_no(
+        'debug_consent',
         "Debug Consent",
         "This script collects non-identifiable debugging information (OS, CPU, GPU, RAM, Python Version) for logging purposes.\nDo you consent?"
     )
-    root.destroy()
-    debug_consent = consent_input
     
     # Initialize path manager
     try:
@@ -592,41 +1570,28 @@ def main():
         
     except Exception as e:
         show_error(f"Project setup failed: {e}")
-        sys.exit(1)
+        sys.exit(EXIT_SETUP_FAILED)
     
-    check_dependencies()
+    dependency_check_start = time.perf_counter()
+    check_dependencies(os.path.join(current_dir, DEPENDENCY_CACHE_FILENAME))
+    startup_timings['Dependency check'] = time.perf_counter() - dependency_check_start
     
-    # GUI root for any further prompts:
-    root = tk.Tk(); root.withdraw()
-
     check_quarto_processes()
     
-    ipy_files = [
-        os.path.join(scripts_dir, 'clean.py'),
-        os.path.join(scripts_dir, 'averageengagement.py'),
-        os.path.join(scripts_dir, 'mediareach.py'),
-        os.path.join(scripts_dir, 'feedvsreel.py'),
-        os.path.join(scripts_dir, 'age.py'),
-        os.path.join(scripts_dir, 'reportgeneration.py'),
-        os.path.join(scripts_dir, 'dashboardgeneration.py'),
-        # Add more scripts in the desired order if needed.
-    ]
-    
-    total_steps = 3 + len(ipy_files) + 1
-    progress = tqdm(total=total_steps, desc="Master Script Progress", unit="step")
+    total_steps = 3 + len(stages) + 1
+    tqdm = lazy_import('tqdm').tqdm
+    progress = tqdm(total=total_steps, desc="Master Script Progress", unit="step", disable=is_headless())
     
     log_dir = os.path.join(current_dir, 'log')
     os.makedirs(log_dir, exist_ok=True)
   
     log_files = safe_log_cleanup(log_dir)
     if len(log_files) >= 10:
-        root = tk.Tk()
-        root.withdraw()
-        consent_cleanup = messagebox.askyesno(
+        consent_cleanup = ask_yes_no(
+            'log_cleanup',
             "Log Cleanup",
             f"There are {len(log_files)} log files in {log_dir}.\nWould you like to delete the oldest log file ({log_files[0]})?"
         )
-        root.destroy()
         if consent_cleanup:
             oldest_log = os.path.join(log_dir, log_files[0])
             try:
@@ -646,18 +1611,17 @@ def main():
     
     timestamp = datetime.datetime.now().strftime("%d%m%Y_%H%M%S")
     log_file_path = os.path.join(log_dir, f"log_{timestamp}.txt")
+    run_record = RunRecord(os.path.join(log_dir, f"{RUN_RECORD_PREFIX}{timestamp}.jsonl"), timestamp)
     progress.update(1)
     
-    # Initialize resource monitor
-    resource_monitor = ResourceMonitor()
-    
     with open(log_file_path, 'w', encoding='utf-8') as log_file:
         # Set up tee output to capture everything to both console and log
         original_stdout = sys.stdout
         original_stderr = sys.stderr
         
-        tee_stdout = TeeOutput(log_file, original_stdout)
-        tee_stderr = TeeOutput(log_file, original_stderr)
+        log_writer = AsyncLogWriter(log_file)
+        tee_stdout = TeeOutput(log_writer, original_stdout)
+        tee_stderr = TeeOutput(log_writer, original_stderr)
         
         sys.stdout = tee_stdout
         sys.stderr = tee_stderr
@@ -681,90 +1645,70 @@ def main():
                 print("=" * 50)
                 print()
             
-            for ipy_file in ipy_files:
-                script_name = os.path.basename(ipy_file)
-                print(f"=== RUNNING {script_name} ===")
-                start_time = datetime.datetime.now()
-                
-                # Start resource monitoring
-                resource_monitor.start_monitoring()
-                
-                while True:
-                    try:
-                        validated_path = validate_script_path(ipy_file, scripts_dir)
-                        runpy.run_path(validated_path, run_name="__main__")
-                        break  
-                    except ModuleNotFoundError as e:
-                        missing_module = e.name if hasattr(e, "name") else str(e).split("'")[1]
-                        
-                        # Skip path_utils since it's a local module
-                        if missing_module == 'path_utils':
-                            print(f"ERROR: {script_name} cannot find path_utils.py")
-                            print("Please ensure path_utils.py exists in the scripts directory")
-                            break
-                            
-                        root = tk.Tk()
-                        root.withdraw()
-                        answer = messagebox.askyesno(
-                            "Missing Module",
-                            f"Module '{missing_module}' is missing when running {script_name}.\nWould you like to install it?"
-                        )
-                        root.destroy()
-                        if answer:
-                            try:
-                                print(f"Installing module '{missing_module}'...")
-                                safe_install_module(missing_module)
-                                print(f"Module '{missing_module}' installed. Retrying {script_name}...")
-                            except Exception as e2:
-                                print(f"Error installing '{missing_module}': {e2}")
-                                break  
-                        else:
-                            print("Skipping installation and continuing.")
-                            break
-                    except Exception as e:
-                        print(f"ERROR in {script_name}: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        break
-                
-                # Stop resource monitoring and get averages
-                resource_monitor.stop_monitoring()
-                resource_usage = resource_monitor.get_averages()
-                
-                end_time = datetime.datetime.now()
-                duration = (end_time - start_time).total_seconds()
-                
-                print(f"\n--- {script_name} COMPLETED ---")
-                print(f"Duration: {duration:.2f} seconds")
-                print(f"Average CPU Usage: {resource_usage['cpu_percent']:.1f}%")
-                print(f"Average RAM Usage: {resource_usage['ram_percent']:.1f}% ({resource_usage['ram_used_gb']:.2f} GB)")
-                
-                if resource_usage['gpu']:
-                    gpu_info = resource_usage['gpu']
-                    print(f"Average GPU Usage: {gpu_info['utilization_avg']:.1f}%")
-                    print(f"Average GPU Memory: {gpu_info['memory_percent_avg']:.1f}% ({gpu_info['memory_used_avg']:.0f} MB)")
-                else:
-                    print("GPU Usage: Not available")
-                    
-                print("=" * 50)
+            try:
+                jobs = int(os.environ.get('PIPELINE_JOBS', DEFAULT_PIPELINE_JOBS))
+            except ValueError:
+                jobs = DEFAULT_PIPELINE_JOBS
+            print(f"Running {len(stages)} stages with up to {jobs} parallel job(s)")
+            print()
+            
+            # Share the CPUs between stages so their chart worker pools don't oversubscribe them
+            os.environ.setdefault('CHART_WORKERS', str(max(1, (os.cpu_count() or 1) // max(1, jobs))))
+            
+            isolation = isolation_settings()
+            if isolation is not None:
+                memory_limit = f"{isolation['memory_mb']} MB" if isolation['memory_mb'] else "none"
+                print(f"Isolated mode: timeout {isolation['timeout']:.0f}s, "
+                      f"memory limit {memory_limit}, {isolation['retries']} retries per stage")
                 print()
-                progress.update(1)
+            
+            # Skip stages whose inputs are unchanged unless a full rebuild is requested
+            manifest = None
+            if os.environ.get('PIPELINE_FORCE_REBUILD', '').lower() in ('', '0', 'false', 'no'):
+                manifest = BuildManifest(os.path.join(current_dir, MANIFEST_FILENAME))
+            else:
+                print("Full rebuild requested: ignoring the build manifest.")
+            
+            # Includes time spent waiting on the prompts above
+            startup_timings['Time to first stage'] = time.perf_counter() - startup_begin
+            report_startup(startup_timings)
+            statuses = execute_pipeline(stages, scripts_dir, jobs=jobs, progress=progress,
+                                        path_manager=path_manager, manifest=manifest, run_record=run_record,
+                                        isolation=isolation)
+            failed_stages = [name for name, status in statuses.items() if status == 'failed']
+            blocked_stages = [name for name, status in statuses.items() if status == 'blocked']
             
             master_end = datetime.datetime.now()
             master_duration = (master_end - master_start).total_seconds()
             print(f"=== MASTER SCRIPT COMPLETED ===")
             print(f"Total execution time: {master_duration:.2f} seconds")
             print(f"Log ended: {master_end}")
+            run_record.write({
+                'type': 'run',
+                'status': 'failed' if failed_stages else 'ok',
+                'wall_seconds': round(master_duration, 3),
+                'jobs': jobs,
+                'startup_seconds': {phase: round(seconds, 3) for phase, seconds in startup_timings.items()},
+                'stages': statuses,
+            })
+            print(f"Run record saved to: {run_record.record_path}")
             
         finally:
-            # Restore original stdout/stderr
+            # Restore original stdout/stderr, then write out whatever the log writer still holds
             sys.stdout = original_stdout
             sys.stderr = original_stderr
+            log_writer.close()
             
     progress.update(1)
     progress.close()
     
     print(f"All scripts executed. Full log saved to: {log_file_path}")
+    if blocked_stages:
+        print(f"Not run because a dependency failed: {', '.join(blocked_stages)}")
+    if failed_stages:
+        print(f"Failed stages: {', '.join(failed_stages)}")
+        return EXIT_STAGE_FAILED
+    return EXIT_OK
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -1,7 +1,6 @@
 import sys
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
 
 # Add scripts directory to path
@@ -10,61 +9,67 @@ if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
 # Now import path_utils
-from path_utils import safe_read_csv, get_output_path, DATASET_KEYS, DIRECTORY_KEYS
+from path_utils import load_dataset_chunks, aggregate_chunks, DATASET_KEYS
+from chart_renderer import render_charts
 
-# Read the CSV file using safe path management
-df = safe_read_csv(DATASET_KEYS['INSTAGRAM_AGE_GENDER'])
+def to_numeric_followers(chunk):
+    """Convert the Profile followers column to numeric values"""
+    return chunk.assign(**{'Profile followers': pd.to_numeric(chunk['Profile followers'], errors='coerce')})
 
-# Convert the Profile followers column to numeric values
-df['Profile followers'] = pd.to_numeric(df['Profile followers'], errors='coerce')
+# Read the CSV file using safe path management (streamed in chunks if it is large).
+# Rows with a missing gender or age are kept so they still count towards the total.
+totals = aggregate_chunks(
+    load_dataset_chunks(DATASET_KEYS['INSTAGRAM_AGE_GENDER']),
+    groupings={'by_gender_age': ['Gender', 'Age']},
+    values=['Profile followers'],
+    prepare=to_numeric_followers,
+    dropna=False,
+)
+followers = totals['by_gender_age']['Profile followers_sum']
+
+def followers_by_age(gender):
+    """Followers of one gender summed per (known) age group"""
+    if gender not in followers.index.get_level_values('Gender'):
+        return followers.iloc[:0].droplevel('Gender')
+    by_age = followers.xs(gender, level='Gender')
+    return by_age[by_age.index.notna()]
 
 # Calculate total followers
-total_followers = df['Profile followers'].sum()
+total_followers = followers.sum()
 print(f"Total number of followers: {total_followers}")
 
 # Calculate followers per gender and output their contribution
 genders = ['female', 'male', 'undefined']
+followers_per_gender = followers.groupby(level='Gender').sum()
 for gender in genders:
-    gender_followers = df[df['Gender'] == gender]['Profile followers'].sum()
+    gender_followers = followers_per_gender.get(gender, 0)
     percentage = (gender_followers / total_followers) * 100 if total_followers > 0 else 0
     print(f"{gender.capitalize()} contributes {gender_followers} followers ({percentage:.1f}%).")
 
-def make_autopct(values):
-    def my_autopct(pct):
-        if pct < 5:
-            return ""
-        return '{:.1f}%'.format(pct)
-    return my_autopct
-
+chart_specs = []
 for gender in genders:
-    # Filter rows for the current gender and group by age, summing the followers
-    df_gender = df[df['Gender'] == gender]
-    age_distribution = df_gender.groupby('Age')['Profile followers'].sum()
-    
-    # Generate a muted color palette using Seaborn
-    colors = sns.color_palette("muted", len(age_distribution))
-    
-    # Create the pie chart figure
-    fig, ax = plt.subplots(figsize=(6, 6))
-    wedges, texts, autotexts = ax.pie(
-        age_distribution,
-        autopct=make_autopct(age_distribution),
-        startangle=90,
-        colors=colors
-    )
-    
-    # Set the title
-    ax.set_title(f"Age Distribution for {gender.capitalize()}")
-    
-    # Add a legend on the side for better readability
-    ax.legend(wedges, age_distribution.index, title="Age Groups", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-    
-    # Save the figure using safe path management
-    filename = f"graph4_{gender}.png"
-    output_path = get_output_path(DIRECTORY_KEYS['GRAPHS'], filename)
-    plt.savefig(output_path, bbox_inches="tight")
-    print(f"✓ Saved chart: {output_path}")
-    plt.close(fig)
+    # Followers of the current gender, summed per age group
+    age_distribution = followers_by_age(gender)
+
+    chart_specs.append({
+        'filename': f"graph4_{gender}.png",
+        'kind': 'pie',
+        'figsize': (6, 6),
+        'values': age_distribution.to_numpy(),
+        'labels': list(age_distribution.index),
+        # Generate a muted color palette using Seaborn
+        'colors': sns.color_palette("muted", len(age_distribution)),
+        # Hide labels of slices under 5%
+        'autopct_min_pct': 5,
+        'startangle': 90,
+        'title': f"Age Distribution for {gender.capitalize()}",
+        # Add a legend on the side for better readability
+        'legend': {'title': "Age Groups", 'loc': "center left", 'bbox_to_anchor': (1, 0, 0.5, 1)},
+        'savefig': {'bbox_inches': "tight"},
+    })
+
+# Render the pie charts using safe path management
+render_charts(chart_specs)
 
 print("✓ Age analysis completed successfully")
 
@@ -1,13 +1,7 @@
 import sys
 import os
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import rpy2.robjects as ro
-from rpy2.robjects import pandas2ri
-from rpy2.robjects.conversion import localconverter
-from rpy2.robjects.vectors import FloatVector
-from rpy2.robjects.packages import importr
-import re
 
 # Add scripts directory to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,107 +9,91 @@ if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
 # Now import path_utils
-from path_utils import safe_read_csv, get_output_path, DATASET_KEYS, DIRECTORY_KEYS
-
-os.environ["RPY2_CFFI_MODE"] = "ABI"
-required_packages = ["ggplot2", "dplyr", "stats"]
-
-def validate_r_package_name(pkg):
-    """Validate R package names"""
-    import re
-    if not re.match(r'^[a-zA-Z][a-zA-Z0-9.]*$', pkg):
-        raise ValueError(f"Invalid R package name: {pkg}")
-    return pkg
-
-# Validate packages before use
-validated_packages = [validate_r_package_name(pkg) for pkg in required_packages]
-
-ro.r(f'''
-packages <- c({", ".join([f'"{pkg}"' for pkg in validated_packages])})
-installed <- rownames(installed.packages())
-for (pkg in packages) {{
-  if (!pkg %in% installed) {{
-    install.packages(pkg, repos="https://cloud.r-project.org")
-  }}
-}}
-''')
-
-r_libs = {pkg: importr(pkg) for pkg in validated_packages}
-
-# Read the CSV file using safe path management
-df = safe_read_csv(DATASET_KEYS['INSTAGRAM_POST_ENGAGEMENT'])
-
-df = df[df['Media product type'].isin(['FEED', 'REELS'])]
-
-df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-df.dropna(subset=['Date'], inplace=True)
-
-if 'post_engagement' not in df.columns:
-    df['post_engagement'] = df['Like count'] + df['Comments count'] + df['Shares'] + df['Unique saves']
-
-df['Week'] = df['Date'].dt.to_period('W').apply(lambda r: r.start_time)
-
-weekly = df.groupby('Week')['post_engagement'].mean().reset_index()
+from path_utils import load_dataset_chunks, aggregate_chunks, DATASET_KEYS
+from chart_renderer import render_charts
+from stats_utils import consecutive_welch_t_tests, r_t_test
+
+# Set PIPELINE_R_CROSSCHECK=1 to re-run every t-test in R (needs rpy2 and R) and compare
+r_crosscheck = os.environ.get('PIPELINE_R_CROSSCHECK', '').lower() not in ('', '0', 'false', 'no')
+if r_crosscheck:
+    os.environ["RPY2_CFFI_MODE"] = "ABI"
+
+def weekly_engagement(chunk):
+    """Keep feed and reel posts, add their engagement and the start of their week"""
+    chunk = chunk[chunk['Media product type'].isin(['FEED', 'REELS'])]
+    chunk = chunk.dropna(subset=['Date'])
+    if 'post_engagement' not in chunk.columns:
+        chunk = chunk.assign(post_engagement=chunk['Like count'] + chunk['Comments count'] + chunk['Shares'] + chunk['Unique saves'])
+    return chunk.assign(Week=chunk['Date'].dt.to_period('W').dt.start_time)
+
+# Read the CSV file using safe path management (streamed in chunks if it is large)
+totals = aggregate_chunks(
+    load_dataset_chunks(DATASET_KEYS['INSTAGRAM_POST_ENGAGEMENT']),
+    groupings={'Week': 'Week'},
+    values=['post_engagement'],
+    prepare=weekly_engagement,
+)['Week']
+
+weekly = (totals['post_engagement_sum'] / totals['post_engagement_count']).rename('post_engagement')
+weekly = weekly.rename_axis('Week').reset_index()
 
 weekly['Month'] = weekly['Week'].dt.to_period('M')
 
-unique_months = sorted(weekly['Month'].unique())
-
-results = []
-for i in range(1, len(unique_months)):
-    prev_month = unique_months[i - 1]
-    curr_month = unique_months[i]
-    
-    prev_weekly_samples = weekly[weekly['Month'] == prev_month]['post_engagement']
-    curr_weekly_samples = weekly[weekly['Month'] == curr_month]['post_engagement']
-    
-    change = curr_weekly_samples.mean() - prev_weekly_samples.mean()
-    
-    if len(prev_weekly_samples) < 2 or len(curr_weekly_samples) < 2:
-        t_stat = None
-        p_value = None
-        significant = False
-        print(f"Skipping t.test for month {curr_month} due to insufficient weekly observations.")
+# Welch t-test of each month's weekly averages against the previous month (R's t.test defaults)
+tests = consecutive_welch_t_tests(weekly['post_engagement'], weekly['Month'])
+
+for month, test in tests[tests['p_value'].isna()].iterrows():
+    if min(test['n_previous'], test['n_current']) < 2:
+        print(f"Skipping t.test for month {month}: it needs at least 2 weekly observations per month "
+              f"(previous month: {int(test['n_previous'])}, this month: {int(test['n_current'])}).")
     else:
-        with localconverter(ro.default_converter + pandas2ri.converter):
-            r_prev = FloatVector(list(prev_weekly_samples))
-            r_curr = FloatVector(list(curr_weekly_samples))
-        t_test_result = ro.r['t.test'](r_curr, r_prev)
-        p_value = t_test_result.rx2('p.value')[0]
-        t_stat = t_test_result.rx2('statistic')[0]
-        significant = p_value < 0.05
-        
-    results.append({
-        'Month': str(curr_month),
-        'Change': change,
-        't_stat': t_stat,
-        'p_value': p_value,
-        'Significant': significant
-    })
+        # R's t.test stops with "data are essentially constant"
+        print(f"Skipping t.test for month {month}: the weekly averages do not vary in either month.")
+
+if r_crosscheck:
+    for month, test in tests.dropna(subset=['p_value']).iterrows():
+        previous_month = weekly['Month'][weekly['Month'] < month].max()
+        r_t_stat, _, r_p_value = r_t_test(
+            weekly.loc[weekly['Month'] == month, 'post_engagement'],
+            weekly.loc[weekly['Month'] == previous_month, 'post_engagement'],
+        )
+        if not (np.isclose(test['t_stat'], r_t_stat) and np.isclose(test['p_value'], r_p_value)):
+            print(f"WARNING: t.test for month {month} differs from R (t={r_t_stat:.4f}, p={r_p_value:.4f})")
+    print("✓ Cross-checked t-tests against R")
+
+results = [
+    {
+        'Month': str(month),
+        'Change': test['change'],
+        't_stat': None if pd.isna(test['t_stat']) else test['t_stat'],
+        'p_value': None if pd.isna(test['p_value']) else test['p_value'],
+        'Significant': bool(test['p_value'] < 0.05),
+    }
+    for month, test in tests.iterrows()
+]
 
 results_df = pd.DataFrame(results)
 print(results_df)
 
-plt.figure(figsize=(10,6))
-plt.plot(weekly['Week'], weekly['post_engagement'], marker='o', label='Weekly Average Engagement', color='blue')
+series = [{'x': weekly['Week'], 'y': weekly['post_engagement'], 'marker': 'o', 'label': 'Weekly Average Engagement', 'color': 'blue'}]
 
 highlight_month = pd.Period('2024-11', freq='M')
 highlight = weekly[weekly['Month'] == highlight_month]
 if not highlight.empty:
-    plt.plot(highlight['Week'], highlight['post_engagement'], marker='o', color='red',
-             linewidth=3, label='Significant Drop (2024-11)')
-
-plt.title('Changes in the Average Engagement on Instagram')
-plt.ylabel('Average Post Engagement')
-plt.xticks(rotation=45)
-plt.legend()
-plt.tight_layout()
+    series.append({'x': highlight['Week'], 'y': highlight['post_engagement'], 'marker': 'o', 'color': 'red',
+                   'linewidth': 3, 'label': 'Significant Drop (2024-11)'})
 
 # Save the figure using safe path management
-output_path = get_output_path(DIRECTORY_KEYS['GRAPHS'], "graph1.png")
-plt.savefig(output_path)
-print(f"✓ Saved chart: {output_path}")
-plt.close()
+render_charts([{
+    'filename': "graph1.png",
+    'kind': 'line',
+    'series': series,
+    'title': 'Changes in the Average Engagement on Instagram',
+    'ylabel': 'Average Post Engagement',
+    'xticks_rotation': 45,
+    'legend': True,
+    'tight_layout': True,
+}])
 
 print("✓ Average engagement analysis completed successfully")
 
@@ -0,0 +1,159 @@
+"""
+Chart rendering service for the analysis scripts.
+Scripts describe each chart as a plain dict (a plot spec) and render_charts() draws them
+with the non-interactive Agg backend, in a pool of worker processes when there are several.
+
+A plot spec contains:
+    'filename'  - PNG name inside the graphs directory
+    'kind'      - 'line', 'pie' or 'bar'
+    'series'    - for 'line': list of dicts with 'x', 'y' and optional 'label', 'color',
+                  'marker', 'linestyle', 'linewidth'
+    'values', 'labels', 'colors', 'autopct_min_pct', 'startangle'
+                - for 'pie' (labels are shown in the legend)
+    'frame', 'stacked'
+                - for 'bar': a DataFrame plotted with DataFrame.plot(kind='bar')
+and optionally 'figsize', 'title', 'xlabel', 'ylabel', 'grid', 'legend' (True or a dict of
+ax.legend keyword arguments), 'xticks_rotation', 'tight_layout' and 'savefig' (keyword
+arguments for savefig).
+"""
+
+import os
+import sys
+import pickle
+import tempfile
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the scripts directory to Python path so imports work from project root
+scripts_dir = os.path.dirname(os.path.abspath(__file__))
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+from path_utils import get_output_path, DIRECTORY_KEYS
+
+def render_chart(spec):
+    """Draw a single plot spec and save it to the graphs directory. Returns the output path."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=spec.get('figsize', (10, 6)))
+    try:
+        legend_handles = _DRAWERS[spec['kind']](ax, spec)
+
+        if 'title' in spec:
+            ax.set_title(spec['title'])
+        if 'xlabel' in spec:
+            ax.set_xlabel(spec['xlabel'])
+        if 'ylabel' in spec:
+            ax.set_ylabel(spec['ylabel'])
+        if 'grid' in spec:
+            ax.grid(spec['grid'])
+        if 'xticks_rotation' in spec:
+            ax.tick_params(axis='x', labelrotation=spec['xticks_rotation'])
+
+        legend = spec.get('legend')
+        if legend:
+            legend_kwargs = legend if isinstance(legend, dict) else {}
+            if legend_handles is not None:
+                ax.legend(legend_handles, spec['labels'], **legend_kwargs)
+            else:
+                ax.legend(**legend_kwargs)
+        if spec.get('tight_layout'):
+            fig.tight_layout()
+
+        output_path = get_output_path(DIRECTORY_KEYS['GRAPHS'], spec['filename'])
+        fig.savefig(output_path, **spec.get('savefig', {}))
+    finally:
+        plt.close(fig)
+    return output_path
+
+def _draw_line(ax, spec):
+    for series in spec['series']:
+        options = {key: series[key] for key in ('label', 'color', 'marker', 'linestyle', 'linewidth') if key in series}
+        ax.plot(series['x'], series['y'], **options)
+    return None
+
+def _draw_pie(ax, spec):
+    min_pct = spec.get('autopct_min_pct', 0)
+
+    def autopct(pct):
+        # Hide labels of slices too small to read
+        return '' if pct < min_pct else '{:.1f}%'.format(pct)
+
+    wedges, _, _ = ax.pie(
+        spec['values'],
+        autopct=autopct,
+        startangle=spec.get('startangle', 0),
+        colors=spec.get('colors'),
+    )
+    return wedges
+
+def _draw_bar(ax, spec):
+    spec['frame'].plot(kind='bar', stacked=spec.get('stacked', False), ax=ax)
+    return None
+
+_DRAWERS = {
+    'line': _draw_line,
+    'pie': _draw_pie,
+    'bar': _draw_bar,
+}
+
+def chart_workers(chart_count):
+    """Number of worker processes to use (CHART_WORKERS overrides the CPU count)"""
+    try:
+        workers = int(os.environ.get('CHART_WORKERS', os.cpu_count() or 1))
+    except ValueError:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, chart_count))
+
+def render_charts(specs, max_workers=None):
+    """Render plot specs, in parallel worker processes when there is more than one. Returns the paths."""
+    specs = list(specs)
+    workers = max_workers or chart_workers(len(specs))
+
+    if workers <= 1:
+        output_paths = [render_chart(spec) for spec in specs]
+    elif multiprocessing.get_start_method() == 'fork':
+        # Forked workers never import __main__, so the pool can be started from the calling script
+        output_paths = _render_in_pool(specs, workers)
+    else:
+        output_paths = _render_in_helper_process(specs, workers)
+
+    for output_path in output_paths:
+        print(f"✓ Saved chart: {output_path}")
+    return output_paths
+
+def _render_in_pool(specs, workers, start_method=None):
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method)) as pool:
+        return list(pool.map(render_chart, specs))
+
+def _render_in_helper_process(specs, workers):
+    """Render in a pool started by a new interpreter running this module as __main__.
+
+    Spawn and forkserver workers import the main module of the process that starts them.
+    The analysis scripts run as __main__ without a main guard, so workers started from
+    them would run the whole script again. This module's entry point is guarded.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        specs_path = os.path.join(work_dir, 'specs.pickle')
+        paths_path = os.path.join(work_dir, 'paths.pickle')
+        with open(specs_path, 'wb') as f:
+            pickle.dump(specs, f)
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), multiprocessing.get_start_method(), str(workers), specs_path, paths_path],
+            check=True,
+        )
+        with open(paths_path, 'rb') as f:
+            return pickle.load(f)
+
+def _helper_main(start_method, workers, specs_path, paths_path):
+    with open(specs_path, 'rb') as f:
+        specs = pickle.load(f)
+    output_paths = _render_in_pool(specs, int(workers), start_method)
+    with open(paths_path, 'wb') as f:
+        pickle.dump(output_paths, f)
+
+if __name__ == "__main__":
+    _helper_main(*sys.argv[1:])
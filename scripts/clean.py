@@ -1,5 +1,7 @@
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 
 # Add scripts directory to path
@@ -8,41 +10,124 @@ if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
 # Now import path_utils - ADD get_dataset_path to the import
-from path_utils import safe_read_csv, get_output_path, get_dataset_path, DATASET_KEYS, DIRECTORY_KEYS
-
-def load_excel_sheets(file_path):
-    """Reads an Excel file and returns a dictionary of DataFrames keyed by sheet name."""
-    xl = pd.ExcelFile(file_path)
-    sheets_dict = {sheet: xl.parse(sheet) for sheet in xl.sheet_names}
-    return sheets_dict
+from path_utils import safe_read_csv, get_output_path, get_dataset_path, write_columnar_cache, sanitize_formula_injection, count_io, log, log_enabled, DATASET_KEYS, DIRECTORY_KEYS
+
+# Sheets exported by the pipeline. Anything else in the workbook (e.g. SupermetricsQueries) is never parsed.
+SHEET_ALLOWLIST = [
+    'Instagram Age Gender Demographi',
+    'Instagram Post Engagement',
+    'Instagram Profile Overview',
+    'Instagram Top Cities Regions',
+]
+
+# Columns not needed downstream. They are dropped after deduplication, so rows that differ
+# only in one of these columns are still told apart.
+DROPPED_COLUMNS = {
+    'Instagram Top Cities Regions': ['City'],
+    'Instagram Post Engagement': ['Media ID'],
+}
+
+# Number of non-identical duplicate groups listed per sheet
+MAX_SUMMARY_ROWS = 10
+
+def excel_engine():
+    """Use the much faster calamine reader when python-calamine is installed, else pandas' default"""
+    try:
+        import python_calamine  # noqa: F401
+        return 'calamine'
+    except ImportError:
+        return None
+
+def load_excel_sheets(file_path, sheets=None, max_workers=None):
+    """Reads an Excel file and returns a dictionary of DataFrames keyed by sheet name.
+
+    Only the sheets in `sheets` are parsed (all of them if None). With the calamine
+    engine the sheets are parsed in parallel.
+    """
+    engine = excel_engine()
+    try:
+        xl = pd.ExcelFile(file_path, engine=engine)
+    except (ImportError, ValueError) as e:
+        # Older pandas versions do not know the calamine engine
+        print(f"Falling back to the default Excel reader: {e}")
+        engine = None
+        xl = pd.ExcelFile(file_path)
+    
+    with xl:
+        wanted = [sheet for sheet in xl.sheet_names if sheets is None or sheet in sheets]
+        skipped = [sheet for sheet in xl.sheet_names if sheet not in wanted]
+        if skipped:
+            print(f"Skipping sheets not in the allowlist: {skipped}")
+        print(f"Parsing sheets {wanted} with the {engine or 'default'} Excel engine")
+        
+        if engine != 'calamine' or len(wanted) < 2:
+            # openpyxl parsing is bound to the GIL, so reuse the open workbook sequentially
+            return {sheet: xl.parse(sheet) for sheet in wanted}
+    
+    # Threads rather than processes: calamine parses in native code rather than Python
+    # bytecode, so the sheets overlap without extra interpreters, and the parsed frames
+    # come back without being pickled across a process boundary.
+    def parse_sheet(sheet):
+        return pd.read_excel(file_path, sheet_name=sheet, engine=engine)
+    
+    with ThreadPoolExecutor(max_workers=max_workers or len(wanted)) as pool:
+        return dict(zip(wanted, pool.map(parse_sheet, wanted)))
+
+def row_fingerprints(df):
+    """Duplicate key per row: the 'RowHash' column if present, else a stable 64-bit hash of all values."""
+    if 'RowHash' in df.columns:
+        return df['RowHash']
+    return pd.util.hash_pandas_object(df, index=False)
+
+def summarize_duplicates(df, fingerprints):
+    """Classify every duplicated fingerprint as identical or non-identical in one pass.
+
+    Returns a table indexed by fingerprint with the number of rows sharing it, how many
+    distinct row contents they have and the resulting kind.
+    """
+    duplicated = fingerprints.duplicated(keep=False)
+    if not duplicated.any():
+        return pd.DataFrame(columns=['rows', 'distinct_rows', 'kind'])
+    
+    contents = pd.util.hash_pandas_object(df[duplicated], index=False)
+    summary = (
+        pd.DataFrame({'fingerprint': fingerprints[duplicated].to_numpy(), 'content': contents.to_numpy()})
+        .groupby('fingerprint')['content']
+        .agg(rows='size', distinct_rows='nunique')
+    )
+    summary['kind'] = np.where(summary['distinct_rows'] == 1, 'identical', 'non-identical')
+    return summary.sort_values(['kind', 'rows'], ascending=[True, False])
 
 def check_sheet_duplicates(sheet_name, df):
-    """Print duplicate details for the sheet using the 'RowHash' column."""
-    if 'RowHash' not in df.columns:
-        print(f"No 'RowHash' column found in sheet: {sheet_name}")
-        return
+    """Print a compact duplicate summary for the sheet and return the per-fingerprint table."""
+    source = "'RowHash'" if 'RowHash' in df.columns else "row content hashes"
+    summary = summarize_duplicates(df, row_fingerprints(df))
+    if summary.empty:
+        print(f"No duplicates found in sheet: {sheet_name} (using {source})")
+        print()
+        return summary
     
-    duplicates = df[df.duplicated(subset=['RowHash'], keep=False)]
-    if duplicates.empty:
-        print(f"No duplicates found in sheet: {sheet_name}")
-    else:
-        print(f"Duplicates found in sheet: {sheet_name}")
-        for rowhash, group in duplicates.groupby('RowHash'):
-            if group.drop_duplicates().shape[0] == 1:
-                print(f"Identical duplicates found for RowHash: {rowhash}")
-            else:
-                print(f"Non-identical duplicates found for RowHash: {rowhash}")
-                print(group)
-    print("\n")
+    kinds = summary.groupby('kind')['rows'].agg(['size', 'sum'])
+    print(f"Duplicates found in sheet: {sheet_name} (using {source})")
+    for kind, counts in kinds.iterrows():
+        print(f"  {counts['size']} {kind} duplicate group(s) covering {counts['sum']} rows")
+    
+    # Group details are diagnostics: a sample at INFO, every group at DEBUG, none above INFO
+    non_identical = summary[summary['kind'] == 'non-identical']
+    if not non_identical.empty and log_enabled('INFO'):
+        if log_enabled('DEBUG'):
+            log("  Non-identical groups:", 'DEBUG')
+            log(non_identical.to_string(), 'DEBUG')
+        else:
+            log(f"  Non-identical groups (showing up to {MAX_SUMMARY_ROWS}; PIPELINE_LOG_LEVEL=DEBUG shows all):")
+            log(non_identical.head(MAX_SUMMARY_ROWS).to_string())
+    print()
+    return summary
 
 def remove_sheet_duplicates(sheet_name, df):
-    """Remove duplicates from the sheet based on the 'RowHash' column."""
-    if 'RowHash' not in df.columns:
-        print(f"No 'RowHash' column found in sheet: {sheet_name}. Skipping duplicate removal.")
-        return df
-    
+    """Remove duplicates from the sheet, keyed on 'RowHash' or on the full row content."""
     original_count = len(df)
-    df_cleaned = df.drop_duplicates(subset=['RowHash'])
+    df_cleaned = df[~row_fingerprints(df).duplicated()]
     removed_count = original_count - len(df_cleaned)
     
     if removed_count > 0:
@@ -52,62 +137,66 @@ def remove_sheet_duplicates(sheet_name, df):
     
     return df_cleaned
 
-# Main execution
-try:
-    # Use centralized path management
-    excel_file_path = get_dataset_path(DATASET_KEYS['INSTAGRAM_ANALYTICS_EXCEL'])
-    excel_sheets = load_excel_sheets(excel_file_path)
-    
-    # Remove unwanted sheets
-    excel_sheets.pop('SupermetricsQueries', None)
-
-    # Check for duplicates
-    for sheet_name, df in excel_sheets.items():
-        check_sheet_duplicates(sheet_name, df)
-
-    # Remove duplicates
-    for sheet_name, df in excel_sheets.items():
-        excel_sheets[sheet_name] = remove_sheet_duplicates(sheet_name, df)
-
-    # Clean specific sheets
-    if "Instagram Top Cities Regions" in excel_sheets:
-        df = excel_sheets["Instagram Top Cities Regions"]
-        if "City" in df.columns:
-            df = df.drop(columns=["City"])
-            excel_sheets["Instagram Top Cities Regions"] = df
-            print("Removed 'City' column from 'Instagram Top Cities Regions' sheet.\n")
-
-    # Remove RowHash columns
-    for sheet_name, df in excel_sheets.items():
-        if "RowHash" in df.columns:
-            df = df.drop(columns=["RowHash"])
-            excel_sheets[sheet_name] = df
-            print(f"Removed 'RowHash' column from sheet: {sheet_name}\n")
-
-    # Clean Instagram Post Engagement
-    if "Instagram Post Engagement" in excel_sheets:
-        df = excel_sheets["Instagram Post Engagement"]
-        if "Media ID" in df.columns:
-            df = df.drop(columns=["Media ID"])
-            excel_sheets["Instagram Post Engagement"] = df
-            print("Dropped 'Media ID' column from 'Instagram Post Engagement' sheet.\n")
-
-    # Export cleaned data using safe paths
-    for sheet_name, df in excel_sheets.items():
-        safe_filename = f"{sheet_name}.csv"
-        output_path = get_output_path(DIRECTORY_KEYS['DATASET'], safe_filename)
-        df.to_csv(output_path, index=False)
-        print(f"Exported sheet '{sheet_name}' to {output_path}\n")
+def drop_unused_columns(sheet_name, df, columns):
+    """Drop the listed columns that the sheet has"""
+    present = [col for col in columns if col in df.columns]
+    if present:
+        df = df.drop(columns=present)
+        print(f"Dropped {present} from '{sheet_name}' sheet.\n")
+    return df
+
+def export_sheet(df, output_path):
+    """Write a cleaned sheet to CSV. The workbook is read unsanitized, so formula-like text is neutralized here."""
+    sanitize_formula_injection(df.copy()).to_csv(output_path, index=False)
+
+def main():
+    try:
+        # Use centralized path management
+        excel_file_path = get_dataset_path(DATASET_KEYS['INSTAGRAM_ANALYTICS_EXCEL'])
+        excel_sheets = load_excel_sheets(excel_file_path, sheets=SHEET_ALLOWLIST)
+        count_io(rows_read=sum(len(df) for df in excel_sheets.values()), bytes_read=os.path.getsize(excel_file_path))
+        print()
+
+        # Check for duplicates
+        for sheet_name, df in excel_sheets.items():
+            check_sheet_duplicates(sheet_name, df)
+
+        # Remove duplicates
+        for sheet_name, df in excel_sheets.items():
+            excel_sheets[sheet_name] = remove_sheet_duplicates(sheet_name, df)
+
+        # Remove RowHash columns
+        for sheet_name, df in excel_sheets.items():
+            if "RowHash" in df.columns:
+                df = df.drop(columns=["RowHash"])
+                excel_sheets[sheet_name] = df
+                print(f"Removed 'RowHash' column from sheet: {sheet_name}\n")
+
+        # Drop the columns not needed downstream, now that duplicates are resolved
+        for sheet_name, columns in DROPPED_COLUMNS.items():
+            if sheet_name in excel_sheets:
+                excel_sheets[sheet_name] = drop_unused_columns(sheet_name, excel_sheets[sheet_name], columns)
+
+        # Export cleaned data using safe paths
+        for sheet_name, df in excel_sheets.items():
+            safe_filename = f"{sheet_name}.csv"
+            output_path = get_output_path(DIRECTORY_KEYS['DATASET'], safe_filename)
+            export_sheet(df, output_path)
+            count_io(rows_written=len(df))
+            print(f"Exported sheet '{sheet_name}' to {output_path}")
+            # Typed copy with parsed dates so the analysis scripts can skip CSV parsing
+            cache_path = write_columnar_cache(output_path)
+            if cache_path:
+                print(f"Wrote columnar cache for '{sheet_name}' to {cache_path}")
+            print()
         
-    print("✓ Data cleaning completed successfully")
+        print("✓ Data cleaning completed successfully")
         
-except Exception as e:
-    print(f"Error in clean.py: {e}")
-    import traceback
-    traceback.print_exc()
-
-
-
-
-
-
+    except Exception as e:
+        print(f"Error in clean.py: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
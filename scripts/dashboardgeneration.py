@@ -6,15 +6,17 @@ import webbrowser
 import pandas as pd
 import datetime
 import json
-import requests
-import hashlib # Add this for checksum calculation
+import re
+import base64
+import hashlib
+import numpy as np
 
 # Add scripts directory to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from path_utils import get_dataset_path, get_output_path, DATASET_KEYS, DIRECTORY_KEYS
+from path_utils import get_dataset_path, get_directory, calculate_sha256, is_headless, sanitize_formula_injection, DATASET_KEYS, DIRECTORY_KEYS
 
 # --- Security Configuration for Plotly Download ---
 # Option: Pin to a specific version for better security and stability
@@ -23,14 +25,24 @@ PLOTLY_JS_FILENAME = f"plotly-{PLOTLY_VERSION}.min.js"
 PLOTLY_CDN_URL = f"https://cdn.plot.ly/{PLOTLY_JS_FILENAME}"
 EXPECTED_PLOTLY_CHECKSUM = "A32E817BB121E9E89016CE4CEE85EE3F1C66F6A6C95C4B53A5F488F77756D7A4" 
 
-def calculate_sha256(filepath):
-    """Calculates the SHA256 checksum of a file."""
-    sha256_hash = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        # Read and update hash string value in blocks of 4K
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+# The dashboard data lives in content-hashed files next to dashboard.qmd (<prefix>.<hash>.js),
+# so browsers can cache each version and a data refresh never changes the page itself.
+# The page loads DASHBOARD_DATA_LOADER, which names the current data file; the data file in
+# turn names the raw rows file, which is only loaded when the user asks to see the rows.
+DASHBOARD_DATA_PREFIX = "dashboard_data"
+DASHBOARD_ROWS_PREFIX = "dashboard_rows"
+DASHBOARD_DATA_LOADER = "dashboard_data.js"
+# Hex digits of the SHA-256 content hash used in versioned file names
+ASSET_HASH_LENGTH = 12
+
+# PIPELINE_DASHBOARD_RENDERER values: 'direct' writes dashboard.html in-process from the page
+# markup below; 'quarto' writes dashboard.qmd and renders it with `quarto render` (slower, as it
+# starts a Jupyter kernel, but picks up the Quarto theme)
+DASHBOARD_RENDERERS = ('direct', 'quarto')
+
+# Integer typed arrays a dashboard column can be packed into, narrowest first (little-endian,
+# as typed arrays are in every browser); other columns are sent as float64
+PAYLOAD_INT_TYPES = [('int8', '<i1'), ('int16', '<i2'), ('int32', '<i4')]
 
 def download_plotly_js_secure(output_dir):
     """
@@ -57,6 +69,8 @@ def download_plotly_js_secure(output_dir):
                 raise # Re-raise to stop execution if we can't remove the bad file
 
     print(f"Downloading {PLOTLY_JS_FILENAME} (Version: {PLOTLY_VERSION}) to {output_dir}...")
+    # Only needed for the download, so the dashboard code can be imported without it
+    import requests
     try:
         response = requests.get(PLOTLY_CDN_URL, timeout=30)
         response.raise_for_status()  # Raise an exception for HTTP errors
@@ -96,125 +110,107 @@ def download_plotly_js_secure(output_dir):
             os.remove(temp_plotly_js_path) # Ensure temp file is cleaned up
         raise
 
-def create_dashboard_qmd():
-    # Get the safe path to the dataset for use in the dashboard content
-    try:
-        profile_overview_path = get_dataset_path(DATASET_KEYS['INSTAGRAM_PROFILE_OVERVIEW'])
-        # Convert to relative path for the dashboard (assuming dashboard.qmd is in project root)
-        relative_path = os.path.relpath(profile_overview_path).replace('\\', '/')
-    except Exception as e:
-        print(f"Error getting dataset path: {e}")
-        # Fallback to the centralized path system
-        relative_path = "dataset/Instagram Profile Overview.csv"
-    
-    # Load data and clean it
-    df = pd.read_csv(relative_path, parse_dates=["Date"])
-    
-    # Fill NaN values with 0 for numeric columns
-    numeric_columns = df.select_dtypes(include=['number']).columns
-    df[numeric_columns] = df[numeric_columns].fillna(0)
-    
-    df['MonthYear'] = df['Date'].dt.to_period('M').astype(str)
-    available_periods = sorted(df['MonthYear'].unique())
-    
-    # Prepare data for JavaScript
-    df_for_js = df.copy()
-    # Ensure 'Date' column is in ISO format string for robust new Date() parsing in JS
-    if 'Date' in df_for_js.columns and pd.api.types.is_datetime64_any_dtype(df_for_js['Date']):
-        df_for_js['Date'] = df_for_js['Date'].dt.strftime('%Y-%m-%d')
-    
-    js_data_for_script = df_for_js.to_dict('records')
-    
-    # Get available numeric columns for metric selection (exclude Date and MonthYear)
-    available_metrics = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col]) and col not in ['Date']]
-    
-    # Debug output
-    print(f"Data shape: {df.shape}")
-    print(f"Available periods: {available_periods}")
-    print(f"Available metrics: {available_metrics}")
-    print(f"Sample data: {df.head(2).to_dict('records')}")
-    
-    # Determine where dashboard.qmd will be saved (project root)
-    # This is also where plotly-latest.min.js should be.
-    
-    # CORRECT WAY to get the project root directory:
-    # Assuming 'scripts' is a subdirectory of the project root.
-    current_script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root_dir = os.path.abspath(os.path.join(current_script_dir, '..'))
-    
-    # Ensure the project root directory exists (it should, but good practice)
-    os.makedirs(project_root_dir, exist_ok=True)
-    print(f"Project root for Plotly download: {project_root_dir}") # Debug print
-
-    try:
-        # Download Plotly.js securely to the project_root_dir
-        local_plotly_js_file = download_plotly_js_secure(project_root_dir)
-    except Exception as e:
-        print(f"✗✗✗ FATAL ERROR: Could not obtain a secure copy of Plotly.js. Dashboard generation aborted. ✗✗✗")
-        print(f"Error details: {e}")
-        raise
+def encode_column(values):
+    """Pack a numeric column into a base64 typed-array buffer: {'type': ..., 'data': ...}.
 
-    # Create dashboard content with proper structure
-    js_data_str = json.dumps(js_data_for_script, default=str)
-    js_periods_str = json.dumps(available_periods)
-    js_metrics_str = json.dumps(available_metrics)
-
-    script_data_injection = f"""
-      <script>
-        console.log("Starting data injection...");
-        try {{
-          window.rawData = {js_data_str};
-          window.availablePeriods = {js_periods_str};
-          window.availableMetrics = {js_metrics_str};
-          
-          console.log("Data injection successful");
-          console.log("Raw data length:", window.rawData?.length);
-          console.log("Available periods:", window.availablePeriods);
-          console.log("Available metrics:", window.availableMetrics);
-        }} catch(e) {{
-          console.error("Data injection failed:", e);
-        }}
-      </script>
+    Whole numbers use the narrowest integer type that holds them, anything else float64.
+    dashboard_script.js turns it back into a typed array with decodeColumn().
     """
-
-    dashboard_content = f"""---
-title: "Interactive Instagram Analytics Dashboard"
-format:
-  html:
-    echo: false
-    theme: lumen
-    page-layout: full
-    code-fold: true
-    toc: false
----
-
-```{{python}}
-#| echo: false
-#| output: false
-import pandas as pd
-import json
-from IPython.display import HTML, display
-
-# Load data for context
-df_qmd_context = pd.read_csv(r"{relative_path}", parse_dates=["Date"])
-df_qmd_context['MonthYear'] = df_qmd_context['Date'].dt.to_period('M').astype(str)
-
-print("--- QMD Python Context ---")
-print(f"Data loaded: {{len(df_qmd_context)}} records")
-print(f"Date range: {{df_qmd_context['Date'].min()}} to {{df_qmd_context['Date'].max()}}")
-print(f"Available columns: {{list(df_qmd_context.columns)}}")
-numeric_cols_qmd = [col for col in df_qmd_context.columns if pd.api.types.is_numeric_dtype(df_qmd_context[col])]
-print(f"Numeric columns: {{numeric_cols_qmd}}")
-print("--------------------------")
-```
-
-```{{python}}
-#| echo: false
-#| output: asis
-from IPython.display import HTML
-
-# Dashboard HTML content
-dashboard_html = '''
+    array = np.asarray(values, dtype='float64')
+    encoded, type_name = array.astype('<f8'), 'float64'
+    if np.isfinite(array).all() and (array == np.round(array)).all():
+        for name, dtype in PAYLOAD_INT_TYPES:
+            limits = np.iinfo(dtype)
+            if array.size == 0 or (array.min() >= limits.min and array.max() <= limits.max):
+                encoded, type_name = array.astype(dtype), name
+                break
+    return {'type': type_name, 'data': base64.b64encode(encoded.tobytes()).decode('ascii')}
+
+def build_dashboard_cube(df, metrics, periods):
+    """Row counts and metric sums, minima and maxima per day, week and month.
+
+    Weeks start on Monday but are cut at month boundaries, so every bucket belongs to a
+    single period and the dashboard can combine buckets for any selection of months.
+    Buckets are sorted by start date. Every column is packed with encode_column(); start
+    dates are days since 1970-01-01 and periods are indices into the periods list.
+    """
+    month_start = df['Date'].dt.to_period('M').dt.start_time
+    week_start = df['Date'].dt.to_period('W').dt.start_time
+    bucket_starts = {
+        'day': df['Date'].dt.normalize(),
+        'week': week_start.where(week_start >= month_start, month_start),
+        'month': month_start,
+    }
+    period_index = {period: index for index, period in enumerate(periods)}
+
+    buckets = {}
+    for name, starts in bucket_starts.items():
+        grouped = df[metrics].groupby(starts.rename('start'))
+        stats = {'sum': grouped.sum(), 'min': grouped.min(), 'max': grouped.max()}
+        starts_index = stats['sum'].index
+        buckets[name] = {
+            'size': len(starts_index),
+            'start': encode_column(starts_index.values.astype('datetime64[D]').astype('int64')),
+            'period': encode_column([period_index[period] for period in starts_index.to_period('M').astype(str)]),
+            'count': encode_column(grouped.size()),
+            **{stat: {metric: encode_column(frame[metric]) for metric in metrics} for stat, frame in stats.items()},
+        }
+    return {'periods': periods, 'metrics': metrics, 'buckets': buckets}
+
+def write_versioned_asset(output_dir, prefix, content):
+    """Write content to <prefix>.<content hash>.js unless that version already exists. Returns the file name."""
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:ASSET_HASH_LENGTH]
+    filename = f"{prefix}.{digest}.js"
+    path = os.path.join(output_dir, filename)
+    if not os.path.exists(path):
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(path + ".tmp", path)
+    return filename
+
+def remove_stale_assets(output_dir, prefix, current_filename):
+    """Delete the versions of a versioned asset other than current_filename"""
+    pattern = re.compile(rf"^{re.escape(prefix)}\.[0-9a-f]{{{ASSET_HASH_LENGTH}}}\.js$")
+    for filename in os.listdir(output_dir):
+        if pattern.match(filename) and filename != current_filename:
+            try:
+                os.remove(os.path.join(output_dir, filename))
+            except OSError as e:
+                print(f"Warning: could not remove old dashboard data {filename}: {e}")
+
+def write_dashboard_data(output_dir, df, cube, available_periods, available_metrics):
+    """Write the versioned data and raw rows files and point the loader at them. Returns the data file name."""
+    # Raw rows for the on-demand table, with dates as ISO strings. The CSV is read directly
+    # rather than through safe_read_csv, so its text is sanitized here before it is exported.
+    df_rows = sanitize_formula_injection(df.copy())
+    df_rows['Date'] = df_rows['Date'].dt.strftime('%Y-%m-%d')
+    rows_file = write_versioned_asset(
+        output_dir, DASHBOARD_ROWS_PREFIX,
+        f"window.dashboardRows = {json.dumps(df_rows.to_dict('records'), default=str)};\n",
+    )
+    data_file = write_versioned_asset(output_dir, DASHBOARD_DATA_PREFIX, (
+        f"window.dashboardCube = {json.dumps(cube)};\n"
+        f"window.dashboardRowsFile = {json.dumps(rows_file)};\n"
+        f"window.availablePeriods = {json.dumps(available_periods)};\n"
+        f"window.availableMetrics = {json.dumps(available_metrics)};\n"
+    ))
+
+    # Switch the page over only once both files are in place
+    loader_path = os.path.join(output_dir, DASHBOARD_DATA_LOADER)
+    with open(loader_path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(f"window.dashboardDataFile = {json.dumps(data_file)};\n")
+    os.replace(loader_path + ".tmp", loader_path)
+
+    remove_stale_assets(output_dir, DASHBOARD_ROWS_PREFIX, rows_file)
+    remove_stale_assets(output_dir, DASHBOARD_DATA_PREFIX, data_file)
+    print(f"✓ Wrote dashboard data to: {os.path.join(output_dir, data_file)}")
+    return data_file
+
+# Page markup shared by the direct renderer and the Quarto document: the sidebar controls and
+# chart containers (populated by dashboard_script.js) and the theme CSS variables
+DASHBOARD_TITLE = "Interactive Instagram Analytics Dashboard"
+
+DASHBOARD_BODY_HTML = """\
 <div style="display: flex; min-height: 80vh;">
     <!-- Sidebar -->
     <div id="controls-container" style="width: 320px; min-width: 220px; background: var(--bg-secondary); padding: 24px 16px 24px 16px; border-radius: 12px; margin: 24px 24px 24px 0; box-shadow: 0 2px 8px rgba(0,0,0,0.06); border: 1px solid var(--border-color); display: flex; flex-direction: column; gap: 32px;">
@@ -246,6 +242,10 @@ dashboard_html = '''
                 <!-- Metric toggle buttons populated by JavaScript -->
             </div>
         </div>
+        <div>
+            <h4 style="margin-top: 0; color: var(--text-secondary);">Raw Data</h4>
+            <button id="raw-rows-toggle" onclick="toggleRawRows()" style="background: var(--info-color); color: white; border: none; padding: 6px 12px; border-radius: 4px; cursor: pointer;">Show Rows</button>
+        </div>
         <div id="debug-info-container" style="background: var(--bg-primary); padding: 10px; margin: 10px 0; border-radius: 5px; border: 1px solid var(--border-color);">
             <div style="display: flex; justify-content: space-between; align-items: center; cursor: pointer;" onclick="toggleDebugInfo()">
                 <strong style="color: var(--text-primary);">Debug Info</strong>
@@ -261,16 +261,14 @@ dashboard_html = '''
             <div id="comparison-chart" style="margin: 20px 0;"></div> <!-- REMOVED -->
             <div id="trends-chart" style="margin: 20px 0;"></div>
             <div id="summary-stats" style="margin: 20px 0; padding: 20px; background: var(--bg-secondary); border-radius: 8px; border: 1px solid var(--border-color);"></div>
+            <div id="raw-rows" style="margin: 20px 0; overflow-x: auto; display: none;"></div>
         </div>
     </div>
 </div>
+"""
 
-<script src="{local_plotly_js_file}"></script> 
-{script_data_injection}
-<script src="dashboard_script.js"></script>
-
-<style>
-:root {{
+DASHBOARD_CSS = """\
+:root {
   /* Light theme (default) */
   --bg-primary: #ffffff;
   --bg-secondary: #f8f9fa;
@@ -283,9 +281,9 @@ dashboard_html = '''
   --info-color: #17a2b8;
   --warning-color: #ffc107;
   --danger-color: #dc3545;
-}}
+}
 
-[data-theme="dark"] {{
+[data-theme="dark"] {
   /* Dark theme */
   --bg-primary: #2d3748;
   --bg-secondary: #1a202c;
@@ -298,60 +296,60 @@ dashboard_html = '''
   --info-color: #38b2ac;
   --warning-color: #ed8936;
   --danger-color: #f56565;
-}}
+}
 
-body {{ 
+body { 
     font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif; 
     line-height: 1.6; 
     color: var(--text-primary);
     background-color: var(--bg-primary);
     transition: background-color 0.3s ease, color 0.3s ease;
-}}
+}
 
-.dashboard-container {{ 
+.dashboard-container { 
     max-width: 1400px; 
     margin: 0 auto; 
     padding: 20px; 
-}}
+}
 
-button:hover {{ 
+button:hover { 
     opacity: 0.8; 
     transform: translateY(-1px); 
     transition: all 0.2s ease;
-}}
+}
 
-input[type="checkbox"] {{ 
+input[type="checkbox"] { 
     margin-right: 8px; 
-}}
+}
 
-label {{ 
+label { 
     font-weight: normal; 
     cursor: pointer; 
     color: var(--text-primary);
-}}
+}
 
-label:hover {{ 
+label:hover { 
     color: var(--primary-color); 
-}}
+}
 
-#charts-container > div {{ 
+#charts-container > div { 
     margin: 30px 0; 
     padding: 20px; 
     background: var(--bg-primary); 
     border-radius: 10px; 
     box-shadow: 0 2px 8px rgba(0,0,0,0.1); 
     border: 1px solid var(--border-color);
-}}
+}
 
-#theme-toggle {{
+#theme-toggle {
     transition: all 0.3s ease;
-}}
+}
 
-#theme-toggle:hover {{
+#theme-toggle:hover {
     transform: scale(1.05);
-}}
+}
 
-.metric-button {{
+.metric-button {
     display: inline-block;
     margin: 4px;
     padding: 8px 12px;
@@ -362,24 +360,145 @@ label:hover {{
     cursor: pointer;
     transition: all 0.2s ease;
     font-size: 14px;
-}}
+}
 
-.metric-button:hover {{
+.metric-button:hover {
     border-color: var(--primary-color);
     transform: translateY(-1px);
-}}
+}
 
-.metric-button.active {{
+.metric-button.active {
     background: var(--primary-color);
     color: white;
     border-color: var(--primary-color);
-}}
+}
 
-.metric-button.active:hover {{
+.metric-button.active:hover {
     background: var(--info-color);
     border-color: var(--info-color);
-}}
-</style>
+}
+"""
+
+def dashboard_markup(local_plotly_js_file):
+    """Sidebar, chart containers, scripts and styles of the dashboard page"""
+    return (
+        DASHBOARD_BODY_HTML
+        + f"""
+<script src="{local_plotly_js_file}"></script> 
+<script src="{DASHBOARD_DATA_LOADER}"></script>
+<script src="dashboard_script.js"></script>
+
+<style>
+"""
+        + DASHBOARD_CSS
+        + "</style>"
+    )
+
+def write_if_changed(path, content):
+    """Write content to path unless the file already holds exactly that. Returns True if it was written."""
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return True
+
+def prepare_dashboard():
+    """Write the dashboard data files and fetch Plotly.js. Returns (project root, dataset path for the page, Plotly.js file name)."""
+    # Get the safe path to the dataset for use in the dashboard content
+    try:
+        profile_overview_path = get_dataset_path(DATASET_KEYS['INSTAGRAM_PROFILE_OVERVIEW'])
+        # Convert to relative path for the dashboard (assuming dashboard.qmd is in project root)
+        relative_path = os.path.relpath(profile_overview_path).replace('\\', '/')
+    except Exception as e:
+        print(f"Error getting dataset path: {e}")
+        # Fallback to the centralized path system
+        relative_path = "dataset/Instagram Profile Overview.csv"
+    
+    # Load data and clean it
+    df = pd.read_csv(relative_path, parse_dates=["Date"])
+    
+    # Fill NaN values with 0 for numeric columns
+    numeric_columns = df.select_dtypes(include=['number']).columns
+    df[numeric_columns] = df[numeric_columns].fillna(0)
+    
+    df['MonthYear'] = df['Date'].dt.to_period('M').astype(str)
+    available_periods = sorted(df['MonthYear'].unique())
+    
+    # Get available numeric columns for metric selection (exclude Date and MonthYear)
+    available_metrics = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col]) and col not in ['Date']]
+    
+    # The page gets the aggregates; it loads the raw rows only when they are shown
+    cube = build_dashboard_cube(df, available_metrics, available_periods)
+    
+    # Debug output
+    print(f"Data shape: {df.shape}")
+    print(f"Available periods: {available_periods}")
+    print(f"Available metrics: {available_metrics}")
+    print(f"Sample data: {df.head(2).to_dict('records')}")
+    print(f"Aggregate buckets: " + ", ".join(f"{bucket['size']} {name}s" for name, bucket in cube['buckets'].items()))
+    
+    # Determine where dashboard.qmd will be saved (project root)
+    # This is also where plotly-latest.min.js should be.
+    project_root_dir = get_directory(DIRECTORY_KEYS['ROOT'])
+    print(f"Project root for Plotly download: {project_root_dir}") # Debug print
+
+    try:
+        # Download Plotly.js securely to the project_root_dir
+        local_plotly_js_file = download_plotly_js_secure(project_root_dir)
+    except Exception as e:
+        print(f"✗✗✗ FATAL ERROR: Could not obtain a secure copy of Plotly.js. Dashboard generation aborted. ✗✗✗")
+        print(f"Error details: {e}")
+        raise
+
+    # The data goes in its own files, so the page only changes when its markup does
+    write_dashboard_data(project_root_dir, df, cube, available_periods, available_metrics)
+    return project_root_dir, relative_path, local_plotly_js_file
+
+def create_dashboard_qmd():
+    """Write the dashboard data files and dashboard.qmd. Returns (qmd path, whether the qmd changed)."""
+    project_root_dir, relative_path, local_plotly_js_file = prepare_dashboard()
+
+    dashboard_content = f"""---
+title: "{DASHBOARD_TITLE}"
+format:
+  html:
+    echo: false
+    theme: lumen
+    page-layout: full
+    code-fold: true
+    toc: false
+---
+
+```{{python}}
+#| echo: false
+#| output: false
+import pandas as pd
+import json
+from IPython.display import HTML, display
+
+# Load data for context
+df_qmd_context = pd.read_csv(r"{relative_path}", parse_dates=["Date"])
+df_qmd_context['MonthYear'] = df_qmd_context['Date'].dt.to_period('M').astype(str)
+
+print("--- QMD Python Context ---")
+print(f"Data loaded: {{len(df_qmd_context)}} records")
+print(f"Date range: {{df_qmd_context['Date'].min()}} to {{df_qmd_context['Date'].max()}}")
+print(f"Available columns: {{list(df_qmd_context.columns)}}")
+numeric_cols_qmd = [col for col in df_qmd_context.columns if pd.api.types.is_numeric_dtype(df_qmd_context[col])]
+print(f"Numeric columns: {{numeric_cols_qmd}}")
+print("--------------------------")
+```
+
+```{{python}}
+#| echo: false
+#| output: asis
+from IPython.display import HTML
+
+# Dashboard HTML content
+dashboard_html = '''
+{dashboard_markup(local_plotly_js_file)}
 '''
 
 display(HTML(dashboard_html))
@@ -388,10 +507,44 @@ display(HTML(dashboard_html))
     
     # Save the dashboard file to project root
     dashboard_path = os.path.join(project_root_dir, "dashboard.qmd") # Ensure dashboard.qmd is also saved here
-    with open(dashboard_path, "w", encoding="utf-8") as f:
-        f.write(dashboard_content)
+    if not write_if_changed(dashboard_path, dashboard_content):
+        print(f"✓ dashboard.qmd unchanged: {dashboard_path}")
+        return dashboard_path, False
     print(f"✓ Created dashboard.qmd at: {dashboard_path}")
-    return dashboard_path
+    return dashboard_path, True
+
+def create_dashboard_html():
+    """Write the dashboard data files and render dashboard.html directly from the page markup. Returns its path."""
+    project_root_dir, _, local_plotly_js_file = prepare_dashboard()
+
+    dashboard_content = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{DASHBOARD_TITLE}</title>
+</head>
+<body>
+<div class="dashboard-container">
+<h1>{DASHBOARD_TITLE}</h1>
+{dashboard_markup(local_plotly_js_file)}
+</div>
+</body>
+</html>
+"""
+
+    # A dashboard.qmd left by the Quarto renderer no longer matches dashboard.html; removing it
+    # makes the next Quarto run render again rather than skip as unchanged
+    qmd_path = os.path.join(project_root_dir, "dashboard.qmd")
+    if os.path.exists(qmd_path):
+        os.remove(qmd_path)
+
+    html_path = os.path.join(project_root_dir, "dashboard.html")
+    if write_if_changed(html_path, dashboard_content):
+        print(f"✓ Rendered dashboard.html at: {html_path}")
+    else:
+        print(f"✓ dashboard.html unchanged: {html_path}")
+    return html_path
 
 def validate_dashboard_file(dashboard_path):
     """Validate that the dashboard file was created properly"""
@@ -403,6 +556,48 @@ def validate_dashboard_file(dashboard_path):
     print(f"✓ Dashboard file validated: {file_size} bytes")
     return True
 
+def dashboard_renderer():
+    """Dashboard renderer chosen by PIPELINE_DASHBOARD_RENDERER ('direct' by default, or 'quarto')"""
+    renderer = os.environ.get('PIPELINE_DASHBOARD_RENDERER', 'direct').strip().lower() or 'direct'
+    if renderer not in DASHBOARD_RENDERERS:
+        print(f"Warning: unknown PIPELINE_DASHBOARD_RENDERER '{renderer}', using 'direct'")
+        return 'direct'
+    return renderer
+
+def render_dashboard_with_quarto():
+    """Write dashboard.qmd and render it with Quarto (skipped when the page is unchanged). Returns the HTML path."""
+    dashboard_path, page_changed = create_dashboard_qmd()
+    validate_dashboard_file(dashboard_path)
+    
+    dashboard_dir = os.path.dirname(os.path.abspath(dashboard_path))
+    original_dir = os.getcwd()
+    
+    try:
+        os.chdir(dashboard_dir)
+        print(f"Changed directory to: {dashboard_dir}")
+        
+        html_file_name = os.path.splitext(os.path.basename(dashboard_path))[0] + ".html"
+        html_file_path = os.path.join(dashboard_dir, html_file_name)
+        
+        if not page_changed and os.path.exists(html_file_path):
+            # The page loads its data from the files written above, so it is already current
+            print("✓ Dashboard page unchanged, skipping Quarto render (only the data files were updated)")
+        else:
+            print("Rendering dashboard to HTML...")
+            render_cmd = ["quarto", "render", os.path.basename(dashboard_path)] 
+            render_result = subprocess.run(render_cmd, shell=False, capture_output=True, text=True, check=False)
+            
+            if render_result.returncode != 0:
+                print(f"✗ Quarto render failed with return code: {render_result.returncode}")
+                print(f"STDOUT: {render_result.stdout}")
+                print(f"STDERR: {render_result.stderr}")
+            else:
+                print("✓ Dashboard rendered successfully")
+    finally:
+        os.chdir(original_dir)
+        print(f"Returned to original directory: {original_dir}")
+    return html_file_path
+
 def run_dashboard():
     try:
         required_packages = ['plotly']
@@ -418,43 +613,29 @@ def run_dashboard():
             subprocess.check_call([sys.executable, "-m", "pip", "install"] + missing_packages)
             print("✓ Required packages installed")
         
-        dashboard_path = create_dashboard_qmd()
-        validate_dashboard_file(dashboard_path)
-        
-        dashboard_dir = os.path.dirname(os.path.abspath(dashboard_path))
-        original_dir = os.getcwd()
-        
-        try:
-            os.chdir(dashboard_dir)
-            print(f"Changed directory to: {dashboard_dir}")
-            
-            print("Rendering dashboard to HTML...")
-            render_cmd = ["quarto", "render", os.path.basename(dashboard_path)] 
-            render_result = subprocess.run(render_cmd, shell=False, capture_output=True, text=True, check=False)
-            
-            if render_result.returncode != 0:
-                print(f"✗ Quarto render failed with return code: {render_result.returncode}")
-                print(f"STDOUT: {render_result.stdout}")
-                print(f"STDERR: {render_result.stderr}")
+        renderer = dashboard_renderer()
+        print(f"Dashboard renderer: {renderer}")
+        if renderer == 'quarto':
+            html_file_path = render_dashboard_with_quarto()
+        else:
+            html_file_path = create_dashboard_html()
+            validate_dashboard_file(html_file_path)
+
+        if os.path.exists(html_file_path):
+            print(f"✓ Dashboard HTML created: {html_file_path}")
+            file_url = f"file:///{html_file_path.replace(os.sep, '/')}"
+            if is_headless():
+                print("Headless mode: not opening the dashboard in a browser")
             else:
-                print("✓ Dashboard rendered successfully")
-            
-            html_file_name = os.path.splitext(os.path.basename(dashboard_path))[0] + ".html"
-            html_file_path = os.path.join(dashboard_dir, html_file_name)
-
-            if os.path.exists(html_file_path):
-                print(f"✓ Dashboard HTML created: {html_file_path}")
-                file_url = f"file:///{html_file_path.replace(os.sep, '/')}"
                 print(f"Opening dashboard in browser: {file_url}")
                 webbrowser.open(file_url)
                 print("✓ Dashboard opened in browser")
-            else:
-                print(f"✗ Dashboard HTML file not found after rendering: {html_file_path}")
-                
-        finally:
-            os.chdir(original_dir)
-            print(f"Returned to original directory: {original_dir}")
+        else:
+            print(f"✗ Dashboard HTML file not found after rendering: {html_file_path}")
             
+    except ModuleNotFoundError:
+        # Let master.py see the missing module and offer to install it
+        raise
     except Exception as e:
         print(f"✗ Error launching dashboard: {e}")
         import traceback
@@ -1,32 +1,40 @@
 import sys
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 
 # Add scripts directory to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from path_utils import safe_read_csv, get_output_path, DATASET_KEYS, DIRECTORY_KEYS
+from path_utils import load_dataset_chunks, aggregate_chunks, DATASET_KEYS
+from chart_renderer import render_charts
 
-# Read the CSV file using safe path management
-df = safe_read_csv(DATASET_KEYS['INSTAGRAM_POST_ENGAGEMENT'])
+def add_month(chunk):
+    """Tag each post with the month it was published in"""
+    return chunk.assign(MonthYear=chunk['Date'].dt.to_period('M'))
 
-df['Date'] = pd.to_datetime(df['Date'])
-df['MonthYear'] = df['Date'].dt.to_period('M')
-grouped = df.groupby(['MonthYear', 'Media product type']).size().unstack(fill_value=0)
-grouped.plot(kind='bar', stacked=True, figsize=(12, 6))
-plt.title('Type of Media Product by Month')
-plt.xlabel('Date')
-plt.ylabel('Count')
-plt.tight_layout()
+# Read the CSV file using safe path management (streamed in chunks if it is large)
+totals = aggregate_chunks(
+    load_dataset_chunks(DATASET_KEYS['INSTAGRAM_POST_ENGAGEMENT']),
+    groupings={'by_type': ['MonthYear', 'Media product type']},
+    prepare=add_month,
+)
+grouped = totals['by_type']['rows'].unstack(fill_value=0)
 
 # Save the figure using safe path management
-output_path = get_output_path(DIRECTORY_KEYS['GRAPHS'], 'graph3.png')
-plt.savefig(output_path)
-print(f"✓ Saved chart: {output_path}")
-plt.close()
+render_charts([{
+    'filename': 'graph3.png',
+    'kind': 'bar',
+    'frame': grouped,
+    'stacked': True,
+    'figsize': (12, 6),
+    'title': 'Type of Media Product by Month',
+    'xlabel': 'Date',
+    'ylabel': 'Count',
+    'legend': True,
+    'tight_layout': True,
+}])
 
 print("✓ Feed vs Reel analysis completed successfully")
 
@@ -1,7 +1,6 @@
 import sys
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 from scipy.stats import f_oneway
 
 # Add scripts directory to path
@@ -9,51 +8,60 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from path_utils import safe_read_csv, get_output_path, DATASET_KEYS, DIRECTORY_KEYS
-
-# Load your dataset using safe path management
-df = safe_read_csv(DATASET_KEYS['INSTAGRAM_POST_ENGAGEMENT'])
-
-# Ensure 'Media reach' column has no missing values
-df = df.dropna(subset=['Media reach'])
+from path_utils import load_dataset_chunks, aggregate_chunks, DATASET_KEYS
+from chart_renderer import render_charts
+
+def add_periods(chunk):
+    """Drop rows without reach and tag each post with its month and week"""
+    # Ensure 'Media reach' column has no missing values
+    chunk = chunk.dropna(subset=['Media reach'])
+    return chunk.assign(
+        Month=chunk['Date'].dt.to_period('M'),
+        Week=chunk['Date'].dt.to_period('W'),
+    )
+
+def average_reach(period_totals, period_column):
+    """Turn per-period reach sums and counts into a frame of average reach"""
+    averages = (period_totals['Media reach_sum'] / period_totals['Media reach_count']).rename('Media reach')
+    return averages.rename_axis(period_column).reset_index()
+
+# Load your dataset using safe path management (streamed in chunks if it is large)
+totals = aggregate_chunks(
+    load_dataset_chunks(DATASET_KEYS['INSTAGRAM_POST_ENGAGEMENT']),
+    groupings={'Month': 'Month', 'Week': 'Week'},
+    values=['Media reach'],
+    prepare=add_periods,
+)
 
 # Monthly Analysis
-df['Month'] = pd.to_datetime(df['Date']).dt.to_period('M')
-monthly_avg = df.groupby('Month')['Media reach'].mean().reset_index()
+monthly_avg = average_reach(totals['Month'], 'Month')
 monthly_avg['Month'] = monthly_avg['Month'].dt.to_timestamp()
 
 # Weekly Analysis
-df['Week'] = pd.to_datetime(df['Date']).dt.to_period('W')
-weekly_avg = df.groupby('Week')['Media reach'].mean().reset_index()
+weekly_avg = average_reach(totals['Week'], 'Week')
 weekly_avg['Week'] = weekly_avg['Week'].dt.start_time
 
-# Save Monthly Graph
-plt.figure(figsize=(10, 6))
-plt.plot(monthly_avg['Month'], monthly_avg['Media reach'], marker='o', linestyle='-')
-plt.title('Average Media Reach by Month')
-plt.xlabel('Month')
-plt.ylabel('Average Media Reach')
-plt.grid(False)
-
-# Save using safe path management
-monthly_output_path = get_output_path(DIRECTORY_KEYS['GRAPHS'], 'graph2_monthly.png')
-plt.savefig(monthly_output_path)
-print(f"✓ Saved monthly chart: {monthly_output_path}")
-plt.close()
-
-# Save Weekly Graph
-plt.figure(figsize=(10, 6))
-plt.plot(weekly_avg['Week'], weekly_avg['Media reach'], marker='o', linestyle='-')
-plt.title('Average Media Reach by Week')
-plt.xlabel('Week')
-plt.ylabel('Average Media Reach')
-plt.grid(False)
-
-# Save using safe path management
-weekly_output_path = get_output_path(DIRECTORY_KEYS['GRAPHS'], 'graph2_weekly.png')
-plt.savefig(weekly_output_path)
-print(f"✓ Saved weekly chart: {weekly_output_path}")
-plt.close()
+# Save Monthly and Weekly Graphs using safe path management
+render_charts([
+    {
+        'filename': 'graph2_monthly.png',
+        'kind': 'line',
+        'series': [{'x': monthly_avg['Month'], 'y': monthly_avg['Media reach'], 'marker': 'o', 'linestyle': '-'}],
+        'title': 'Average Media Reach by Month',
+        'xlabel': 'Month',
+        'ylabel': 'Average Media Reach',
+        'grid': False,
+    },
+    {
+        'filename': 'graph2_weekly.png',
+        'kind': 'line',
+        'series': [{'x': weekly_avg['Week'], 'y': weekly_avg['Media reach'], 'marker': 'o', 'linestyle': '-'}],
+        'title': 'Average Media Reach by Week',
+        'xlabel': 'Week',
+        'ylabel': 'Average Media Reach',
+        'grid': False,
+    },
+])
 
 # Compare Monthly and Weekly Results
 # Align data for comparison
@@ -1,20 +1,37 @@
 """
 Path utilities for safe file access across all scripts.
 This module should be imported by all scripts that need to access datasets or create outputs.
+master.py uses its PathManager to validate the project and write path_config.json; the
+scripts read that file through load_path_config() and the helpers below.
 """
 
 import os
 import sys
 import json
-import pandas as pd
+import re
+import glob
+import hashlib
+
+# pandas and numpy are imported inside the functions that need them, so importing this
+# module (master.py does, for the path and hash helpers) stays cheap
 
 # Add the scripts directory to Python path so imports work from project root
 scripts_dir = os.path.dirname(os.path.abspath(__file__))
 if scripts_dir not in sys.path:
     sys.path.insert(0, scripts_dir)
 
+# Parsed path_config.json, reused until the file changes, with its directories resolved
+# (real paths, checked to be inside the project) and the ones already created
+_config_cache = {'stamp': None, 'config': None, 'directories': None, 'created': set()}
+
+# Frames loaded by safe_read_csv in this process, keyed by dataset key and read options
+_dataset_registry = {}
+
+# Data volume counters for the current stage, read by master.py's run record
+_io_stats = {}
+
 def load_path_config():
-    """Load path configuration from JSON file"""
+    """Load path configuration from JSON file (re-read only when the file changes)"""
     # Look for config in project root (parent of scripts directory)
     scripts_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(scripts_dir)
@@ -24,10 +41,42 @@ def load_path_config():
         raise FileNotFoundError(
             f"Path configuration not found at {config_path}. Please run master.py first to generate path_config.json"
         )
-        
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
-    return config
+    
+    stamp = _file_stamp(config_path)
+    if _config_cache['stamp'] != stamp:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            _config_cache['config'] = json.load(f)
+        _config_cache['stamp'] = stamp
+        _config_cache['directories'] = None
+        _config_cache['created'] = set()
+    return _config_cache['config']
+
+def is_within(path, directory):
+    """True if path is directory itself or inside it (pass real paths, see os.path.realpath)"""
+    try:
+        return os.path.commonpath([path, directory]) == directory
+    except ValueError:
+        # Paths on different drives
+        return False
+
+def _config_directories():
+    """Directory key -> real path ('..' is the project root), resolved once per config version"""
+    config = load_path_config()
+    if _config_cache['directories'] is None:
+        project_root = os.path.realpath(config['project_root'])
+        directories = {'..': project_root}
+        for key, directory in config['directories'].items():
+            directory = os.path.realpath(directory)
+            if not is_within(directory, project_root):
+                raise ValueError(f"Security violation: {key} directory {directory} is outside the project")
+            directories[key] = directory
+        _config_cache['directories'] = directories
+    return _config_cache['directories']
+
+def _file_stamp(path):
+    """Identify a version of a file by its path, modification time and size"""
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
 
 def get_dataset_path(dataset_key):
     """Get validated dataset file path"""
@@ -39,59 +88,291 @@ def get_dataset_path(dataset_key):
         
     return config['datasets'][dataset_key]
 
-def safe_read_csv(dataset_key, max_rows=100000, **pandas_kwargs):
-    """Safely read CSV with validation and security checks"""
+def safe_read_csv(dataset_key, max_rows=100000, sanitize=True, **pandas_kwargs):
+    """Safely read CSV with validation and security checks.
+
+    If clean.py left a columnar cache made from this exact version of the CSV it is
+    read instead of parsing the CSV text. Date columns are returned already parsed.
+    With sanitize=False formula sanitizing is left to the caller, who must run
+    sanitize_formula_injection() on the frame before exporting it anywhere.
+    Files over the size limit must be read with iter_csv_chunks() instead.
+    """
     filepath = get_dataset_path(dataset_key)
     
+    # Reuse the frame if this process already loaded the same file version with the same options
+    registry_key = (dataset_key, max_rows, sanitize, repr(sorted(pandas_kwargs.items())))
+    stamp = _file_stamp(filepath)
+    cached = _dataset_registry.get(registry_key)
+    if cached is not None and cached[0] == stamp:
+        df = _registry_copy(cached[1])
+        count_io(rows_read=len(df), registry_hits=1)
+        print(f"✓ Loaded {len(df)} rows from {dataset_key} (in-memory cache)")
+        return df
+    
     # Check file size (limit to 50MB)
-    file_size = os.path.getsize(filepath)
-    if file_size > 50 * 1024 * 1024:
-        raise ValueError(f"Dataset file too large: {file_size / (1024*1024):.1f}MB (limit: 50MB)")
+    file_size = stamp[2]
+    if file_size > MAX_IN_MEMORY_BYTES:
+        raise ValueError(
+            f"Dataset file too large: {file_size / (1024*1024):.1f}MB (limit: {MAX_IN_MEMORY_BYTES // (1024*1024)}MB). "
+            "Use load_dataset_chunks() / iter_csv_chunks() to stream it instead."
+        )
+    
+    df = None
+    if not pandas_kwargs:
+        df = _read_columnar_cache(filepath)
+    source = "columnar cache" if df is not None else "CSV"
+    if df is not None:
+        count_io(bytes_read=os.path.getsize(columnar_cache_path(filepath)), columnar_cache_hits=1)
+    else:
+        # Read one row past the limit so truncation can be detected
+        nrows = max_rows + 1 if max_rows is not None else None
+        df = read_cleaned_csv(filepath, nrows=nrows, **pandas_kwargs)
+        count_io(bytes_read=file_size)
     
-    # Read with row limit
-    df = pd.read_csv(filepath, nrows=max_rows, **pandas_kwargs)
+    if max_rows is not None and len(df) > max_rows:
+        print(f"WARNING: {dataset_key} has more than {max_rows} rows; only the first {max_rows} were loaded. "
+              "Use load_dataset_chunks() to process the whole file.")
+        df = df.head(max_rows)
     
     # Sanitize data to prevent formula injection
-    for col in df.select_dtypes(include=['object']).columns:
-        df[col] = df[col].astype(str).apply(
-            lambda x: x if not str(x).startswith(('=', '+', '-', '@')) else f"'{x}"
-        )
+    if sanitize:
+        df = sanitize_formula_injection(df)
     
-    print(f"✓ Loaded {len(df)} rows from {dataset_key}")
-    return df
+    _dataset_registry[registry_key] = (stamp, df)
+    count_io(rows_read=len(df))
+    print(f"✓ Loaded {len(df)} rows from {dataset_key} ({source})")
+    return _registry_copy(df)
 
-def get_output_path(directory_key, filename):
-    """Get validated output path for saving files"""
-    config = load_path_config()
-    
-    # Handle special case for project root
-    if directory_key == '..':
-        output_dir = config['project_root']
-    elif directory_key not in config['directories']:
-        available = list(config['directories'].keys())
-        raise ValueError(f"Directory key '{directory_key}' not allowed. Available: {available}")
-    else:
-        output_dir = config['directories'][directory_key]
-    
-    # Sanitize filename
-    safe_filename = _sanitize_filename(filename)
+def _registry_copy(df):
+    """Hand out a copy of a registry frame so callers can never modify the cached one"""
+    import pandas as pd
+    # Under pandas copy-on-write a shallow copy is enough: data is only copied when written to
+    major_version = int(pd.__version__.split('.')[0])
+    copy_on_write = major_version >= 3 or pd.get_option('mode.copy_on_write') is True
+    return df.copy(deep=not copy_on_write)
+
+def clear_dataset_registry():
+    """Drop every frame cached by safe_read_csv in this process"""
+    _dataset_registry.clear()
+
+def is_headless():
+    """True when the pipeline runs unattended (master.py --headless or PIPELINE_HEADLESS=1): no dialogs or browser windows"""
+    return os.environ.get('PIPELINE_HEADLESS', '').lower() not in ('', '0', 'false', 'no')
+
+def count_io(**counts):
+    """Add to the data volume counters (rows_read, rows_written, bytes_read, registry_hits, ...)"""
+    for name, value in counts.items():
+        _io_stats[name] = _io_stats.get(name, 0) + value
+
+def reset_io_stats():
+    """Zero the data volume counters (master.py does this before each stage)"""
+    _io_stats.clear()
+
+def get_io_stats():
+    """Copy of the data volume counters since the last reset"""
+    return dict(_io_stats)
+
+def log_enabled(level):
+    """True if messages of this level pass PIPELINE_LOG_LEVEL (DEBUG, INFO, WARNING or ERROR; INFO by default)"""
+    threshold = LOG_LEVELS.get(os.environ.get('PIPELINE_LOG_LEVEL', 'INFO').upper(), LOG_LEVELS['INFO'])
+    return LOG_LEVELS[level] >= threshold
+
+def log(message, level='INFO'):
+    """Print a diagnostic message unless PIPELINE_LOG_LEVEL filters out its level"""
+    if log_enabled(level):
+        print(message)
+
+def use_streaming(dataset_key):
+    """True if a dataset should be processed in chunks rather than loaded whole"""
+    if os.environ.get('PIPELINE_STREAMING', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return os.path.getsize(get_dataset_path(dataset_key)) > MAX_IN_MEMORY_BYTES
+
+def iter_csv_chunks(dataset_key, chunksize=None, sanitize=True):
+    """Yield a CSV dataset in bounded-size chunks (dates parsed, sanitized unless sanitize=False), with no size or row cap"""
+    import pandas as pd
+    filepath = get_dataset_path(dataset_key)
+    if chunksize is None:
+        chunksize = int(os.environ.get('PIPELINE_CHUNK_ROWS', DEFAULT_CHUNK_ROWS))
     
-    # Create directory if needed
-    os.makedirs(output_dir, exist_ok=True)
+    total_rows = 0
+    with pd.read_csv(filepath, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk = parse_date_columns(chunk)
+            if sanitize:
+                chunk = sanitize_formula_injection(chunk)
+            total_rows += len(chunk)
+            yield chunk
+    count_io(rows_read=total_rows, bytes_read=os.path.getsize(filepath))
+    print(f"✓ Streamed {total_rows} rows from {dataset_key} in chunks of {chunksize}")
+
+def load_dataset_chunks(dataset_key, sanitize=True):
+    """Iterate over a dataset as frames: the whole file at once if it is small enough, otherwise in chunks"""
+    if use_streaming(dataset_key):
+        return iter_csv_chunks(dataset_key, sanitize=sanitize)
+    # The size limit already bounds memory, so no row cap is needed here
+    return iter([safe_read_csv(dataset_key, max_rows=None, sanitize=sanitize)])
+
+def aggregate_chunks(chunks, groupings, values=(), prepare=None, dropna=True):
+    """Compute group sizes, sums and counts across chunks, keeping only the running totals in memory.
+
+    groupings maps a result name to the column(s) to group by. Each result frame is
+    indexed by those keys and has a 'rows' column plus '<column>_sum' and
+    '<column>_count' for every column in values, so means are sum / count.
+    prepare, if given, is applied to each chunk first (filtering, derived columns).
+    """
+    import pandas as pd
+    totals = {name: None for name in groupings}
+    for chunk in chunks:
+        if prepare is not None:
+            chunk = prepare(chunk)
+        if chunk.empty:
+            continue
+        for name, keys in groupings.items():
+            grouped = chunk.groupby(keys, sort=False, observed=True, dropna=dropna)
+            partial = grouped.size().to_frame('rows')
+            for col in values:
+                partial[f'{col}_sum'] = grouped[col].sum()
+                partial[f'{col}_count'] = grouped[col].count()
+            totals[name] = partial if totals[name] is None else totals[name].add(partial, fill_value=0)
     
-    output_path = os.path.join(output_dir, safe_filename)
+    columns = ['rows'] + [f'{col}_{stat}' for col in values for stat in ('sum', 'count')]
+    results = {}
+    for name, total in totals.items():
+        if total is None:
+            total = pd.DataFrame(columns=columns)
+        total = total.sort_index()
+        total['rows'] = total['rows'].astype('int64')
+        for col in values:
+            total[f'{col}_count'] = total[f'{col}_count'].astype('int64')
+        results[name] = total
+    return results
+
+def sanitize_formula_injection(df):
+    """Prefix text cells that spreadsheets would treat as formulas with a quote. Missing values are kept."""
+    import numpy as np
+    import pandas as pd
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        # Check each distinct value once and map the result back through the codes
+        codes, uniques = pd.factorize(df[col])
+        if len(uniques) == 0:
+            continue
+        uniques = np.asarray(uniques, dtype=object)
+        flagged = pd.Series(uniques).str.startswith(FORMULA_PREFIXES, na=False).to_numpy(dtype=bool)
+        if not flagged.any():
+            continue
+        prefixed = uniques.copy()
+        prefixed[flagged] = ["'" + value for value in uniques[flagged]]
+        values = prefixed[codes]
+        missing = codes < 0
+        if missing.any():
+            values[missing] = df[col].to_numpy(dtype=object)[missing]
+        df[col] = pd.Series(values, index=df.index, dtype=df[col].dtype)
+    return df
+
+def parse_date_columns(df):
+    """Convert the known date columns to datetime in place"""
+    import pandas as pd
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    return df
+
+def read_cleaned_csv(csv_path, nrows=None, **pandas_kwargs):
+    """Parse a cleaned CSV the way safe_read_csv does without a cache (dates parsed)"""
+    import pandas as pd
+    return parse_date_columns(pd.read_csv(csv_path, nrows=nrows, **pandas_kwargs))
+
+def columnar_cache_path(csv_path):
+    """Path of the columnar cache file kept next to a cleaned CSV"""
+    return os.path.splitext(csv_path)[0] + COLUMNAR_CACHE_EXTENSION
+
+def _columnar_cache_supported():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _source_stamp(csv_path):
+    """Size and modification time of a CSV, as recorded in the metadata of its columnar cache"""
+    stat = os.stat(csv_path)
+    return json.dumps({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}, sort_keys=True).encode()
+
+def write_columnar_cache(csv_path):
+    """Write a typed Parquet copy of a cleaned CSV, with dates parsed. Returns its path or None.
+
+    The copy is made from the CSV as read_cleaned_csv() parses it, not from the frame the
+    CSV was written from, so a cache hit returns the same dtypes as a cache miss. The
+    CSV's size and modification time are stored with it and must match for it to be used.
+    """
+    cache_path = columnar_cache_path(csv_path)
+    if not _columnar_cache_supported():
+        return None
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        # Stamped before reading, so a CSV changed mid-read leaves a cache that never matches
+        stamp = _source_stamp(csv_path)
+        table = pa.Table.from_pandas(read_cleaned_csv(csv_path), preserve_index=False)
+        metadata = {**(table.schema.metadata or {}), COLUMNAR_CACHE_STAMP_KEY: stamp}
+        pq.write_table(table.replace_schema_metadata(metadata), cache_path)
+    except Exception as e:
+        # A stale cache must never shadow the CSV it was made from
+        print(f"Warning: could not write columnar cache {cache_path}: {e}")
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        return None
+    return cache_path
+
+def _read_columnar_cache(csv_path):
+    """Read the columnar cache for a CSV if it exists and was made from the CSV as it is now"""
+    import pandas as pd
+    cache_path = columnar_cache_path(csv_path)
+    if not os.path.exists(cache_path) or not _columnar_cache_supported():
+        return None
+    try:
+        import pyarrow.parquet as pq
+        # Only the footer is read here; a replaced CSV is caught even if its mtime went backwards
+        metadata = pq.read_schema(cache_path).metadata or {}
+        if metadata.get(COLUMNAR_CACHE_STAMP_KEY) != _source_stamp(csv_path):
+            return None
+        df = pd.read_parquet(cache_path)
+    except Exception as e:
+        print(f"Warning: ignoring unreadable columnar cache {cache_path}: {e}")
+        return None
+    return df
+
+def get_directory(directory_key):
+    """Validated absolute path of a project directory ('..' for the project root), created if needed"""
+    directories = _config_directories()
+    if directory_key not in directories:
+        available = [key for key in directories if key != '..']
+        raise ValueError(f"Directory key '{directory_key}' not allowed. Available: {available}")
     
-    # Security check
-    abs_output_path = os.path.abspath(output_path)
-    abs_output_dir = os.path.abspath(output_dir)
-    if not abs_output_path.startswith(abs_output_dir):
-        raise ValueError("Security violation: output path outside intended directory")
-        
-    return abs_output_path
+    directory = directories[directory_key]
+    if directory not in _config_cache['created']:
+        os.makedirs(directory, exist_ok=True)
+        _config_cache['created'].add(directory)
+    return directory
+
+def get_output_path(directory_key, filename):
+    """Get validated output path for saving files"""
+    # The directory was checked once when the config was loaded, and a sanitized
+    # filename is a single path component, so the result cannot leave the directory
+    return os.path.join(get_directory(directory_key), _sanitize_filename(filename))
+
+def calculate_sha256(filepath):
+    """Calculates the SHA256 checksum of a file."""
+    sha256_hash = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        # Read and update hash string value in blocks of 64K
+        for byte_block in iter(lambda: f.read(65536), b""):
+            sha256_hash.update(byte_block)
+    return sha256_hash.hexdigest()
 
 def _sanitize_filename(filename):
     """Sanitize filename to prevent security issues"""
-    import re
     # Remove/replace dangerous characters
     sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
     # Remove path traversal attempts
@@ -103,6 +384,117 @@ def _sanitize_filename(filename):
         sanitized = 'unnamed_file'
     return sanitized
 
+class PathManager:
+    """Centralized and validated path management for the project"""
+    
+    def __init__(self, project_root):
+        self.project_root = os.path.realpath(project_root)
+        self._validate_project_structure()
+        
+        # Define allowed dataset files
+        self.allowed_datasets = {
+            'instagram_analytics_excel': 'Copy of Instagram_Analytics - DO NOT DELETE (for interview purposes).xlsx',
+            'instagram_age_gender': 'Instagram Age Gender Demographi.csv',
+            'instagram_post_engagement': 'Instagram Post Engagement.csv', 
+            'instagram_profile_overview': 'Instagram Profile Overview.csv',
+            'instagram_top_cities': 'Instagram Top Cities Regions.csv'
+        }
+        
+        # Define project directories, resolved to real paths once so later checks compare real paths
+        self.directories = {
+            'dataset': os.path.join(self.project_root, 'dataset'),
+            'scripts': os.path.join(self.project_root, 'scripts'),
+            'graphs': os.path.join(self.project_root, 'graphs'),
+            'log': os.path.join(self.project_root, 'log')
+        }
+        for key, directory in self.directories.items():
+            directory = os.path.realpath(directory)
+            if not is_within(directory, self.project_root):
+                raise ValueError(f"Security violation: {key} directory {directory} is outside the project")
+            self.directories[key] = directory
+        
+    def _validate_project_structure(self):
+        """Validate that we're in the correct project directory"""
+        required_items = ['dataset', 'scripts']
+        for item in required_items:
+            item_path = os.path.join(self.project_root, item)
+            if not os.path.exists(item_path):
+                raise ValueError(f"Invalid project structure: missing {item} directory")
+                
+    def get_dataset_path(self, dataset_key):
+        """Get validated path to a dataset file"""
+        if dataset_key not in self.allowed_datasets:
+            raise ValueError(f"Dataset key '{dataset_key}' not allowed. Valid keys: {list(self.allowed_datasets.keys())}")
+            
+        filename = self.allowed_datasets[dataset_key]
+        filepath = os.path.join(self.directories['dataset'], filename)
+        
+        # Validate the file exists and is within dataset directory
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Dataset file not found: {filepath}")
+            
+        # Security check: ensure file (after following links) is actually in dataset directory
+        real_filepath = os.path.realpath(filepath)
+        if not is_within(real_filepath, self.directories['dataset']):
+            raise ValueError(f"Security violation: file outside dataset directory")
+            
+        return real_filepath
+        
+    def get_output_path(self, directory_key, filename):
+        """Get validated output path for graphs, logs, etc."""
+        if directory_key not in self.directories:
+            raise ValueError(f"Directory key '{directory_key}' not allowed")
+            
+        output_dir = self.directories[directory_key]
+        os.makedirs(output_dir, exist_ok=True)
+        # A sanitized filename is a single path component, so it stays inside output_dir
+        return os.path.join(output_dir, _sanitize_filename(filename))
+        
+    def resolve_stage_file(self, reference):
+        """Resolve a pipeline file reference ('dataset:<dataset key>' or '<directory key>:<filename>')"""
+        directory_key, _, name = reference.partition(':')
+        if directory_key == 'dataset' and name in self.allowed_datasets:
+            return os.path.join(self.directories['dataset'], self.allowed_datasets[name])
+        if directory_key == 'root':
+            return os.path.join(self.project_root, _sanitize_filename(name))
+        if directory_key not in self.directories:
+            raise ValueError(f"Directory key '{directory_key}' not allowed in stage file '{reference}'")
+        return os.path.join(self.directories[directory_key], _sanitize_filename(name))
+        
+    def resolve_stage_files(self, reference):
+        """Resolve a pipeline file reference to a list of paths. A '*' in the file name matches
+        versioned files (e.g. 'root:dashboard_data.*.js'); with no match the pattern itself is
+        returned, so the file counts as missing."""
+        directory_key, _, name = reference.partition(':')
+        if '*' not in name:
+            return [self.resolve_stage_file(reference)]
+        directory = os.path.dirname(self.resolve_stage_file(f"{directory_key}:unnamed_file"))
+        pattern = os.path.join(directory, '*'.join(_sanitize_filename(part) if part else '' for part in name.split('*')))
+        return sorted(glob.glob(pattern)) or [pattern]
+        
+    def list_available_datasets(self):
+        """List all available dataset keys and their descriptions"""
+        return {
+            key: {
+                'filename': filename,
+                'exists': os.path.exists(os.path.join(self.directories['dataset'], filename))
+            }
+            for key, filename in self.allowed_datasets.items()
+        }
+        
+    def export_paths_config(self):
+        """Export path configuration for use by other scripts"""
+        config = {
+            'project_root': self.project_root,
+            'datasets': {key: self.get_dataset_path(key) for key in self.allowed_datasets if os.path.exists(os.path.join(self.directories['dataset'], self.allowed_datasets[key]))},
+            'directories': self.directories
+        }
+        
+        config_path = os.path.join(self.project_root, 'path_config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2)
+        return config_path
+
 # Dataset key constants for easy reference
 DATASET_KEYS = {
     'INSTAGRAM_ANALYTICS_EXCEL': 'instagram_analytics_excel',
@@ -112,9 +504,30 @@ DATASET_KEYS = {
     'INSTAGRAM_TOP_CITIES': 'instagram_top_cities'
 }
 
+# Diagnostic message levels for log() (PIPELINE_LOG_LEVEL picks the lowest one shown)
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+# Files larger than this are streamed in chunks instead of being loaded whole
+MAX_IN_MEMORY_BYTES = 50 * 1024 * 1024
+
+# Rows per chunk when streaming a dataset (override with PIPELINE_CHUNK_ROWS)
+DEFAULT_CHUNK_ROWS = 100000
+
+# Leading characters that make spreadsheet applications evaluate a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@')
+
+# Columns parsed as dates when a dataset is loaded
+DATE_COLUMNS = ['Date']
+
+# Extension of the typed columnar cache clean.py writes next to each CSV (needs pyarrow)
+COLUMNAR_CACHE_EXTENSION = '.parquet'
+# Parquet schema metadata key holding the size and mtime of the CSV the cache was made from
+COLUMNAR_CACHE_STAMP_KEY = b'pipeline.source_stamp'
+
 # Directory key constants
 DIRECTORY_KEYS = {
     'GRAPHS': 'graphs',
     'LOG': 'log',
-    'DATASET': 'dataset'
+    'DATASET': 'dataset',
+    'ROOT': '..'
 }
\ No newline at end of file
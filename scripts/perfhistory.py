@@ -0,0 +1,167 @@
+"""
+Performance history report built from the run records master.py writes to log/run_*.jsonl.
+Shows per-stage duration percentiles and memory peaks over time, and flags runs where a
+stage was much slower than its rolling baseline. Run it with `python master.py --perf-report`
+or directly with `python scripts/perfhistory.py`.
+"""
+
+import sys
+import os
+import json
+import glob
+import argparse
+
+# Add scripts directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from path_utils import get_directory, get_output_path, is_headless, DIRECTORY_KEYS
+
+# Number of earlier successful runs of a stage that form its baseline
+BASELINE_RUNS = 10
+# Fewest earlier runs needed before a stage can be flagged
+MIN_BASELINE_RUNS = 3
+# A run is flagged when it takes this many times its baseline (median) duration...
+SLOWDOWN_FACTOR = 1.5
+# ...and at least this many seconds longer, so tiny stages don't trip on noise
+MIN_SLOWDOWN_SECONDS = 0.5
+
+REPORT_FILENAME = 'performance_history.html'
+
+def load_stage_records(log_dir):
+    """Stage records of every run in log_dir as a DataFrame ordered by time (unreadable lines are skipped)"""
+    import pandas as pd
+
+    records = []
+    for record_path in sorted(glob.glob(os.path.join(log_dir, 'run_*.jsonl'))):
+        with open(record_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('type') == 'stage':
+                    records.append(record)
+
+    if not records:
+        return pd.DataFrame()
+    df = pd.DataFrame(records)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+    return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+def flag_slowdowns(df):
+    """Add baseline_seconds (median of the previous BASELINE_RUNS runs) and slowdown columns to the executed runs"""
+    executed = df[df['status'] == 'ok'].copy()
+    executed['baseline_seconds'] = (
+        executed.groupby('stage')['wall_seconds']
+        .transform(lambda durations: durations.shift(1).rolling(BASELINE_RUNS, min_periods=MIN_BASELINE_RUNS).median())
+    )
+    executed['slowdown'] = (
+        (executed['wall_seconds'] > executed['baseline_seconds'] * SLOWDOWN_FACTOR)
+        & (executed['wall_seconds'] - executed['baseline_seconds'] >= MIN_SLOWDOWN_SECONDS)
+    )
+    return executed
+
+def summarize_stages(executed):
+    """Per-stage duration percentiles, memory peak and latest-run status"""
+    grouped = executed.groupby('stage')
+    summary = grouped['wall_seconds'].quantile([0.5, 0.9, 0.95]).unstack()
+    summary.columns = ['p50_seconds', 'p90_seconds', 'p95_seconds']
+    summary['runs'] = grouped.size()
+    summary['peak_rss_mb'] = grouped['peak_rss_mb'].max()
+    latest = grouped.tail(1).set_index('stage')
+    summary['latest_seconds'] = latest['wall_seconds']
+    summary['latest_baseline_seconds'] = latest['baseline_seconds']
+    summary['latest_slowdown'] = latest['slowdown']
+    summary['slowdowns'] = grouped['slowdown'].sum().astype(int)
+    return summary.reset_index()
+
+def build_figures(executed, summary):
+    """Plotly figures: duration trend (slow runs marked), peak memory trend and the summary table"""
+    import plotly.graph_objects as go
+
+    duration = go.Figure()
+    memory = go.Figure()
+    for stage, runs in executed.groupby('stage'):
+        duration.add_trace(go.Scatter(x=runs['timestamp'], y=runs['wall_seconds'], mode='lines+markers', name=stage))
+        memory.add_trace(go.Scatter(x=runs['timestamp'], y=runs['peak_rss_mb'], mode='lines+markers', name=stage))
+    slow = executed[executed['slowdown']]
+    if not slow.empty:
+        duration.add_trace(go.Scatter(
+            x=slow['timestamp'], y=slow['wall_seconds'], mode='markers', name='Slowdown',
+            marker=dict(color='red', size=12, symbol='x'), text=slow['stage'],
+            hovertemplate='%{text}: %{y:.2f}s<extra>Slowdown</extra>',
+        ))
+    duration.update_layout(title='Stage duration per run', xaxis_title='Run', yaxis_title='Wall time (s)')
+    memory.update_layout(title='Peak memory per run', xaxis_title='Run', yaxis_title='Peak RSS (MB)')
+
+    table = go.Figure(go.Table(
+        header=dict(values=['Stage', 'Runs', 'p50 (s)', 'p90 (s)', 'p95 (s)', 'Peak RSS (MB)', 'Latest (s)', 'Baseline (s)', 'Slowdowns']),
+        cells=dict(values=[
+            summary['stage'], summary['runs'],
+            summary['p50_seconds'].round(2), summary['p90_seconds'].round(2), summary['p95_seconds'].round(2),
+            summary['peak_rss_mb'].round(1), summary['latest_seconds'].round(2),
+            summary['latest_baseline_seconds'].round(2).fillna('-'), summary['slowdowns'],
+        ]),
+    ))
+    table.update_layout(title='Per-stage summary')
+    return [table, duration, memory]
+
+def write_report(figures, output_path, run_count):
+    """Write the figures into one standalone HTML page (plotly.js is embedded so it works offline)"""
+    import plotly.io as pio
+
+    sections = [
+        pio.to_html(figure, full_html=False, include_plotlyjs=(index == 0))
+        for index, figure in enumerate(figures)
+    ]
+    html = (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        "<title>Pipeline performance history</title>\n</head>\n<body>\n"
+        f"<h1>Pipeline performance history</h1>\n<p>{run_count} runs. A run is flagged as a slowdown when a stage took "
+        f"more than {SLOWDOWN_FACTOR}x (and {MIN_SLOWDOWN_SECONDS}s over) the median of its previous {BASELINE_RUNS} runs.</p>\n"
+        + "\n".join(sections)
+        + "\n</body>\n</html>\n"
+    )
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return output_path
+
+def generate_performance_report(log_dir=None, output_path=None):
+    """Build the performance history report. Returns its path, or None if there are no run records."""
+    if log_dir is None:
+        log_dir = get_directory(DIRECTORY_KEYS['LOG'])
+    df = load_stage_records(log_dir)
+    if df.empty:
+        print(f"No run records found in {log_dir}; run master.py first.")
+        return None
+
+    executed = flag_slowdowns(df)
+    if executed.empty:
+        print("No stage has run successfully yet (every record was skipped or failed).")
+        return None
+    summary = summarize_stages(executed)
+
+    print("=== PERFORMANCE HISTORY ===")
+    print(summary[['stage', 'runs', 'p50_seconds', 'p95_seconds', 'peak_rss_mb', 'latest_seconds', 'slowdowns']].round(2).to_string(index=False))
+    for _, row in summary[summary['latest_slowdown'].astype(bool)].iterrows():
+        print(f"WARNING: {row['stage']} took {row['latest_seconds']:.2f}s in the latest run "
+              f"(baseline {row['latest_baseline_seconds']:.2f}s)")
+
+    if output_path is None:
+        output_path = get_output_path(DIRECTORY_KEYS['LOG'], REPORT_FILENAME)
+    write_report(build_figures(executed, summary), output_path, df['run_id'].nunique())
+    print(f"✓ Performance history report saved to: {output_path}")
+    return output_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the pipeline performance history report from log/run_*.jsonl.")
+    parser.add_argument('--log-dir', help="directory holding the run records (default: the project's log directory)")
+    parser.add_argument('--output', help=f"HTML file to write (default: log/{REPORT_FILENAME})")
+    args = parser.parse_args()
+
+    report_path = generate_performance_report(args.log_dir, args.output)
+    if report_path and not is_headless():
+        import webbrowser
+        webbrowser.open_new_tab('file://' + os.path.abspath(report_path))
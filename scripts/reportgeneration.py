@@ -10,7 +10,7 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from path_utils import get_output_path, DIRECTORY_KEYS
+from path_utils import get_directory, is_headless, DIRECTORY_KEYS
 
 def create_report_qmd():
     # Collect required system and project information
@@ -22,8 +22,7 @@ def create_report_qmd():
     # Check if graphs directory exists using path_utils
     try:
         # This will create the graphs directory if it doesn't exist and validate the path
-        graphs_dir = get_output_path(DIRECTORY_KEYS['GRAPHS'], '')
-        graphs_dir = os.path.dirname(graphs_dir)  # Remove empty filename part
+        graphs_dir = get_directory(DIRECTORY_KEYS['GRAPHS'])
         
         # Check if any graph files exist
         graph_files = ['graph1.png', 'graph2_monthly.png', 'graph3.png', 'graph4_female.png', 'graph4_male.png', 'graph4_undefined.png']
@@ -294,13 +293,20 @@ if __name__ == "__main__":
         
         # Inject dark/light mode buttons
         if inject_mode_buttons(report_html_path):
-            # Open the modified report in the default web browser
-            webbrowser.open_new_tab('file://' + os.path.abspath(report_html_path))
-            print("✓ Report opened in browser.")
+            if is_headless():
+                print("Headless mode: not opening the report in a browser")
+            else:
+                # Open the modified report in the default web browser
+                webbrowser.open_new_tab('file://' + os.path.abspath(report_html_path))
+                print("✓ Report opened in browser.")
         else:
             print("Warning: Mode buttons injection failed, but report was generated.")
-            webbrowser.open_new_tab('file://' + os.path.abspath(report_html_path))
+            if not is_headless():
+                webbrowser.open_new_tab('file://' + os.path.abspath(report_html_path))
             
+    except ModuleNotFoundError:
+        # Let master.py see the missing module and offer to install it
+        raise
     except Exception as e:
         print(f"Error in report generation process: {e}")
         import traceback
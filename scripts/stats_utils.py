@@ -0,0 +1,70 @@
+"""
+Statistics helpers for the analysis scripts.
+Implements the tests the pipeline used to run through R, with the same defaults as R.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+def welch_t_test(counts_x, means_x, variances_x, counts_y, means_y, variances_y):
+    """Two-sided Welch two-sample t-tests of x against y from summary statistics.
+
+    Matches R's t.test(x, y) defaults (var.equal = FALSE, mu = 0). Every argument may be
+    an array, in which case one test is computed per element in a single pass.
+    Returns (t_stat, df, p_value) arrays; tests without a defined result are NaN.
+    """
+    counts_x = np.asarray(counts_x, dtype=float)
+    counts_y = np.asarray(counts_y, dtype=float)
+    se_x = np.asarray(variances_x, dtype=float) / counts_x
+    se_y = np.asarray(variances_y, dtype=float) / counts_y
+    se = se_x + se_y
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = (np.asarray(means_x, dtype=float) - np.asarray(means_y, dtype=float)) / np.sqrt(se)
+        # Welch-Satterthwaite degrees of freedom
+        df = se ** 2 / (se_x ** 2 / (counts_x - 1) + se_y ** 2 / (counts_y - 1))
+
+    # R refuses constant data; report no result rather than an infinite statistic
+    undefined = ~np.isfinite(t_stat) | ~np.isfinite(df) | (se <= 0)
+    t_stat = np.where(undefined, np.nan, t_stat)
+    df = np.where(undefined, np.nan, df)
+    p_value = 2 * stats.t.sf(np.abs(t_stat), df)
+    return t_stat, df, p_value
+
+def consecutive_welch_t_tests(values, groups):
+    """Welch t-test of every group against the group before it (in sorted order).
+
+    Equivalent to calling R's t.test(current, previous) for each consecutive pair of
+    groups, but computed from per-group summary statistics in one vectorized pass.
+    values and groups are Series sharing the same index. Returns a DataFrame indexed
+    by group (from the second group on) with the columns n_previous, n_current,
+    change, t_stat, df and p_value.
+    """
+    summary = values.astype(float).groupby(groups).agg(['count', 'mean', 'var']).sort_index()
+    previous = summary.shift(1).iloc[1:]
+    current = summary.iloc[1:]
+
+    t_stat, df, p_value = welch_t_test(
+        current['count'], current['mean'], current['var'],
+        previous['count'], previous['mean'], previous['var'],
+    )
+
+    # R needs at least two observations in each sample
+    testable = ((current['count'] >= 2) & (previous['count'] >= 2)).to_numpy()
+    return pd.DataFrame({
+        'n_previous': previous['count'].astype(int),
+        'n_current': current['count'].astype(int),
+        'change': current['mean'] - previous['mean'],
+        't_stat': np.where(testable, t_stat, np.nan),
+        'df': np.where(testable, df, np.nan),
+        'p_value': np.where(testable, p_value, np.nan),
+    }, index=current.index)
+
+def r_t_test(x, y):
+    """Run R's t.test(x, y) through rpy2 and return (t_stat, df, p_value). Used for cross-checks."""
+    import rpy2.robjects as ro
+    from rpy2.robjects.vectors import FloatVector
+
+    result = ro.r['t.test'](FloatVector(list(x)), FloatVector(list(y)))
+    return result.rx2('statistic')[0], result.rx2('parameter')[0], result.rx2('p.value')[0]
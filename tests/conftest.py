@@ -0,0 +1,8 @@
+import os
+import sys
+
+# master.py lives in the project root and the stage helpers in scripts/
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (project_root, os.path.join(project_root, 'scripts')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from path_utils import aggregate_chunks
+
+
+def make_frame(rows=1000):
+    rng = np.random.default_rng(3)
+    reach = rng.integers(0, 500, rows).astype(float)
+    reach[rng.random(rows) < 0.1] = np.nan
+    return pd.DataFrame({
+        'Media product type': rng.choice(['FEED', 'REELS', 'STORY'], rows),
+        'Month': rng.choice(['2024-01', '2024-02', '2024-03'], rows),
+        'Reach': reach,
+    })
+
+
+def chunked(frame, size):
+    return (frame.iloc[start:start + size] for start in range(0, len(frame), size))
+
+
+def test_chunked_totals_match_a_full_load():
+    frame = make_frame()
+    groupings = {'by_type': 'Media product type', 'by_type_month': ['Media product type', 'Month']}
+    streamed = aggregate_chunks(chunked(frame, 77), groupings, values=['Reach'])
+    whole = aggregate_chunks([frame], groupings, values=['Reach'])
+    for name in groupings:
+        pd.testing.assert_frame_equal(streamed[name], whole[name])
+
+
+def test_totals_match_pandas_groupby():
+    frame = make_frame()
+    result = aggregate_chunks(chunked(frame, 100), {'by_type': 'Media product type'}, values=['Reach'])['by_type']
+    expected = frame.groupby('Media product type')['Reach'].agg(['size', 'sum', 'count'])
+    assert result['rows'].tolist() == expected['size'].tolist()
+    assert np.allclose(result['Reach_sum'], expected['sum'])
+    assert result['Reach_count'].tolist() == expected['count'].tolist()
+    # Means are sum / count, as in a full load
+    assert np.allclose(result['Reach_sum'] / result['Reach_count'], frame.groupby('Media product type')['Reach'].mean())
+
+
+def test_groups_seen_in_only_some_chunks_are_kept():
+    first = pd.DataFrame({'kind': ['a', 'a'], 'value': [1, 2]})
+    second = pd.DataFrame({'kind': ['b'], 'value': [5]})
+    result = aggregate_chunks([first, second], {'by_kind': 'kind'}, values=['value'])['by_kind']
+    assert result.index.tolist() == ['a', 'b']
+    assert result['rows'].tolist() == [2, 1]
+    assert result['value_sum'].tolist() == [3, 5]
+
+
+def test_prepare_filters_and_empty_input():
+    frame = make_frame()
+    result = aggregate_chunks(
+        chunked(frame, 64), {'by_type': 'Media product type'}, values=['Reach'],
+        prepare=lambda chunk: chunk[chunk['Month'] == '2024-02'],
+    )['by_type']
+    expected = frame[frame['Month'] == '2024-02'].groupby('Media product type').size()
+    assert result['rows'].tolist() == expected.tolist()
+
+    empty = aggregate_chunks([], {'by_type': 'Media product type'}, values=['Reach'])['by_type']
+    assert empty.empty
+    assert list(empty.columns) == ['rows', 'Reach_sum', 'Reach_count']
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+import master
+from path_utils import PathManager
+
+
+@pytest.fixture
+def stage_files(tmp_path):
+    """One input and one output file of a stage, with a manifest that recorded a run of it"""
+    source = tmp_path / 'input.csv'
+    target = tmp_path / 'output.png'
+    source.write_text('a,b\n1,2\n')
+    target.write_text('chart')
+    manifest = master.BuildManifest(str(tmp_path / master.MANIFEST_FILENAME))
+    manifest.record('stage.py', [str(source)], [str(target)])
+    return manifest, source, target
+
+
+def test_unchanged_stage_is_up_to_date(stage_files):
+    manifest, source, target = stage_files
+    assert manifest.is_up_to_date('stage.py', [str(source)], [str(target)])
+
+
+def test_unknown_stage_is_not_up_to_date(stage_files):
+    manifest, source, target = stage_files
+    assert not manifest.is_up_to_date('other.py', [str(source)], [str(target)])
+
+
+def test_changed_input_invalidates(stage_files):
+    manifest, source, target = stage_files
+    source.write_text('a,b\n1,2\n3,4\n')
+    assert not manifest.is_up_to_date('stage.py', [str(source)], [str(target)])
+
+
+def test_added_input_invalidates(stage_files, tmp_path):
+    manifest, source, target = stage_files
+    helper = tmp_path / 'helper.py'
+    helper.write_text('x = 1\n')
+    assert not manifest.is_up_to_date('stage.py', [str(source), str(helper)], [str(target)])
+
+
+def test_changed_or_missing_output_invalidates(stage_files):
+    manifest, source, target = stage_files
+    target.write_text('edited chart')
+    assert not manifest.is_up_to_date('stage.py', [str(source)], [str(target)])
+    target.unlink()
+    assert not manifest.is_up_to_date('stage.py', [str(source)], [str(target)])
+
+
+def test_output_missing_at_record_time_never_counts_as_up_to_date(tmp_path):
+    source = tmp_path / 'input.csv'
+    source.write_text('a\n1\n')
+    missing = str(tmp_path / 'never_written.png')
+    manifest = master.BuildManifest(str(tmp_path / master.MANIFEST_FILENAME))
+    manifest.record('stage.py', [str(source)], [missing])
+    assert not manifest.is_up_to_date('stage.py', [str(source)], [missing])
+
+
+def test_forget_and_reload(stage_files, tmp_path):
+    manifest, source, target = stage_files
+    manifest.save()
+    reloaded = master.BuildManifest(manifest.manifest_path)
+    assert reloaded.is_up_to_date('stage.py', [str(source)], [str(target)])
+    reloaded.forget('stage.py')
+    assert not reloaded.is_up_to_date('stage.py', [str(source)], [str(target)])
+
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    manifest_path = tmp_path / master.MANIFEST_FILENAME
+    manifest_path.write_text('{not json')
+    assert master.BuildManifest(str(manifest_path)).entries == {}
+
+
+def test_versioned_stage_files_are_matched_by_pattern(tmp_path):
+    for directory in ('dataset', 'scripts'):
+        (tmp_path / directory).mkdir()
+    path_manager = PathManager(str(tmp_path))
+    pattern = os.path.join(path_manager.project_root, 'dashboard_data.*.js')
+    assert path_manager.resolve_stage_files('root:dashboard_data.*.js') == [pattern]
+
+    (tmp_path / 'dashboard_data.0123456789ab.js').write_text('')
+    assert path_manager.resolve_stage_files('root:dashboard_data.*.js') == [
+        os.path.join(path_manager.project_root, 'dashboard_data.0123456789ab.js')
+    ]
+    assert path_manager.resolve_stage_files('root:dashboard.html') == [
+        os.path.join(path_manager.project_root, 'dashboard.html')
+    ]
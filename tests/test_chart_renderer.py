@@ -0,0 +1,55 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+import path_utils
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(path_utils.__file__))
+
+# An analysis script as master.py runs it: under runpy as __main__, with no main guard
+STAGE_SCRIPT = '''
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from chart_renderer import render_charts
+
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'runs.txt'), 'a') as f:
+    f.write('run\\n')
+render_charts([
+    {'filename': f'chart_{index}.png', 'kind': 'line', 'series': [{'x': [0, 1], 'y': [index, 1]}]}
+    for index in range(3)
+], max_workers=2)
+'''
+
+RUNNER = '''
+import multiprocessing
+import runpy
+import sys
+multiprocessing.set_start_method(sys.argv[1])
+runpy.run_path(sys.argv[2], run_name="__main__")
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+    pytest.importorskip('matplotlib')
+    shutil.copytree(SCRIPTS_DIR, tmp_path / 'scripts', ignore=shutil.ignore_patterns('__pycache__'))
+    (tmp_path / 'dataset').mkdir()
+    path_utils.PathManager(str(tmp_path)).export_paths_config()
+    (tmp_path / 'scripts' / 'plot_stage.py').write_text(STAGE_SCRIPT)
+    return tmp_path
+
+
+@pytest.mark.parametrize('start_method', ['spawn', 'fork'])
+def test_pool_renders_each_chart_without_rerunning_the_script(project, start_method):
+    if start_method not in __import__('multiprocessing').get_all_start_methods():
+        pytest.skip(f'{start_method} is not available on this platform')
+    subprocess.run(
+        [sys.executable, '-c', RUNNER, start_method, str(project / 'scripts' / 'plot_stage.py')],
+        check=True, timeout=120,
+    )
+    assert (project / 'scripts' / 'runs.txt').read_text() == 'run\n'
+    assert sorted(path.name for path in (project / 'graphs').glob('*.png')) == ['chart_0.png', 'chart_1.png', 'chart_2.png']
@@ -0,0 +1,41 @@
+import pandas as pd
+
+import clean
+
+
+def test_only_allowlisted_sheets_are_parsed_with_every_column(tmp_path):
+    workbook = str(tmp_path / 'analytics.xlsx')
+    with pd.ExcelWriter(workbook) as writer:
+        pd.DataFrame({'Media ID': [1, 2], 'Reach': [10, 20]}).to_excel(writer, sheet_name='Instagram Post Engagement', index=False)
+        pd.DataFrame({'Query': ['q']}).to_excel(writer, sheet_name='SupermetricsQueries', index=False)
+
+    sheets = clean.load_excel_sheets(workbook, sheets=clean.SHEET_ALLOWLIST)
+    assert list(sheets) == ['Instagram Post Engagement']
+    # Dropped columns are only removed after deduplication
+    assert list(sheets['Instagram Post Engagement'].columns) == ['Media ID', 'Reach']
+
+
+def test_rows_differing_only_in_a_dropped_column_are_kept():
+    sheet = 'Instagram Post Engagement'
+    df = pd.DataFrame({'Media ID': [1, 2, 2], 'Reach': [10, 10, 10]})
+    deduplicated = clean.remove_sheet_duplicates(sheet, df)
+    cleaned = clean.drop_unused_columns(sheet, deduplicated, clean.DROPPED_COLUMNS[sheet])
+    assert list(cleaned.columns) == ['Reach']
+    assert len(cleaned) == 2
+
+
+def test_drop_unused_columns_ignores_missing_columns():
+    df = pd.DataFrame({'Reach': [1]})
+    pd.testing.assert_frame_equal(clean.drop_unused_columns('Sheet', df, ['City']), df)
+
+
+def test_exported_sheets_are_sanitized(tmp_path):
+    output_path = str(tmp_path / 'Instagram Post Engagement.csv')
+    df = pd.DataFrame({'Caption': ['=HYPERLINK("x")', 'plain', '@handle'], 'Reach': [-1, 2, 3]})
+    clean.export_sheet(df, output_path)
+
+    exported = pd.read_csv(output_path)
+    assert exported['Caption'].tolist() == ["'=HYPERLINK(\"x\")", 'plain', "'@handle"]
+    assert exported['Reach'].tolist() == [-1, 2, 3]
+    # The frame kept in memory is left as it was
+    assert df['Caption'].iloc[0] == '=HYPERLINK("x")'
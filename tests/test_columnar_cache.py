@@ -0,0 +1,54 @@
+import os
+
+import pandas as pd
+import pytest
+
+import path_utils
+
+pytest.importorskip('pyarrow')
+
+
+def test_cache_hit_matches_cache_miss(tmp_path):
+    csv_path = str(tmp_path / 'Instagram Post Engagement.csv')
+    # What clean.py exports: string IDs with leading zeros, a mixed column and a date column
+    pd.DataFrame({
+        'Post ID': ['007', '010', '123'],
+        'Mixed': ['1', 'two', None],
+        'Date': ['2024-01-01', '2024-01-08', 'not a date'],
+        'Reach': [10, 20, 30],
+    }).to_csv(csv_path, index=False)
+
+    cache_path = path_utils.write_columnar_cache(csv_path)
+    assert cache_path and os.path.exists(cache_path)
+
+    miss = path_utils.read_cleaned_csv(csv_path)
+    hit = path_utils._read_columnar_cache(csv_path)
+    pd.testing.assert_frame_equal(hit, miss)
+
+
+def test_cache_for_a_rewritten_csv_is_ignored(tmp_path):
+    csv_path = str(tmp_path / 'data.csv')
+    pd.DataFrame({'Reach': [1, 2]}).to_csv(csv_path, index=False)
+    path_utils.write_columnar_cache(csv_path)
+    pd.DataFrame({'Reach': [1, 2, 3]}).to_csv(csv_path, index=False)
+    assert path_utils._read_columnar_cache(csv_path) is None
+
+
+def test_cache_for_a_csv_replaced_by_an_older_file_is_ignored(tmp_path):
+    csv_path = str(tmp_path / 'data.csv')
+    pd.DataFrame({'Reach': [1, 2]}).to_csv(csv_path, index=False)
+    path_utils.write_columnar_cache(csv_path)
+
+    # e.g. restored from a backup or copied with its timestamps kept: same size, older mtime
+    replacement = str(tmp_path / 'backup.csv')
+    pd.DataFrame({'Reach': [7, 8]}).to_csv(replacement, index=False)
+    os.utime(replacement, (0, 0))
+    os.replace(replacement, csv_path)
+    assert path_utils._read_columnar_cache(csv_path) is None
+
+
+def test_cache_without_a_source_stamp_is_ignored(tmp_path):
+    csv_path = str(tmp_path / 'data.csv')
+    pd.DataFrame({'Reach': [1, 2]}).to_csv(csv_path, index=False)
+    pd.read_csv(csv_path).to_parquet(path_utils.columnar_cache_path(csv_path), index=False)
+    assert path_utils._read_columnar_cache(csv_path) is None
@@ -0,0 +1,86 @@
+import base64
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import dashboardgeneration
+
+
+def decode_column(column):
+    """Python counterpart of decodeColumn() in dashboard_script.js"""
+    dtype = {'int8': '<i1', 'int16': '<i2', 'int32': '<i4', 'float64': '<f8'}[column['type']]
+    return np.frombuffer(base64.b64decode(column['data']), dtype=dtype)
+
+
+@pytest.mark.parametrize('values, type_name', [
+    ([0, -128, 127], 'int8'),
+    ([0, 128, -300], 'int16'),
+    ([70000, -1], 'int32'),
+    ([2 ** 31], 'float64'),
+    ([0.5, 2.0], 'float64'),
+    ([1.0, np.nan], 'float64'),
+    ([], 'int8'),
+])
+def test_encode_column_round_trip(values, type_name):
+    encoded = dashboardgeneration.encode_column(values)
+    assert encoded['type'] == type_name
+    np.testing.assert_array_equal(decode_column(encoded), np.asarray(values, dtype='float64'))
+
+
+@pytest.fixture
+def profile_overview():
+    rng = np.random.default_rng(5)
+    dates = pd.date_range('2024-01-20', '2024-03-10', freq='D')
+    df = pd.DataFrame({
+        'Date': dates,
+        'Reach': rng.integers(0, 1000, len(dates)),
+        'Profile visits': rng.integers(0, 50, len(dates)).astype(float) / 2,
+    })
+    df['MonthYear'] = df['Date'].dt.to_period('M').astype(str)
+    return df
+
+
+def test_cube_buckets_add_up_to_the_rows(profile_overview):
+    df = profile_overview
+    metrics = ['Reach', 'Profile visits']
+    periods = sorted(df['MonthYear'].unique())
+    cube = dashboardgeneration.build_dashboard_cube(df, metrics, periods)
+
+    for bucket in cube['buckets'].values():
+        assert decode_column(bucket['count']).sum() == len(df)
+        for metric in metrics:
+            assert decode_column(bucket['sum'][metric]).sum() == pytest.approx(df[metric].sum())
+            assert decode_column(bucket['min'][metric]).min() == df[metric].min()
+            assert decode_column(bucket['max'][metric]).max() == df[metric].max()
+
+    month = cube['buckets']['month']
+    expected = df.groupby('MonthYear')['Reach'].sum()
+    assert [periods[index] for index in decode_column(month['period'])] == expected.index.tolist()
+    assert decode_column(month['sum']['Reach']).tolist() == expected.tolist()
+
+
+def test_weeks_are_cut_at_month_boundaries(profile_overview):
+    df = profile_overview
+    periods = sorted(df['MonthYear'].unique())
+    week = dashboardgeneration.build_dashboard_cube(df, ['Reach'], periods)['buckets']['week']
+
+    starts = pd.to_datetime(decode_column(week['start']).astype('int64'), unit='D')
+    assert starts.is_monotonic_increasing
+    # 2024-02-01 is a Thursday: the week of Monday 2024-01-29 is split at the month start
+    assert pd.Timestamp('2024-01-29') in starts and pd.Timestamp('2024-02-01') in starts
+    bucket_periods = [periods[index] for index in decode_column(week['period'])]
+    assert bucket_periods == starts.to_period('M').astype(str).tolist()
+
+
+def test_exported_rows_are_sanitized(tmp_path, profile_overview):
+    df = profile_overview.head(3).copy()
+    df['Note'] = ['=1+1', 'plain', '-caption']
+    periods = sorted(df['MonthYear'].unique())
+    cube = dashboardgeneration.build_dashboard_cube(df, ['Reach'], periods)
+    dashboardgeneration.write_dashboard_data(str(tmp_path), df, cube, periods, ['Reach'])
+
+    rows_file, = tmp_path.glob(f'{dashboardgeneration.DASHBOARD_ROWS_PREFIX}.*.js')
+    rows = json.loads(rows_file.read_text(encoding='utf-8').removeprefix('window.dashboardRows = ').rstrip(';\n'))
+    assert [row['Note'] for row in rows] == ["'=1+1", 'plain', "'-caption"]
@@ -0,0 +1,73 @@
+import os
+
+import pandas as pd
+import pytest
+
+import path_utils
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    csv_path = str(tmp_path / 'data.csv')
+    pd.DataFrame({'Caption': ['=1+1', 'plain'], 'Reach': [1, 2]}).to_csv(csv_path, index=False)
+    monkeypatch.setattr(path_utils, 'get_dataset_path', lambda dataset_key: csv_path)
+    path_utils.clear_dataset_registry()
+    path_utils.reset_io_stats()
+    yield csv_path
+    path_utils.clear_dataset_registry()
+
+
+def registry_hits():
+    return path_utils.get_io_stats().get('registry_hits', 0)
+
+
+def test_second_load_comes_from_the_registry(dataset):
+    first = path_utils.safe_read_csv('data')
+    second = path_utils.safe_read_csv('data')
+    assert registry_hits() == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_mutating_a_returned_frame_leaves_the_cached_copy_intact(dataset):
+    first = path_utils.safe_read_csv('data')
+    first.loc[0, 'Reach'] = 100
+    first['Caption'] = 'changed'
+    first.drop(columns=['Reach'], inplace=True)
+
+    second = path_utils.safe_read_csv('data')
+    assert registry_hits() == 1
+    assert second['Caption'].tolist() == ["'=1+1", 'plain']
+    assert second['Reach'].tolist() == [1, 2]
+
+
+def test_registry_is_invalidated_when_the_size_changes(dataset):
+    path_utils.safe_read_csv('data')
+    pd.DataFrame({'Caption': ['a', 'b', 'c'], 'Reach': [1, 2, 3]}).to_csv(dataset, index=False)
+    assert len(path_utils.safe_read_csv('data')) == 3
+    assert registry_hits() == 0
+
+
+def test_registry_is_invalidated_when_the_mtime_changes(dataset):
+    path_utils.safe_read_csv('data')
+    stat = os.stat(dataset)
+    # Same size, different content and modification time
+    pd.DataFrame({'Caption': ['=1+2', 'plain'], 'Reach': [3, 4]}).to_csv(dataset, index=False)
+    assert os.path.getsize(dataset) == stat.st_size
+    os.utime(dataset, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert path_utils.safe_read_csv('data')['Reach'].tolist() == [3, 4]
+    assert registry_hits() == 0
+
+
+def test_read_options_are_part_of_the_key(dataset):
+    path_utils.safe_read_csv('data')
+    unsanitized = path_utils.safe_read_csv('data', sanitize=False)
+    assert unsanitized['Caption'].iloc[0] == '=1+1'
+    assert registry_hits() == 0
+
+
+def test_clear_dataset_registry_forces_a_reload(dataset):
+    path_utils.safe_read_csv('data')
+    path_utils.clear_dataset_registry()
+    path_utils.safe_read_csv('data')
+    assert registry_hits() == 0
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+import clean
+
+
+def make_sheet(rows=500):
+    rng = np.random.default_rng(11)
+    return pd.DataFrame({
+        'Date': rng.choice(pd.date_range('2024-01-01', periods=20), rows),
+        'Type': rng.choice(['FEED', 'REELS', None], rows),
+        'Reach': rng.choice([1.0, 2.0, np.nan], rows),
+    })
+
+
+def test_content_fingerprints_find_the_same_duplicates_as_pandas():
+    sheet = make_sheet()
+    fingerprints = clean.row_fingerprints(sheet)
+    assert fingerprints.duplicated().tolist() == sheet.duplicated().tolist()
+    pd.testing.assert_frame_equal(clean.remove_sheet_duplicates('Sheet', sheet), sheet.drop_duplicates())
+
+
+def test_content_fingerprints_are_stable_and_ignore_the_index():
+    sheet = make_sheet(50)
+    reindexed = sheet.set_axis(range(100, 150))
+    assert clean.row_fingerprints(sheet).tolist() == clean.row_fingerprints(reindexed).tolist()
+    assert clean.row_fingerprints(sheet).tolist() == clean.row_fingerprints(sheet.copy()).tolist()
+
+
+def test_rowhash_is_the_key_when_present():
+    sheet = pd.DataFrame({'RowHash': ['a', 'a', 'b'], 'Reach': [1, 2, 3]})
+    assert clean.remove_sheet_duplicates('Sheet', sheet)['Reach'].tolist() == [1, 3]
+
+
+def test_duplicate_groups_are_classified_in_one_pass():
+    sheet = pd.DataFrame({
+        'RowHash': ['same', 'same', 'differs', 'differs', 'differs', 'single'],
+        'Reach': [1, 1, 1, 2, 2, 9],
+    })
+    summary = clean.summarize_duplicates(sheet, clean.row_fingerprints(sheet))
+    assert summary.loc['same', 'kind'] == 'identical'
+    assert summary.loc['same', 'rows'] == 2
+    assert summary.loc['differs', 'kind'] == 'non-identical'
+    assert summary.loc['differs', 'rows'] == 3
+    assert summary.loc['differs', 'distinct_rows'] == 2
+    assert 'single' not in summary.index
+
+
+def test_sheet_without_duplicates_has_an_empty_summary():
+    sheet = pd.DataFrame({'Reach': [1, 2, 3]})
+    assert clean.summarize_duplicates(sheet, clean.row_fingerprints(sheet)).empty
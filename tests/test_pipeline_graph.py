@@ -0,0 +1,49 @@
+import pytest
+
+import master
+
+
+def stage(*depends_on):
+    return {'depends_on': list(depends_on), 'inputs': [], 'outputs': []}
+
+
+def test_declared_pipeline_runs_dependencies_first():
+    order = master.resolve_pipeline_order(master.PIPELINE_STAGES)
+    assert sorted(order) == sorted(master.PIPELINE_STAGES)
+    for name, declared in master.PIPELINE_STAGES.items():
+        for dependency in declared['depends_on']:
+            assert order.index(dependency) < order.index(name)
+
+
+def test_order_follows_dependencies_not_declaration_order():
+    stages = {'report': stage('chart'), 'chart': stage('clean'), 'clean': stage()}
+    assert master.resolve_pipeline_order(stages) == ['clean', 'chart', 'report']
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError, match='unknown stage'):
+        master.resolve_pipeline_order({'chart': stage('clean')})
+
+
+def test_dependency_cycle_is_rejected():
+    with pytest.raises(ValueError, match='cycle'):
+        master.resolve_pipeline_order({'a': stage('b'), 'b': stage('a'), 'c': stage()})
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_stages_after_a_failed_stage_do_not_run(tmp_path, jobs):
+    (tmp_path / 'root.py').write_text("raise RuntimeError('root failed')\n")
+    for name in ('child', 'grandchild', 'sibling'):
+        (tmp_path / f'{name}.py').write_text(
+            f"import os\nopen(os.path.join(os.path.dirname(__file__), 'ran_{name}'), 'w').close()\n"
+        )
+    stages = {
+        'root.py': stage(),
+        'child.py': stage('root.py'),
+        'grandchild.py': stage('child.py'),
+        'sibling.py': stage(),
+    }
+
+    statuses = master.execute_pipeline(stages, str(tmp_path), jobs=jobs)
+    assert statuses == {'root.py': 'failed', 'child.py': 'blocked', 'grandchild.py': 'blocked', 'sibling.py': 'ok'}
+    assert sorted(path.name for path in tmp_path.glob('ran_*')) == ['ran_sibling']
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+import master
+from path_utils import PathManager
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / 'dataset').mkdir()
+    (tmp_path / 'scripts').mkdir()
+    (tmp_path / 'graphs').mkdir()
+    # A chart the stage leaves alone, as when its data did not change
+    (tmp_path / 'graphs' / 'kept.png').write_bytes(b'k' * 1000)
+    (tmp_path / 'scripts' / 'chart.py').write_text(
+        "import os\n"
+        "graphs = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'graphs')\n"
+        "with open(os.path.join(graphs, 'new.png'), 'wb') as f:\n"
+        "    f.write(b'n' * 10)\n"
+    )
+    return tmp_path
+
+
+def stage_records(record_path):
+    with open(record_path, encoding='utf-8') as f:
+        return [record for record in map(json.loads, f) if record['type'] == 'stage']
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_bytes_written_only_counts_outputs_the_stage_wrote(project, jobs):
+    stages = {'chart.py': {'depends_on': [], 'inputs': [], 'outputs': ['graphs:kept.png', 'graphs:new.png']}}
+    record_path = str(project / 'run.jsonl')
+    master.execute_pipeline(stages, str(project / 'scripts'), jobs=jobs, path_manager=PathManager(str(project)),
+                            run_record=master.RunRecord(record_path, 'test'))
+
+    record, = stage_records(record_path)
+    assert record['status'] == 'ok'
+    assert record['bytes_written'] == 10
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.sanitize_benchmark import legacy_sanitize
+from path_utils import sanitize_formula_injection, FORMULA_PREFIXES
+
+
+def make_frame(rows=2000):
+    rng = np.random.default_rng(7)
+    texts = np.array(['REELS', '=HYPERLINK("x")', '-caption', '+1 555', '@handle', 'a=b', "'=quoted", ''], dtype=object)
+    frame = pd.DataFrame({
+        'Caption': rng.choice(texts, rows),
+        'Permalink': rng.choice(texts, rows),
+        'Media reach': rng.integers(-5, 5, rows),
+    })
+    for col in ['Caption', 'Permalink']:
+        frame[col] = frame[col].astype(object)
+    return frame
+
+
+def test_prefixes_match_the_legacy_sanitizer():
+    assert FORMULA_PREFIXES == ('=', '+', '-', '@')
+
+
+def test_text_cells_match_the_legacy_sanitizer():
+    frame = make_frame()
+    expected = legacy_sanitize(frame.copy())
+    result = sanitize_formula_injection(frame.copy())
+    for col in ['Caption', 'Permalink']:
+        assert result[col].tolist() == expected[col].tolist()
+    # Numeric columns are never touched, negative numbers included
+    pd.testing.assert_series_equal(result['Media reach'], frame['Media reach'])
+
+
+def test_missing_values_stay_missing():
+    # The legacy version turned NaN into the text "nan"; missing cells are now kept as missing
+    frame = pd.DataFrame({'Caption': pd.Series(['=1+1', np.nan, 'ok', None], dtype=object)})
+    result = sanitize_formula_injection(frame)
+    assert result['Caption'].iloc[0] == "'=1+1"
+    assert result['Caption'].iloc[2] == 'ok'
+    assert result['Caption'].iloc[[1, 3]].isna().all()
+
+
+def test_string_dtype_columns_are_sanitized_and_keep_their_dtype():
+    frame = pd.DataFrame({'Caption': pd.Series(['@user', 'plain', None], dtype='string')})
+    result = sanitize_formula_injection(frame)
+    assert result['Caption'].dtype == 'string'
+    assert result['Caption'].iloc[0] == "'@user"
+    assert result['Caption'].iloc[1] == 'plain'
+    assert pd.isna(result['Caption'].iloc[2])
+
+
+def test_frame_without_formulas_is_unchanged():
+    frame = pd.DataFrame({'Caption': ['one', 'two'], 'Reach': [1, 2]})
+    pd.testing.assert_frame_equal(sanitize_formula_injection(frame.copy()), frame)
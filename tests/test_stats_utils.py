@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stats_utils import welch_t_test, consecutive_welch_t_tests
+
+# R's built-in sleep dataset: extra hours of sleep for group 1 and group 2
+SLEEP_GROUP_1 = [0.7, -1.6, -0.2, -1.2, -0.1, 3.4, 3.7, 0.8, 0.0, 2.0]
+SLEEP_GROUP_2 = [1.9, 0.8, 1.1, 0.1, -0.1, 4.4, 5.5, 1.6, 4.6, 3.4]
+# R's built-in mtcars dataset: mpg of automatic (am = 0) and manual (am = 1) cars
+MTCARS_AUTOMATIC = [21.4, 18.7, 18.1, 14.3, 24.4, 22.8, 19.2, 17.8, 16.4, 17.3,
+                    15.2, 10.4, 10.4, 14.7, 21.5, 15.5, 15.2, 13.3, 19.2]
+MTCARS_MANUAL = [21.0, 21.0, 22.8, 32.4, 30.4, 33.9, 27.3, 26.0, 30.4, 15.8, 19.7, 15.0, 21.4]
+
+# Recorded output of R's t.test(x, y) (var.equal = FALSE), as printed by R:
+# t.test(extra ~ group, data = sleep) and t.test(mpg ~ am, data = mtcars)
+R_RESULTS = [
+    (SLEEP_GROUP_1, SLEEP_GROUP_2, -1.8608, 17.776, 0.07939),
+    (MTCARS_AUTOMATIC, MTCARS_MANUAL, -3.7671, 18.332, 0.001374),
+]
+
+
+def summary(values):
+    values = np.asarray(values, dtype=float)
+    return len(values), values.mean(), values.var(ddof=1)
+
+
+def assert_matches_r(result, t_stat, df, p_value):
+    assert result[0] == pytest.approx(t_stat, abs=5e-5)
+    assert result[1] == pytest.approx(df, abs=5e-4)
+    assert result[2] == pytest.approx(p_value, rel=5e-4)
+
+
+@pytest.mark.parametrize('x, y, t_stat, df, p_value', R_RESULTS)
+def test_welch_t_test_matches_r(x, y, t_stat, df, p_value):
+    assert_matches_r(welch_t_test(*summary(x), *summary(y)), t_stat, df, p_value)
+
+
+def test_welch_t_test_is_vectorized():
+    (nx1, mx1, vx1), (ny1, my1, vy1) = summary(SLEEP_GROUP_1), summary(SLEEP_GROUP_2)
+    (nx2, mx2, vx2), (ny2, my2, vy2) = summary(MTCARS_AUTOMATIC), summary(MTCARS_MANUAL)
+    t_stat, df, p_value = welch_t_test([nx1, nx2], [mx1, mx2], [vx1, vx2], [ny1, ny2], [my1, my2], [vy1, vy2])
+    for index, (_, _, expected_t, expected_df, expected_p) in enumerate(R_RESULTS):
+        assert_matches_r((t_stat[index], df[index], p_value[index]), expected_t, expected_df, expected_p)
+
+
+def test_constant_data_has_no_result():
+    # R stops with "data are essentially constant"
+    t_stat, df, p_value = welch_t_test(3, 1.0, 0.0, 3, 1.0, 0.0)
+    assert np.isnan(t_stat) and np.isnan(df) and np.isnan(p_value)
+
+
+def test_consecutive_tests_compare_each_group_with_the_previous_one():
+    values = pd.Series(SLEEP_GROUP_2 + SLEEP_GROUP_1 + [5.0])
+    groups = pd.Series(['2024-02'] * 10 + ['2024-01'] * 10 + ['2024-03'])
+    result = consecutive_welch_t_tests(values, groups)
+
+    assert result.index.tolist() == ['2024-02', '2024-03']
+    # t.test(current, previous): group 2 against group 1 flips the sign of R's sleep result
+    february = result.loc['2024-02']
+    assert_matches_r((february['t_stat'], february['df'], february['p_value']), 1.8608, 17.776, 0.07939)
+    assert february['n_previous'] == 10 and february['n_current'] == 10
+    assert february['change'] == pytest.approx(np.mean(SLEEP_GROUP_2) - np.mean(SLEEP_GROUP_1))
+
+    # R needs at least two observations in each sample
+    march = result.loc['2024-03']
+    assert march['n_current'] == 1
+    assert np.isnan(march['t_stat']) and np.isnan(march['p_value'])